@@ -7,5 +7,55 @@ load_dotenv()
 @dataclass(frozen=True)
 class AppConfig:
     api_base_url: str = os.getenv("API_BASE_URL", "http://140.84.169.148:25630")
+    # Pool de conexiones HTTP (keep-alive)
+    http_pool_connections: int = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+    http_pool_maxsize: int = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+    # Caché de respuestas en disco (SQLite), separada por usuario y rol. Opcional:
+    # guarda listados de alumnos y usuarios sin cifrar; lo vencido se borra al salir
+    disk_cache_enabled: bool = os.getenv("DISK_CACHE_ENABLED", "0") == "1"
+    disk_cache_path: str = os.getenv("DISK_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".sigue", "cache.sqlite3"))
+    disk_cache_max_mb: float = float(os.getenv("DISK_CACHE_MAX_MB", "50"))
+    # Hilos para las llamadas a la API fuera del hilo de la interfaz
+    worker_threads: int = int(os.getenv("WORKER_THREADS", "4"))
+    # Peticiones independientes que se lanzan a la vez dentro de una misma tarea
+    fetch_threads: int = int(os.getenv("FETCH_THREADS", "6"))
+    # A partir de cuántas filas las tablas grandes sólo crean las visibles
+    virtual_table_threshold: int = int(os.getenv("VIRTUAL_TABLE_THRESHOLD", "2000"))
+    # Tras guardar se aplica la respuesta localmente; con un valor > 0 (ms) además
+    # se vuelve a pedir el listado para confirmarlo
+    revalidate_after_save_ms: int = int(os.getenv("REVALIDATE_AFTER_SAVE_MS", "0"))
+    # Paginación de colecciones grandes: filas por página y 'offset', 'cursor' o
+    # 'stream' (todo en una respuesta que se decodifica y muestra mientras llega)
+    page_size: int = int(os.getenv("PAGE_SIZE", "200"))
+    pagination_mode: str = os.getenv("PAGINATION_MODE", "offset")
+    # Compresión HTTP: enviar con gzip los cuerpos desde este tamaño en bytes (0 = nunca)
+    request_compress_min_bytes: int = int(os.getenv("REQUEST_COMPRESS_MIN_BYTES", "4096"))
+    # Reintentos ante fallos transitorios (conexión, 429/502/503/504): intentos en
+    # total (1 = ninguno), espera base y máxima del backoff exponencial, espera
+    # máxima aceptada de un Retry-After y si se reintentan POST con Idempotency-Key
+    retry_attempts: int = int(os.getenv("RETRY_ATTEMPTS", "3"))
+    retry_backoff_ms: int = int(os.getenv("RETRY_BACKOFF_MS", "250"))
+    retry_max_backoff_ms: int = int(os.getenv("RETRY_MAX_BACKOFF_MS", "4000"))
+    retry_max_after_s: float = float(os.getenv("RETRY_MAX_AFTER_S", "30"))
+    retry_post: bool = os.getenv("RETRY_POST", "1") == "1"
+    # Corte rápido con el servidor caído: fallos seguidos que abren el circuito
+    # (0 = nunca), segundos hasta el primer sondeo y máximo al ir duplicándolos,
+    # y ruta que se sondea con HEAD (cualquier respuesta salvo 502/503/504 lo cierra)
+    circuit_failures: int = int(os.getenv("CIRCUIT_FAILURES", "3"))
+    circuit_cooldown_s: float = float(os.getenv("CIRCUIT_COOLDOWN_S", "5"))
+    circuit_max_cooldown_s: float = float(os.getenv("CIRCUIT_MAX_COOLDOWN_S", "60"))
+    circuit_probe_path: str = os.getenv("CIRCUIT_PROBE_PATH", "/")
+    # Decodificador de las respuestas: 'auto' (orjson si está instalado), 'orjson' o 'json'
+    json_decoder: str = os.getenv("JSON_DECODER", "auto")
+    # Espera (ms) tras la última tecla antes de filtrar las tablas al escribir
+    search_debounce_ms: int = int(os.getenv("SEARCH_DEBOUNCE_MS", "150"))
+    # Módulos que el menú mantiene vivos (ocultos) al cambiar de sección; 0 los destruye
+    module_cache_size: int = int(os.getenv("MODULE_CACHE_SIZE", "4"))
+    # Segundos tras los que un módulo re-mostrado vuelve a pedir sus datos; 0 nunca
+    module_stale_after_s: float = float(os.getenv("MODULE_STALE_AFTER_S", "120"))
+    # Importar en segundo plano las ventanas del rol apenas se muestra el menú
+    module_preimport: bool = os.getenv("MODULE_PREIMPORT", "1") == "1"
+    # Nivel de los mensajes en consola (p. ej. el informe del warm-up, en INFO)
+    log_level: str = os.getenv("LOG_LEVEL", "INFO").upper()
 
 CONFIG = AppConfig()
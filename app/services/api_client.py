@@ -1,22 +1,185 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Optional
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Union
 
-import requests
+from app.services.circuit_breaker import FAILURE_STATUSES, CircuitBreaker, CircuitOpenError
+from app.services.compression import compress_body, wire_size
+from app.services.http_cache import DEFAULT_TTL, DEFAULT_TTLS, CachedResponse, DiskCache, ValidatorCache, cache_key, ttl_for
+from app.services.json_codec import JsonDecoder, get_decoder, iter_array
+from app.services.metrics import Metrics, endpoint_of
+from app.services.pagination import PageIterator, StreamPages
+from app.services.retry import (
+    DEFAULT_RETRY_POLICIES, IDEMPOTENCY_HEADER, RETRY_STATUSES, RetryPolicy, parse_retry_after, policy_for,
+)
+from app.services.single_flight import SingleFlight
+
+if TYPE_CHECKING:  # pragma: no cover - sólo para anotaciones
+    import requests
 
 
 class ApiClient:
-    """Cliente HTTP sencillo para consumir la API REST del servidor."""
+    """Cliente HTTP sencillo para consumir la API REST del servidor.
+
+    Mantiene una sesión de ``requests`` con un pool de conexiones keep-alive,
+    de modo que las llamadas consecutivas reutilizan la misma conexión TCP/TLS
+    en lugar de abrir una nueva por petición.
+
+    Los GET se revalidan con ``If-None-Match``/``If-Modified-Since`` cuando el
+    servidor envió ``ETag`` o ``Last-Modified``; una respuesta 304 se sirve con
+    el cuerpo guardado, sin que quien llama a ``get`` note la diferencia.
+
+    Con una ``DiskCache`` y un ámbito de usuario (``set_cache_scope``) los GET
+    también se guardan en disco: dentro de su TTL se sirven sin red y, vencidos,
+    aportan sus validadores para revalidar. ``peek`` devuelve lo guardado (aunque
+    esté vencido) para pintar la pantalla al instante mientras se refresca.
+
+    Los GET idénticos (misma ruta y parámetros) que coinciden en el tiempo se
+    agrupan en una sola petición; cada llamador decodifica su propia copia del
+    cuerpo. Los contadores ``get.leader``/``get.coalesced`` están en ``metrics``.
+
+    Los cuerpos se decodifican con ``json_decoder`` (``'auto'`` usa ``orjson``
+    si está instalado, ver ``json_codec``). ``stream`` entrega los elementos de
+    un arreglo JSON a medida que llegan, sin tener el cuerpo completo en memoria.
+
+    Las respuestas llegan comprimidas si el servidor quiere (``requests`` ya
+    manda ``Accept-Encoding``) y los cuerpos de las peticiones de
+    ``compress_min_bytes`` o más (0 = nunca) se envían con gzip; si el
+    servidor responde 415 a un cuerpo comprimido, se reenvía sin comprimir y
+    no se vuelve a intentar. ``metrics.transfers()`` da, por endpoint, los
+    bytes antes y después de comprimir.
 
-    def __init__(self, base_url: str, timeout: int = 10) -> None:
+    Los errores de conexión y las respuestas 429/502/503/504 se reintentan
+    según la ``RetryPolicy`` de la ruta (``retry_policies``, por prefijo; si no
+    hay, ``retry_policy``): con espera exponencial y *jitter*, o lo que pida
+    ``Retry-After``. Los POST llevan una ``Idempotency-Key`` generada para
+    poder reintentarlos sin duplicar. ``retry.count``, ``retry:<endpoint>`` y
+    ``retry.exhausted`` quedan en ``metrics``.
+
+    Tras ``circuit_failures`` peticiones fallidas seguidas (cada una cuenta una
+    vez, ya agotados sus reintentos) el ``breaker`` corta las peticiones:
+    fallan al instante con ``CircuitOpenError`` (sin esperar el ``timeout``)
+    mientras un hilo sondea ``probe_path`` con ``HEAD`` hasta que el servidor
+    vuelve a responder. Mientras tanto, un GET que tenga una respuesta guardada
+    (en disco o en memoria con validadores) la devuelve aunque esté vencida;
+    ``circuit.stale`` cuenta esos casos.
+
+    ``requests`` se importa con la primera petición, no al importar este
+    módulo: así no retrasa la pantalla de inicio de sesión.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 10,
+        *,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        disk_cache: Optional[DiskCache] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        page_size: int = 200,
+        pagination_mode: str = 'offset',
+        json_decoder: str = 'auto',
+        compress_min_bytes: int = 0,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+        circuit_failures: int = 3,
+        circuit_cooldown: float = 5.0,
+        circuit_max_cooldown: float = 60.0,
+        probe_path: str = '/',
+    ) -> None:
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self._token: Optional[str] = None
 
+        # Configuración del pool: número de hosts cacheados y conexiones por host.
+        # La sesión vive hasta ``close``: el adaptador ya descarta y reabre las
+        # conexiones keep-alive que el servidor cerró, y reciclarla por tiempo
+        # cortaría las peticiones que otros hilos tienen en curso.
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._validators = ValidatorCache()
+        self.disk_cache = disk_cache
+        self.cache_ttls = cache_ttls if cache_ttls is not None else dict(DEFAULT_TTLS)
+        self._cache_scope: Optional[str] = None
+        self.page_size = page_size
+        self.pagination_mode = pagination_mode
+        # El decodificador se elige con la primera respuesta (no retrasa el arranque)
+        self.json_decoder = json_decoder
+        self._decoder: Optional[JsonDecoder] = None
+        self.compress_min_bytes = compress_min_bytes
+        self._compress_requests = compress_min_bytes > 0
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.retry_policies = retry_policies if retry_policies is not None else dict(DEFAULT_RETRY_POLICIES)
+        self.metrics = Metrics()
+        self._in_flight = SingleFlight(self.metrics, name='get')
+        self.probe_path = probe_path
+        self.breaker = CircuitBreaker(
+            self._probe, circuit_failures, circuit_cooldown, circuit_max_cooldown, self.metrics,
+        )
+
     def set_token(self, token: Optional[str]) -> None:
         self._token = token
 
+    def set_cache_scope(self, user_id: Optional[Any], role: Optional[str]) -> None:
+        """Separa la caché en disco por usuario y rol; ``None`` la desactiva."""
+        self._cache_scope = f"{user_id}:{role}" if user_id is not None else None
+
+    def purge_cache(self) -> None:
+        """Borra de disco las respuestas del usuario actual (al cerrar sesión)."""
+        if self.disk_cache is not None and self._cache_scope is not None:
+            self.disk_cache.purge(self._cache_scope)
+
+    def prune_cache(self) -> None:
+        """Borra de disco lo que ya venció para todas las rutas (al salir y tras el login)."""
+        if self.disk_cache is not None:
+            self.disk_cache.prune(max([*self.cache_ttls.values(), DEFAULT_TTL]))
+
+    def peek(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Respuesta guardada en disco para un GET, sin ir a la red (``None`` si no hay)."""
+        if self.disk_cache is None or self._cache_scope is None:
+            return None
+        stored = self.disk_cache.get(self._cache_scope, cache_key(f"{self.base_url}{path}", params))
+        return self._decode(stored[0].body) if stored else None
+
+    def _create_session(self) -> requests.Session:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _get_session(self) -> requests.Session:
+        with self._session_lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def close(self) -> None:
+        """Cierra las conexiones del pool y olvida los validadores guardados.
+
+        La sesión se recrea en la siguiente petición.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        self._validators.clear()
+
     def _build_headers(self, extra_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         headers: Dict[str, str] = {
             "Accept": "application/json",
@@ -29,22 +192,189 @@ class ApiClient:
         return headers
 
     def request(self, method: str, path: str, *, params: Optional[Dict[str, Any]] = None, data: Optional[Dict[str, Any]] = None) -> Any:
-        url = f"{self.base_url}{path}"
-        payload = json.dumps(data) if data is not None else None
-        response = requests.request(
-            method=method.upper(),
-            url=url,
-            headers=self._build_headers(),
-            params=params,
-            data=payload,
-            timeout=self.timeout
-        )
+        method = method.upper()
+        if method == "GET":
+            key = cache_key(f"{self.base_url}{path}", params)
+            body = self._in_flight.do((self._token, key), lambda: self._send(method, path, params, None, key))
+        else:
+            body = self._send(method, path, params, data, None)
+        return self._decode(body)
+
+    def _send(self, method: str, path: str, params: Optional[Dict[str, Any]], data: Optional[Dict[str, Any]], key: Optional[str]) -> bytes:
+        """Hace la petición y devuelve el cuerpo crudo (de la red o de la caché)."""
+        payload = json.dumps(data).encode('utf-8') if data is not None else None
+
+        scope = self._cache_scope if self.disk_cache is not None else None
+        cached = self._validators.get(key) if key else None
+        stale = cached
+        if key and scope:
+            stored = self.disk_cache.get(scope, key)
+            if stored is not None:
+                entry, age = stored
+                if age < ttl_for(path, self.cache_ttls):
+                    return entry.body
+                if cached is None and entry.has_validators:
+                    cached = entry
+                if stale is None:
+                    stale = entry
+
+        headers = self._build_headers(cached.conditional_headers() if cached else None)
+        policy = policy_for(path, self.retry_policies, self.retry_policy)
+        if method == "POST" and policy.retry_post and policy.attempts > 1:
+            # Misma clave en todos los intentos: el servidor descarta los duplicados
+            headers.setdefault(IDEMPOTENCY_HEADER, uuid.uuid4().hex)
+        body, encoding = payload, None
+        if payload and self._compress_requests:
+            body, encoding = compress_body(payload, self.compress_min_bytes)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        try:
+            response = self._perform(method, path, policy, headers=headers, params=params, data=body)
+        except CircuitOpenError:
+            if stale is None:
+                raise
+            # Servidor caído: mejor la última respuesta conocida que un error
+            self.metrics.incr('circuit.stale')
+            return stale.body
+        if response.status_code == 415 and encoding:
+            # El servidor no acepta cuerpos comprimidos: reenviar tal cual y no volver a comprimir
+            self._compress_requests = False
+            self.metrics.incr('compress.rejected')
+            del headers["Content-Encoding"]
+            body = payload
+            response = self._perform(method, path, policy, headers=headers, params=params, data=body)
+        endpoint = endpoint_of(path)
+        if payload:
+            self.metrics.record_bytes(endpoint, 'out', len(payload), len(body))
+        if response.status_code == 304 and cached is not None:
+            if scope:
+                self.disk_cache.touch(scope, key)
+            return cached.body
+
+        self.metrics.record_bytes(endpoint, 'in', len(response.content), wire_size(response, len(response.content)))
         self._raise_for_status(response)
-        if response.content:
-            return response.json()
+        if key:
+            self._remember_validators(key, response)
+            if scope:
+                self.disk_cache.put(scope, key, CachedResponse(
+                    response.content, response.headers.get("ETag"), response.headers.get("Last-Modified")
+                ))
+        elif scope:
+            # Una escritura puede afectar a cualquier listado: se fuerza la revalidación
+            self.disk_cache.expire(scope)
+        return response.content
+
+    def _perform(self, method: str, path: str, policy: Optional[RetryPolicy] = None, **kwargs: Any) -> requests.Response:
+        """``session.request`` reintentando los fallos transitorios según ``policy``.
+
+        El ``breaker`` se consulta antes de empezar y recibe sólo el resultado
+        final: una petición que necesitó tres intentos es un fallo, no tres.
+        """
+        import requests
+
+        if policy is None:
+            policy = policy_for(path, self.retry_policies, self.retry_policy)
+        retryable = policy.allows(method, kwargs.get('headers') or {})
+        retry = 0
+        self.breaker.check()
+        while True:
+            last_try = not retryable or retry + 1 >= policy.attempts
+            try:
+                response = self._get_session().request(
+                    method=method, url=f"{self.base_url}{path}", timeout=self.timeout, **kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if last_try:
+                    self.breaker.record_failure()
+                    self._count_exhausted(retry)
+                    raise
+                wait = policy.delay(retry)
+            else:
+                if response.status_code not in RETRY_STATUSES or last_try:
+                    if response.status_code in RETRY_STATUSES:
+                        self._count_exhausted(retry)
+                    return self._record_outcome(response)
+                wait = policy.delay(retry, parse_retry_after(response.headers.get("Retry-After")))
+                if wait is None:
+                    # El servidor pide esperar demasiado: mostrar el error ya
+                    return self._record_outcome(response)
+                response.close()
+            retry += 1
+            self.metrics.incr('retry.count')
+            self.metrics.incr(f"retry:{endpoint_of(path)}")
+            time.sleep(wait)
+
+    def _probe(self) -> bool:
+        """Sondeo del circuito medio abierto: cualquier respuesta, salvo 502/503/504, vale."""
+        import requests
+
+        try:
+            response = self._get_session().head(f"{self.base_url}{self.probe_path}", timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            return False
+        response.close()
+        return response.status_code not in FAILURE_STATUSES
+
+    def _record_outcome(self, response: requests.Response) -> requests.Response:
+        if response.status_code in FAILURE_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def _count_exhausted(self, retries: int) -> None:
+        if retries:
+            self.metrics.incr('retry.exhausted')
+
+    def _remember_validators(self, key: str, response: requests.Response) -> None:
+        entry = CachedResponse(
+            body=response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        if entry.has_validators:
+            self._validators.put(key, entry)
+        else:
+            self._validators.discard(key)
+
+    @property
+    def decoder(self) -> JsonDecoder:
+        if self._decoder is None:
+            self._decoder = get_decoder(self.json_decoder)
+        return self._decoder
+
+    def _decode(self, content: bytes) -> Any:
+        if content:
+            return self.decoder.loads(content)
         return None
 
+    def stream(self, path: str, params: Optional[Dict[str, Any]] = None, *, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+        """Elementos de una respuesta que es un arreglo JSON, decodificados mientras llega el cuerpo.
+
+        La petición sale al pedir el primer elemento. No pasa por las cachés ni
+        se agrupa con otros GET: es para listados tan grandes que no conviene
+        tener a la vez el cuerpo completo y todos sus objetos. Cerrar el
+        iterador (``close()``) cierra la respuesta.
+        """
+        response = self._perform("GET", path, headers=self._build_headers(), params=params, stream=True)
+        plain = 0
+
+        def chunks() -> Iterator[bytes]:
+            nonlocal plain
+            for chunk in response.iter_content(chunk_size):
+                plain += len(chunk)
+                yield chunk
+
+        try:
+            self._raise_for_status(response)
+            yield from iter_array(chunks())
+        finally:
+            self.metrics.record_bytes(endpoint_of(path), 'in', plain, wire_size(response, plain))
+            response.close()
+
     def _raise_for_status(self, response: requests.Response) -> None:
+        import requests
+
         try:
             response.raise_for_status()
         except requests.HTTPError as error:
@@ -64,6 +394,28 @@ class ApiClient:
     def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
         return self.request("GET", path, params=params)
 
+    def paginate(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        page_size: Optional[int] = None,
+        mode: Optional[str] = None,
+        prefetch: bool = True,
+    ) -> Union[PageIterator, StreamPages]:
+        """Iterador de páginas de una colección (ver ``PageIterator``).
+
+        Con ``mode='stream'`` la colección se pide completa en una sola
+        respuesta y se entrega en páginas mientras se decodifica (``StreamPages``).
+        """
+        mode = mode or self.pagination_mode
+        if mode == 'stream':
+            return StreamPages(self, path, params, page_size=page_size or self.page_size)
+        return PageIterator(
+            self, path, params,
+            page_size=page_size or self.page_size, mode=mode, prefetch=prefetch,
+        )
+
     def post(self, path: str, data: Dict[str, Any]) -> Any:
         return self.request("POST", path, data=data)
 
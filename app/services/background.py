@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import queue
+import sys
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.config import CONFIG
+
+DoneCallback = Callable[[Any], None]
+ErrorCallback = Callable[[BaseException], None]
+BusyListener = Callable[[bool], None]
+
+
+@dataclass
+class _Task:
+    widget: tk.Misc
+    on_done: Optional[DoneCallback]
+    on_error: Optional[ErrorCallback]
+    generation: int
+    key: Optional[Tuple[str, str]] = None
+    serial: int = 0
+
+
+class BackgroundExecutor:
+    """Pool de hilos para llamadas bloqueantes (API) fuera del hilo de Tk.
+
+    Los hilos de trabajo nunca tocan widgets: el resultado de cada tarea se deja
+    en una cola y el hilo principal la vacía periódicamente con ``after()``,
+    ejecutando ahí los callbacks ``on_done``/``on_error``. Si el widget dueño de
+    la tarea ya fue destruido, el resultado se descarta.
+
+    ``submit``, ``cancel_all`` y los listeners deben usarse desde el hilo de Tk.
+    """
+
+    def __init__(self, max_workers: int = 4, poll_interval_ms: int = 25) -> None:
+        self.max_workers = max_workers
+        self.poll_interval_ms = poll_interval_ms
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._results: "queue.SimpleQueue[Tuple[_Task, Future]]" = queue.SimpleQueue()
+        self._futures: Set[Future] = set()
+        self._latest: Dict[Tuple[str, str], int] = {}
+        self._busy_listeners: List[BusyListener] = []
+        self._generation = 0
+        self._serial = 0
+        self._polling = False
+
+    # --- API pública ---
+    @property
+    def busy(self) -> bool:
+        return bool(self._futures)
+
+    def submit(
+        self,
+        widget: tk.Misc,
+        func: Callable[..., Any],
+        *args: Any,
+        on_done: Optional[DoneCallback] = None,
+        on_error: Optional[ErrorCallback] = None,
+        key: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Future:
+        """Ejecuta ``func(*args, **kwargs)`` en segundo plano.
+
+        ``key`` identifica tareas equivalentes del mismo widget (p. ej. 'detail'):
+        si se envía una nueva antes de que termine la anterior, sólo se entrega
+        el resultado de la más reciente.
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='sigue-worker')
+
+        self._serial += 1
+        task = _Task(widget, on_done, on_error, self._generation, serial=self._serial)
+        if key is not None:
+            task.key = (str(widget), key)
+            self._latest[task.key] = task.serial
+
+        was_busy = self.busy
+        future = self._pool.submit(func, *args, **kwargs)
+        self._futures.add(future)
+        future.add_done_callback(lambda f, t=task: self._results.put((t, f)))
+
+        if not was_busy:
+            self._notify_busy(True)
+        self._ensure_polling(widget)
+        return future
+
+    def cancel_all(self) -> None:
+        """Cancela las tareas pendientes y descarta los resultados de las que ya corren."""
+        self._generation += 1
+        self._latest.clear()
+        for future in list(self._futures):
+            future.cancel()
+
+    def shutdown(self) -> None:
+        self.cancel_all()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def add_busy_listener(self, listener: BusyListener) -> Callable[[], None]:
+        """Registra un callback ``listener(ocupado)``; devuelve la función para quitarlo."""
+        self._busy_listeners.append(listener)
+
+        def remove() -> None:
+            if listener in self._busy_listeners:
+                self._busy_listeners.remove(listener)
+        return remove
+
+    # --- Internos (hilo de Tk) ---
+    def _notify_busy(self, busy: bool) -> None:
+        for listener in list(self._busy_listeners):
+            listener(busy)
+
+    def _ensure_polling(self, widget: tk.Misc) -> None:
+        if self._polling:
+            return
+        self._polling = True
+        root = widget.winfo_toplevel()
+        root.after(self.poll_interval_ms, lambda: self._drain(root))
+
+    def _drain(self, root: tk.Misc) -> None:
+        while True:
+            try:
+                task, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._futures.discard(future)
+            self._dispatch(task, future)
+
+        if self._futures:
+            root.after(self.poll_interval_ms, lambda: self._drain(root))
+        else:
+            self._polling = False
+            self._notify_busy(False)
+
+    def _dispatch(self, task: _Task, future: Future) -> None:
+        if future.cancelled() or task.generation != self._generation:
+            return
+        if task.key is not None:
+            if self._latest.get(task.key) != task.serial:
+                return  # Hay una tarea más reciente con la misma clave
+            del self._latest[task.key]
+        try:
+            if not task.widget.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        error = future.exception()
+        try:
+            if error is not None:
+                if task.on_error is None:
+                    raise error
+                task.on_error(error)
+            elif task.on_done is not None:
+                task.on_done(future.result())
+        except Exception:  # noqa: BLE001 - se reporta como cualquier callback de Tk
+            task.widget.report_callback_exception(*sys.exc_info())
+
+
+EXECUTOR = BackgroundExecutor(max_workers=CONFIG.worker_threads)
@@ -0,0 +1,132 @@
+"""Corte rápido de las peticiones cuando el servidor no responde.
+
+Tras ``failure_threshold`` fallos seguidos (error de conexión, tiempo de
+espera agotado o 502/503/504) el circuito se abre: las peticiones siguientes
+fallan al instante con ``CircuitOpenError`` en lugar de esperar el
+``timeout`` completo. Un hilo en segundo plano sondea el servidor pasado
+``cooldown`` (medio abierto); si responde, el circuito se cierra y si no,
+vuelve a abrirse con el doble de espera, hasta ``max_cooldown``.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+from app.services.metrics import Metrics
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+# Respuestas que indican que el servidor (o el proxy delante) está caído; 429 no:
+# el servidor responde, sólo pide calma
+FAILURE_STATUSES = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """El circuito está abierto: la petición no se envió."""
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(f"Sin conexión con el servidor; se reintentará en {max(1, round(retry_in))} s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Estado de la conexión con el servidor, compartido por todos los hilos.
+
+    ``probe`` se llama desde el hilo de sondeo y devuelve si el servidor
+    respondió. Con ``failure_threshold`` en 0 el circuito nunca se abre. Las
+    aperturas, cierres y peticiones rechazadas quedan en ``metrics`` como
+    ``<name>.open``, ``<name>.close`` y ``<name>.rejected``.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], bool],
+        failure_threshold: int = 3,
+        cooldown: float = 5.0,
+        max_cooldown: float = 60.0,
+        metrics: Optional[Metrics] = None,
+        name: str = 'circuit',
+    ) -> None:
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.metrics = metrics or Metrics()
+        self.name = name
+        self._state = CLOSED
+        self._failures = 0
+        self._next_probe = 0.0
+        # Cada apertura tiene su propio hilo de sondeo; uno viejo que siga vivo se retira
+        self._opened = 0
+        self._closed = threading.Event()
+        self._closed.set()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def retry_in(self) -> float:
+        """Segundos hasta el próximo sondeo (0 si el circuito no está abierto)."""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._next_probe - time.monotonic())
+
+    def check(self) -> None:
+        """Lanza ``CircuitOpenError`` si no deben enviarse peticiones ahora."""
+        if self._state == CLOSED:
+            return
+        self.metrics.incr(f"{self.name}.rejected")
+        raise CircuitOpenError(self.retry_in())
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state == CLOSED:
+                return
+            # Una petición que ya estaba en curso respondió: el servidor volvió
+            self._close()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state != CLOSED or self.failure_threshold <= 0:
+                return
+            self._failures += 1
+            if self._failures < self.failure_threshold:
+                return
+            self._state = OPEN
+            self._next_probe = time.monotonic() + self.cooldown
+            self._closed.clear()
+            self._opened += 1
+            opened = self._opened
+        self.metrics.incr(f"{self.name}.open")
+        threading.Thread(target=self._probe_loop, args=(opened,), name=f"{self.name}-probe", daemon=True).start()
+
+    def _close(self) -> None:
+        # Llamar con el lock tomado
+        self._state = CLOSED
+        self._failures = 0
+        self._closed.set()
+        self.metrics.incr(f"{self.name}.close")
+
+    def _probe_loop(self, opened: int) -> None:
+        delay = self.cooldown
+        while not self._closed.wait(delay):
+            with self._lock:
+                if self._state == CLOSED or self._opened != opened:
+                    return
+                self._state = HALF_OPEN
+            self.metrics.incr(f"{self.name}.probe")
+            try:
+                alive = self.probe()
+            except Exception:
+                alive = False
+            with self._lock:
+                if self._state == CLOSED or self._opened != opened:
+                    return
+                if alive:
+                    self._close()
+                    return
+                delay = min(self.max_cooldown, delay * 2)
+                self._state = OPEN
+                self._next_probe = time.monotonic() + delay
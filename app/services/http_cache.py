@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Cuerpo de una respuesta GET junto con sus validadores HTTP."""
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Clave estable para una URL y sus parámetros (independiente del orden)."""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+
+
+class ValidatorCache:
+    """Memoria de validadores por URL para revalidar GETs con respuestas 304.
+
+    Guarda el cuerpo crudo (bytes) en lugar del objeto decodificado para que
+    cada llamada reciba su propia copia y nadie modifique datos compartidos.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# TTL (segundos) por endpoint para la caché en disco. Se usa el prefijo más
+# largo que coincida con la ruta; los catálogos casi no cambian.
+DEFAULT_TTLS: Dict[str, float] = {
+    '/careers': 3600,
+    '/subjects': 3600,
+    '/schedules': 3600,
+    '/classrooms': 3600,
+    '/teachers': 300,
+    '/groups': 120,
+    '/students': 120,
+    '/users': 120,
+}
+
+
+# TTL de las rutas que no aparecen en la tabla
+DEFAULT_TTL = 60.0
+
+
+def ttl_for(path: str, ttls: Dict[str, float], default: float = DEFAULT_TTL) -> float:
+    best = ''
+    for prefix in ttls:
+        if (path == prefix or path.startswith(prefix + '/')) and len(prefix) > len(best):
+            best = prefix
+    return ttls[best] if best else default
+
+
+class DiskCache:
+    """Caché persistente de respuestas GET en SQLite, separada por usuario y rol.
+
+    Cada fila guarda el cuerpo, sus validadores y las marcas de tiempo de
+    escritura y último acceso. Cuando el tamaño total supera ``max_bytes`` se
+    eliminan las entradas usadas hace más tiempo (LRU). Los errores de SQLite
+    se tratan como fallos de caché: nunca interrumpen una petición.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                # Guarda listados con datos personales: sólo legible por el usuario
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " scope TEXT NOT NULL, key TEXT NOT NULL, body BLOB NOT NULL,"
+                " etag TEXT, last_modified TEXT, stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL, size INTEGER NOT NULL,"
+                " PRIMARY KEY (scope, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, scope: str, key: str) -> Optional[Tuple[CachedResponse, float]]:
+        """Devuelve ``(respuesta, edad_en_segundos)`` o ``None`` si no existe."""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT body, etag, last_modified, stored_at FROM responses WHERE scope = ? AND key = ?",
+                    (scope, key),
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE scope = ? AND key = ?", (now, scope, key))
+                conn.commit()
+        except (sqlite3.Error, OSError):
+            return None
+        body, etag, last_modified, stored_at = row
+        return CachedResponse(bytes(body), etag, last_modified), now - stored_at
+
+    def put(self, scope: str, key: str, entry: CachedResponse) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (scope, key, entry.body, entry.etag, entry.last_modified, now, now, len(entry.body)),
+                )
+                self._evict(conn)
+                conn.commit()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def touch(self, scope: str, key: str) -> None:
+        """Marca una entrada como recién validada (tras un 304)."""
+        now = time.time()
+        self._execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE scope = ? AND key = ?", (now, now, scope, key))
+
+    def expire(self, scope: str) -> None:
+        """Vence todas las entradas del ámbito sin borrarlas (conservan sus validadores)."""
+        self._execute("UPDATE responses SET stored_at = 0 WHERE scope = ?", (scope,))
+
+    def purge(self, scope: Optional[str] = None) -> None:
+        if scope is None:
+            self._execute("DELETE FROM responses", ())
+        else:
+            self._execute("DELETE FROM responses WHERE scope = ?", (scope,))
+
+    def prune(self, max_age: float) -> None:
+        """Borra las entradas guardadas (o validadas) hace más de ``max_age`` segundos."""
+        self._execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - max_age,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _execute(self, sql: str, args: Tuple[Any, ...]) -> None:
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(sql, args)
+                conn.commit()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT scope, key, size FROM responses ORDER BY accessed_at").fetchall()
+        for scope, key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE scope = ? AND key = ?", (scope, key))
+            total -= size
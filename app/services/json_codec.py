@@ -0,0 +1,124 @@
+"""Decodificación de las respuestas JSON de la API.
+
+``get_decoder('auto')`` usa ``orjson`` si está instalado (varias veces más
+rápido que la biblioteca estándar) y si no, ``json``. ``iter_array`` decodifica
+un arreglo JSON a medida que llegan sus bytes, elemento por elemento, sin
+tener nunca el cuerpo completo en memoria.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+_NON_SPACE = re.compile(r'\S')
+_NUMBER_START = frozenset('-0123456789')
+
+# Estados de iter_array
+_START, _FIRST, _NEXT, _VALUE = range(4)
+
+
+class JsonDecoder:
+    """Decodificador de la biblioteca estándar (siempre disponible)."""
+    name = 'json'
+
+    def loads(self, content: bytes) -> Any:
+        return json.loads(content)
+
+
+class OrjsonDecoder(JsonDecoder):
+    """``orjson.loads``; sus errores también son ``ValueError``."""
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson  # ImportError si no está instalado
+
+        self._loads = orjson.loads
+
+    def loads(self, content: bytes) -> Any:
+        return self._loads(content)
+
+
+DECODERS: Dict[str, Callable[[], JsonDecoder]] = {
+    'json': JsonDecoder,
+    'orjson': OrjsonDecoder,
+}
+
+
+def get_decoder(name: str = 'auto') -> JsonDecoder:
+    """Decodificador por nombre; ``'auto'`` elige el más rápido instalado."""
+    if name == 'auto':
+        try:
+            return OrjsonDecoder()
+        except ImportError:
+            return JsonDecoder()
+    try:
+        factory = DECODERS[name]
+    except KeyError:
+        raise ValueError(f"Decodificador JSON desconocido: {name}") from None
+    return factory()
+
+
+def iter_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Elementos de un arreglo JSON (UTF-8) repartido en ``chunks``, según van llegando.
+
+    En memoria sólo quedan el trozo pendiente y el elemento en curso. Cada
+    elemento se decodifica con el escáner en C de ``json``; un valor partido
+    entre dos trozos se reintenta al llegar el siguiente. Lanza ``ValueError``
+    si el documento no es un arreglo o está mal formado.
+    """
+    source = iter(chunks)
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    raw_decode = json.JSONDecoder().raw_decode
+    buffer, pos, eof = '', 0, False
+    state = _START
+
+    def fill() -> None:
+        # Agregar el siguiente trozo descartando lo ya procesado
+        nonlocal buffer, pos, eof
+        chunk = next(source, None)
+        eof = chunk is None
+        buffer = buffer[pos:] + utf8.decode(chunk or b'', final=eof)
+        pos = 0
+
+    while True:
+        match = _NON_SPACE.search(buffer, pos)
+        if match is None:
+            if eof:
+                raise ValueError("El arreglo JSON está incompleto")
+            pos = len(buffer)
+            fill()
+            continue
+        pos = match.start()
+        char = buffer[pos]
+
+        if state == _START:
+            if char != '[':
+                raise ValueError("La respuesta no es un arreglo JSON")
+            pos += 1
+            state = _FIRST
+        elif state in (_FIRST, _NEXT) and char == ']':
+            return
+        elif state == _NEXT:
+            if char != ',':
+                raise ValueError(f"Se esperaba ',' o ']' y llegó {char!r}")
+            pos += 1
+            state = _VALUE
+        else:
+            try:
+                value, end = raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if char in _NUMBER_START and not eof:
+                # Un número puede seguir en el próximo trozo: confirmarlo con lo que viene
+                following = _NON_SPACE.search(buffer, end)
+                if following is None or buffer[following.start()] not in ',]':
+                    fill()
+                    continue
+            pos = end
+            state = _NEXT
+            yield value
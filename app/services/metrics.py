@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import DefaultDict, Dict, List, Tuple
+
+_NUMERIC_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_of(path: str) -> str:
+    """Ruta sin ids para agrupar métricas ('/groups/17/students' -> '/groups/{id}/students')."""
+    return _NUMERIC_SEGMENT.sub('/{id}', path.split('?', 1)[0])
+
+
+class Metrics:
+    """Contadores del cliente HTTP, seguros entre hilos (p. ej. ``get.coalesced``).
+
+    ``record_bytes`` acumula además, por endpoint, el tamaño de los cuerpos
+    antes y después de comprimir; ``transfers`` los devuelve con el ahorro.
+    """
+
+    def __init__(self) -> None:
+        self._counters: Counter = Counter()
+        # (endpoint, 'in'|'out') -> [cuerpos, bytes sin comprimir, bytes en la red]
+        self._bytes: DefaultDict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0, 0])
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._counters[name]
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def record_bytes(self, endpoint: str, direction: str, plain: int, wire: int) -> None:
+        """Un cuerpo de ``plain`` bytes que viajó como ``wire``; ``direction`` es 'in' u 'out'."""
+        with self._lock:
+            totals = self._bytes[(endpoint, direction)]
+            totals[0] += 1
+            totals[1] += plain
+            totals[2] += wire
+
+    def transfers(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """``{endpoint: {'in'|'out': {bodies, plain, wire, saved}}}``; ``saved`` es la fracción ahorrada."""
+        with self._lock:
+            items = [(key, list(totals)) for key, totals in self._bytes.items()]
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (endpoint, direction), (bodies, plain, wire) in sorted(items):
+            result.setdefault(endpoint, {})[direction] = {
+                'bodies': bodies, 'plain': plain, 'wire': wire,
+                'saved': 1 - wire / plain if plain else 0.0,
+            }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._bytes.clear()
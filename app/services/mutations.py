@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.config import CONFIG
+
+Row = Dict[str, Any]
+
+
+def apply_saved(rows: Sequence[Row], entity: Row) -> Optional[List[Row]]:
+    """Copia de ``rows`` con la entidad guardada actualizada (por ``id``) o agregada al final.
+
+    Devuelve ``None`` si la entidad no trae todos los campos que usa el
+    listado: en ese caso hay que volver a descargarlo. Vale también al
+    actualizar: una respuesta con sólo ``careerId`` dejaría en la fila el
+    ``careerName`` anterior.
+    """
+    result = list(rows)
+    for position, row in enumerate(result):
+        if row.get('id') == entity.get('id'):
+            if not set(row).issubset(entity):
+                return None
+            merged = dict(row)
+            merged.update(entity)
+            result[position] = merged
+            return result
+    if result and not set(result[0]).issubset(entity):
+        return None
+    result.append(dict(entity))
+    return result
+
+
+def apply_deleted(rows: Sequence[Row], entity_id: Any) -> List[Row]:
+    return [row for row in rows if row.get('id') != entity_id]
+
+
+def append_page(rows: Sequence[Row], page: Sequence[Row]) -> List[Row]:
+    """Agrega una página nueva omitiendo las filas que ya están (p. ej. creadas localmente)."""
+    known = {row.get('id') for row in rows}
+    return list(rows) + [row for row in page if row.get('id') not in known]
+
+
+def schedule_revalidation(widget: tk.Misc, reload: Callable[[], None]) -> None:
+    """Confirma un cambio aplicado localmente volviendo a pedir el listado más tarde.
+
+    Desactivado con ``REVALIDATE_AFTER_SAVE_MS=0`` (el valor por omisión).
+    """
+    delay = CONFIG.revalidate_after_save_ms
+    if delay <= 0:
+        return
+
+    def run() -> None:
+        try:
+            if widget.winfo_exists():
+                reload()
+        except tk.TclError:
+            pass
+    widget.after(delay, run)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - sólo para anotaciones
+    from app.services.api_client import ApiClient
+
+# Nombres habituales de los campos de una respuesta paginada "sobre" ({items, nextCursor})
+_ITEM_FIELDS = ('items', 'content', 'data', 'results')
+_CURSOR_FIELDS = ('nextCursor', 'next_cursor', 'cursor')
+
+Page = List[Dict[str, Any]]
+
+
+def page_items(body: Any) -> Tuple[Page, Optional[str], Optional[bool]]:
+    """Separa una respuesta en ``(elementos, siguiente_cursor, es_la_última)``.
+
+    Acepta tanto un arreglo JSON plano como un objeto con los elementos en
+    ``items``/``content``/``data``/``results``.
+    """
+    if body is None:
+        return [], None, True
+    if isinstance(body, list):
+        return body, None, None
+    items = next((body[name] for name in _ITEM_FIELDS if isinstance(body.get(name), list)), [])
+    cursor = next((body[name] for name in _CURSOR_FIELDS if body.get(name)), None)
+    last = body.get('last')
+    return items, cursor, (bool(last) if last is not None else None)
+
+
+class PageIterator(Iterator[Page]):
+    """Recorre una colección de la API página por página.
+
+    ``mode='offset'`` pide ``limit``/``offset``; ``mode='cursor'`` pide ``limit``
+    y el ``cursor`` que devolvió la página anterior. Con ``prefetch`` la página
+    siguiente se descarga en segundo plano mientras se usa la actual. Si el
+    servidor ignora la paginación y devuelve el arreglo completo, éste se
+    entrega como única página; si ignora ``offset``/``cursor`` y repite la
+    misma página, el recorrido termina en lugar de pedirla para siempre.
+    """
+
+    # Las páginas se piden al desplazarse, no apenas llega la anterior
+    eager = False
+
+    def __init__(
+        self,
+        api: ApiClient,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        page_size: int = 200,
+        mode: str = 'offset',
+        prefetch: bool = True,
+    ) -> None:
+        if mode not in ('offset', 'cursor'):
+            raise ValueError(f"Modo de paginación desconocido: {mode}")
+        self.api = api
+        self.path = path
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self.mode = mode
+        self.prefetch = prefetch
+        self.pages_loaded = 0
+        self._state: Any = 0 if mode == 'offset' else None
+        self._done = False
+        self._future: Optional[Future] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._last_page: Optional[Page] = None
+
+    @property
+    def has_more(self) -> bool:
+        return not self._done or self._future is not None
+
+    @property
+    def first_params(self) -> Dict[str, Any]:
+        """Parámetros de la primera página (sirven para ``ApiClient.peek``)."""
+        return self._params_for(0 if self.mode == 'offset' else None)
+
+    def peek_first(self) -> Optional[Page]:
+        """La primera página guardada en disco, sin ir a la red."""
+        body = self.api.peek(self.path, self.first_params)
+        return page_items(body)[0] if body is not None else None
+
+    def __next__(self) -> Page:
+        if self._future is not None:
+            future, self._future = self._future, None
+            page, next_state = future.result()
+        elif self._done:
+            raise StopIteration
+        else:
+            page, next_state = self._fetch(self._state)
+
+        if page and page == self._last_page:
+            # El servidor no avanzó (ignora offset/cursor): no hay más que pedir
+            self.close()
+            raise StopIteration
+        self._last_page = page
+        self.pages_loaded += 1
+        self._state = next_state
+        if next_state is None:
+            self._done = True
+            self.close()
+        elif self.prefetch and not self._done:
+            self._future = self._get_pool().submit(self._fetch, next_state)
+        return page
+
+    def close(self) -> None:
+        self._done = True
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sigue-page')
+        return self._pool
+
+    def _params_for(self, state: Any) -> Dict[str, Any]:
+        params = dict(self.params)
+        params['limit'] = self.page_size
+        if self.mode == 'offset':
+            params['offset'] = state
+        elif state:
+            params['cursor'] = state
+        return params
+
+    def _fetch(self, state: Any) -> Tuple[Page, Any]:
+        body = self.api.get(self.path, params=self._params_for(state))
+        items, cursor, last = page_items(body)
+        if isinstance(body, list) and len(body) > self.page_size:
+            return items, None  # El servidor no pagina: ya está todo
+        if self.mode == 'cursor':
+            return items, (cursor if cursor and cursor != state and last is not True else None)
+        if last or len(items) < self.page_size:
+            return items, None
+        return items, state + len(items)
+
+
+class StreamPages(Iterator[Page]):
+    """Una colección completa pedida en una sola respuesta y entregada por páginas.
+
+    Los elementos se decodifican mientras llega el cuerpo (``ApiClient.stream``)
+    y se agrupan de a ``page_size``. La respuesta queda abierta hasta leerla
+    entera, por eso ``eager``: quien la consume pide la página siguiente en
+    cuanto recibe una, sin esperar a que el usuario se desplace. Tiene la
+    misma interfaz que ``PageIterator``.
+    """
+
+    eager = True
+
+    def __init__(
+        self,
+        api: ApiClient,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        page_size: int = 200,
+    ) -> None:
+        self.api = api
+        self.path = path
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self.pages_loaded = 0
+        self._items: Optional[Iterator[Any]] = None
+        self._done = False
+        # close() puede llegar desde el hilo de Tk mientras un hilo lee la respuesta
+        self._lock = threading.Lock()
+
+    @property
+    def has_more(self) -> bool:
+        return not self._done
+
+    @property
+    def first_params(self) -> Dict[str, Any]:
+        return dict(self.params)
+
+    def peek_first(self) -> Optional[Page]:
+        """La colección guardada en disco por un GET normal, si la hay."""
+        body = self.api.peek(self.path, self.first_params)
+        return page_items(body)[0] if body is not None else None
+
+    def __next__(self) -> Page:
+        with self._lock:
+            if self._done:
+                raise StopIteration
+            if self._items is None:
+                self._items = self.api.stream(self.path, self.params or None)
+            try:
+                page = list(islice(self._items, self.page_size))
+            except BaseException:
+                self._finish()
+                raise
+            self.pages_loaded += 1
+            if len(page) < self.page_size or self._done:
+                self._finish()
+            return page
+
+    def close(self) -> None:
+        self._done = True
+        # Si un hilo está leyendo, él mismo cierra la respuesta al terminar la página
+        if self._lock.acquire(blocking=False):
+            try:
+                self._finish()
+            finally:
+                self._lock.release()
+
+    def _finish(self) -> None:
+        self._done = True
+        items, self._items = self._items, None
+        if items is not None:
+            items.close()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from app.config import CONFIG
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+@dataclass
+class FetchResult:
+    """Resultados de ``fetch_all`` por nombre, junto con los errores de cada petición."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """El primer error (en el orden de las peticiones), o ``None``."""
+        return next(iter(self.errors.values()), None)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=CONFIG.fetch_threads, thread_name_prefix='sigue-fetch')
+        return _pool
+
+
+def fetch_all(calls: Dict[str, Callable[[], Any]]) -> FetchResult:
+    """Ejecuta peticiones independientes a la vez y espera a todas.
+
+    Pensado para llamarse desde una tarea del ``EXECUTOR``: usa su propio pool
+    para no bloquear a los hilos que la esperan. La primera llamada corre en el
+    hilo actual. Un fallo no cancela a las demás; queda en ``errors``.
+    """
+    result = FetchResult()
+    names = list(calls)
+    if not names:
+        return result
+
+    pool = _get_pool()
+    futures: Dict[str, Future] = {name: pool.submit(calls[name]) for name in names[1:]}
+    try:
+        result.results[names[0]] = calls[names[0]]()
+    except Exception as error:  # noqa: BLE001 - se entrega a quien llama
+        result.errors[names[0]] = error
+
+    for name, future in futures.items():
+        try:
+            result.results[name] = future.result()
+        except Exception as error:  # noqa: BLE001
+            result.errors[name] = error
+    return result
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
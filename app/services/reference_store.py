@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from app.services.mutations import apply_deleted, apply_saved
+
+if TYPE_CHECKING:  # pragma: no cover - sólo para anotaciones
+    from app.services.api_client import ApiClient
+
+# Catálogos compartidos entre módulos y la ruta de la API de la que salen
+REFERENCE_PATHS: Dict[str, str] = {
+    'careers': '/careers',
+    'subjects': '/subjects',
+    'teachers': '/teachers',
+    'classrooms': '/classrooms',
+    'schedules': '/schedules',
+}
+
+# Qué catálogos quedan obsoletos al guardar o eliminar cada tipo de entidad
+INVALIDATES: Dict[str, tuple] = {
+    'careers': ('careers', 'subjects'),
+    'subjects': ('subjects',),
+    'teachers': ('teachers',),
+    'classrooms': ('classrooms',),
+    'schedules': ('schedules',),
+}
+
+
+@dataclass
+class _Entry:
+    data: List[Dict[str, Any]]
+    loaded_at: float
+
+
+class ReferenceStore:
+    """Catálogos de la sesión (carreras, materias, maestros, salones, horarios).
+
+    Una sola descarga por catálogo sirve a todos los módulos mientras no venza
+    su TTL o alguien lo invalide al guardar/eliminar. Es seguro usarlo desde
+    los hilos del ``EXECUTOR``. Las listas devueltas son copias superficiales:
+    se pueden reordenar, pero los diccionarios no deben modificarse.
+
+    Cada catálogo lleva una versión que sube al invalidarlo, parcharlo o
+    vaciar el almacén: una descarga que termina después ya no lo pisa con
+    datos de antes del guardado o de la sesión anterior.
+    """
+
+    def __init__(self, ttl: float = 300.0, ttls: Optional[Dict[str, float]] = None) -> None:
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, _Entry] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, api: ApiClient, kind: str) -> List[Dict[str, Any]]:
+        """Devuelve el catálogo ``kind``; lo descarga si no está o ya venció."""
+        with self._lock:
+            entry = self._entries.get(kind)
+            if entry is not None and time.monotonic() - entry.loaded_at < self.ttls.get(kind, self.ttl):
+                self.hits += 1
+                return list(entry.data)
+            self.misses += 1
+            version = self._versions.setdefault(kind, 0)
+
+        data = api.get(REFERENCE_PATHS[kind]) or []
+        with self._lock:
+            if self._versions.get(kind) == version:
+                self._entries[kind] = _Entry(data, time.monotonic())
+        return list(data)
+
+    def version(self, kind: str) -> int:
+        """Versión actual de ``kind``; se toma antes de descargarlo para pasarla a ``prime``."""
+        with self._lock:
+            return self._versions.setdefault(kind, 0)
+
+    def prime(self, kind: str, data: List[Dict[str, Any]], version: Optional[int] = None) -> None:
+        """Guarda un catálogo ya descargado (p. ej. por el precalentamiento).
+
+        Con ``version`` no se guarda si el catálogo cambió desde que se tomó.
+        """
+        with self._lock:
+            if version is not None and self._versions.get(kind) != version:
+                return
+            self._entries[kind] = _Entry(list(data), time.monotonic())
+
+    def peek(self, api: ApiClient, kind: str) -> Optional[List[Dict[str, Any]]]:
+        """Lo que haya en memoria (o en la caché de disco), aunque esté vencido, sin ir a la red."""
+        with self._lock:
+            entry = self._entries.get(kind)
+        if entry is not None:
+            return list(entry.data)
+        return api.peek(REFERENCE_PATHS[kind])
+
+    def subjects_for_career(self, api: ApiClient, career_id: int) -> List[Dict[str, Any]]:
+        return [subject for subject in self.get(api, 'subjects') if subject.get('careerId') == career_id]
+
+    def invalidate(self, *kinds: str) -> None:
+        with self._lock:
+            for kind in kinds:
+                self._entries.pop(kind, None)
+                self._bump(kind)
+
+    def apply_saved(self, kind: str, entity: Dict[str, Any]) -> None:
+        """Aplica al catálogo en memoria la entidad que devolvió un POST/PUT, sin volver a descargarlo."""
+        with self._lock:
+            self._bump(kind)
+            entry = self._entries.get(kind)
+            if entry is not None:
+                rows = apply_saved(entry.data, entity)
+                if rows is None:
+                    del self._entries[kind]
+                else:
+                    entry.data = rows
+        self._invalidate_dependents(kind)
+
+    def apply_deleted(self, kind: str, entity_id: Any) -> None:
+        with self._lock:
+            self._bump(kind)
+            entry = self._entries.get(kind)
+            if entry is not None:
+                entry.data = apply_deleted(entry.data, entity_id)
+        self._invalidate_dependents(kind)
+
+    def _bump(self, kind: str) -> None:
+        # Llamar con el lock tomado
+        self._versions[kind] = self._versions.get(kind, 0) + 1
+
+    def _invalidate_dependents(self, kind: str) -> None:
+        self.invalidate(*[other for other in INVALIDATES.get(kind, (kind,)) if other != kind])
+
+    def invalidate_for(self, entity: str) -> None:
+        """Invalida lo que depende de ``entity`` tras guardarla o eliminarla."""
+        self.invalidate(*INVALIDATES.get(entity, (entity,)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for kind in self._versions:
+                self._bump(kind)
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'loaded': sorted(self._entries)}
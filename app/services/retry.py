@@ -0,0 +1,79 @@
+"""Reintentos de las peticiones HTTP ante fallos transitorios.
+
+Se reintenta ante errores de conexión o tiempo de espera y ante las
+respuestas de ``RETRY_STATUSES``, sólo con métodos idempotentes o con un POST
+que lleve ``Idempotency-Key`` (el servidor descarta el duplicado si el primer
+intento sí llegó). La espera entre intentos crece exponencialmente con
+*jitter* completo, salvo que el servidor indique ``Retry-After`` (429/503).
+"""
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Cuántas veces y con qué espera reintentar una petición.
+
+    ``attempts`` cuenta el primer intento (1 = no reintentar). La espera antes
+    del reintento ``n`` (desde 0) es aleatoria entre 0 y
+    ``min(max_backoff, backoff * 2**n)`` segundos. Un ``Retry-After`` mayor que
+    ``max_retry_after`` no se espera: el error se entrega de inmediato.
+    """
+    attempts: int = 3
+    backoff: float = 0.25
+    max_backoff: float = 4.0
+    max_retry_after: float = 30.0
+    # Reintentar POST enviando una Idempotency-Key generada automáticamente
+    retry_post: bool = True
+
+    def allows(self, method: str, headers: Dict[str, str]) -> bool:
+        if self.attempts <= 1:
+            return False
+        return method in IDEMPOTENT_METHODS or (method == 'POST' and IDEMPOTENCY_HEADER in headers)
+
+    def delay(self, retry: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Segundos a esperar antes del reintento ``retry``; ``None`` si no vale la pena esperar."""
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** retry))
+
+
+NO_RETRY = RetryPolicy(attempts=1, retry_post=False)
+
+# Políticas por ruta (gana el prefijo más largo). El login corre en el hilo de
+# la interfaz: esperar entre reintentos la congelaría, y las credenciales
+# erróneas no son transitorias.
+DEFAULT_RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    '/auth': NO_RETRY,
+}
+
+
+def policy_for(path: str, policies: Dict[str, RetryPolicy], default: RetryPolicy) -> RetryPolicy:
+    best = ''
+    for prefix in policies:
+        if (path == prefix or path.startswith(prefix + '/')) and len(prefix) > len(best):
+            best = prefix
+    return policies[best] if best else default
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Segundos de un ``Retry-After`` (número o fecha HTTP); ``None`` si no hay o no se entiende."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
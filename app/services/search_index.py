@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import re
+import sys
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+_SPLIT = re.compile(r'[^0-9a-z]+')
+# Uniones con más tokens que esto se guardan hasta el próximo cambio del índice
+_CACHE_MIN_TOKENS = 256
+_CACHE_SIZE = 64
+# Hasta cuántos tokens nuevos se insertan uno a uno en el vocabulario; con más
+# se agregan al final y se reordena (dos tramos ordenados: una sola mezcla)
+_INSERT_MAX = 64
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y sin acentos ('José' -> 'jose')."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _SPLIT.split(normalize(text)) if token]
+
+
+class SearchIndex:
+    """Índice invertido en memoria para filtrar tablas mientras se escribe.
+
+    Cada fila se parte en tokens (``fields`` más su ``id``) y cada token apunta
+    a los ids que lo contienen (internados, como los de ``VirtualTable``: así
+    filtrar la tabla con el resultado compara punteros y no cadenas). Una
+    palabra de la consulta coincide con todos los tokens que empiezan por ella
+    (búsqueda binaria sobre el vocabulario ordenado); varias palabras deben
+    coincidir todas (AND).
+
+    ``update`` sólo reindexa las filas nuevas, cambiadas o eliminadas: una fila
+    que es el mismo objeto que la vez anterior, o trae los mismos valores en
+    ``fields``, no se vuelve a tokenizar. Aun así recorre toda la lista; cuando
+    se sabe qué cambió (una página nueva, un guardado, un borrado) ``upsert`` y
+    ``remove`` sólo tocan esas filas. El vocabulario tampoco se rehace: los
+    tokens nuevos se insertan en su lugar y los que quedan sin filas se
+    descartan al buscar.
+    """
+
+    def __init__(self, fields: Sequence[str]) -> None:
+        self.fields = tuple(fields)
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._signatures: Dict[str, Tuple[Any, ...]] = {}
+        self._tokens: Dict[str, Tuple[str, ...]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        # Vocabulario ordenado para buscar por prefijo. Los tokens nuevos esperan en
+        # _pending hasta la próxima búsqueda; los que ya no tienen filas siguen en
+        # el vocabulario (en _stale) hasta que conviene rehacerlo
+        self._vocabulary: List[str] = []
+        self._pending: Set[str] = set()
+        self._stale: Set[str] = set()
+        self._cache: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def update(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Sincroniza el índice con ``rows``; devuelve cuántas filas se reindexaron."""
+        seen: Set[str] = set()
+        changed = self._upsert(rows, seen)
+        # Todo lo visto quedó indexado: si sobran filas, son las eliminadas
+        if len(self._tokens) > len(seen):
+            for row_id in [row_id for row_id in self._tokens if row_id not in seen]:
+                self._remove(row_id)
+                changed += 1
+        if changed:
+            self._cache.clear()
+        return changed
+
+    def upsert(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Indexa sólo ``rows`` (p. ej. una página nueva), sin recorrer las demás filas."""
+        changed = self._upsert(rows, set())
+        if changed:
+            self._cache.clear()
+        return changed
+
+    def remove(self, row_ids: Iterable[Any]) -> int:
+        """Quita del índice las filas ``row_ids`` (p. ej. tras eliminarlas)."""
+        removed = 0
+        for row_id in row_ids:
+            row_id = str(row_id)
+            if row_id in self._tokens:
+                self._remove(row_id)
+                removed += 1
+        if removed:
+            self._cache.clear()
+        return removed
+
+    def clear(self) -> None:
+        self._rows.clear()
+        self._signatures.clear()
+        self._tokens.clear()
+        self._postings.clear()
+        self._vocabulary = []
+        self._pending.clear()
+        self._stale.clear()
+        self._cache.clear()
+
+    def search(self, query: str) -> Optional[Set[str]]:
+        """Ids (como texto) que coinciden con ``query``.
+
+        Devuelve ``None`` si no hay nada que filtrar: la consulta está vacía o
+        coinciden todas las filas.
+        """
+        words = tokenize(query)
+        if not words:
+            return None
+        result: Optional[Set[str]] = None
+        # Empezar por la palabra más larga: suele ser la más selectiva
+        for word in sorted(set(words), key=len, reverse=True):
+            matches = self._match(word)
+            if result is None and len(matches) == len(self._tokens):
+                continue  # Palabra que no descarta nada
+            if result is None:
+                result = set(matches)
+            else:
+                result &= matches
+            if not result:
+                break
+        return result
+
+    # --- Internos ---
+    def _upsert(self, rows: Iterable[Dict[str, Any]], seen: Set[str]) -> int:
+        known, signatures, fields = self._rows, self._signatures, self.fields
+        changed = 0
+        for row in rows:
+            row_id = sys.intern(str(row['id']))
+            seen.add(row_id)
+            if known.get(row_id) is row:
+                continue
+            signature = tuple(map(row.get, fields))
+            if signatures.get(row_id) != signature:
+                self._remove(row_id)
+                self._add(row_id, row)
+                signatures[row_id] = signature
+                changed += 1
+            known[row_id] = row
+        return changed
+
+    def _row_tokens(self, row_id: str, row: Dict[str, Any]) -> Tuple[str, ...]:
+        tokens = {row_id}
+        for field in self.fields:
+            value = row.get(field)
+            if value:
+                tokens.update(tokenize(str(value)))
+        return tuple(tokens)
+
+    def _add(self, row_id: str, row: Dict[str, Any]) -> None:
+        tokens = self._row_tokens(row_id, row)
+        self._tokens[row_id] = tokens
+        postings = self._postings
+        for token in tokens:
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = ids = set()
+                if token in self._stale:
+                    self._stale.discard(token)  # Sigue en el vocabulario
+                else:
+                    self._pending.add(token)
+            ids.add(row_id)
+
+    def _remove(self, row_id: str) -> None:
+        self._rows.pop(row_id, None)
+        self._signatures.pop(row_id, None)
+        tokens = self._tokens.pop(row_id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is not None:
+                ids.discard(row_id)
+                if not ids:
+                    del self._postings[token]
+                    if token in self._pending:
+                        self._pending.discard(token)
+                    else:
+                        self._stale.add(token)
+
+    def _match(self, word: str) -> Set[str]:
+        cached = self._cache.get(word)
+        if cached is not None:
+            return cached
+        vocabulary = self._sync_vocabulary()
+        start = bisect_left(vocabulary, word)
+        end = bisect_left(vocabulary, word + '\x7f', start)  # Los tokens sólo tienen [0-9a-z]
+        postings = self._postings
+        if end - start == 1:
+            return postings.get(vocabulary[start], set())
+        sets = [ids for ids in map(postings.get, vocabulary[start:end]) if ids is not None]
+        largest = max(sets, key=len, default=set())
+        if len(largest) == len(self._tokens):
+            return largest  # Un token que está en todas las filas: la unión no agrega nada
+        matches: Set[str] = set().union(*sets)
+        if end - start >= _CACHE_MIN_TOKENS:
+            if len(self._cache) >= _CACHE_SIZE:
+                self._cache.clear()
+            self._cache[word] = matches
+        return matches
+
+    def _sync_vocabulary(self) -> List[str]:
+        vocabulary, pending = self._vocabulary, self._pending
+        if len(self._stale) * 4 > len(vocabulary):
+            # Demasiados tokens sin filas: rehacerlo desde las listas vigentes
+            self._vocabulary = vocabulary = sorted(self._postings)
+            pending.clear()
+            self._stale.clear()
+        elif len(pending) <= _INSERT_MAX:
+            for token in pending:
+                insort(vocabulary, token)
+            pending.clear()
+        else:
+            vocabulary.extend(sorted(pending))
+            vocabulary.sort()
+            pending.clear()
+        return vocabulary
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+
+from app.services.reference_store import ReferenceStore
 
 
 @dataclass
 class UserSession:
     token: Optional[str] = None
     user: Dict[str, str] = field(default_factory=dict)
+    # Catálogos compartidos por todos los módulos durante la sesión
+    references: ReferenceStore = field(default_factory=ReferenceStore)
+    # Ficha completa del maestro/alumno logueado (la precarga el warm-up)
+    profile: Dict[str, Any] = field(default_factory=dict)
 
     @property
     def is_authenticated(self) -> bool:
@@ -20,3 +26,5 @@ class UserSession:
     def clear(self) -> None:
         self.token = None
         self.user = {}
+        self.profile = {}
+        self.references.clear()
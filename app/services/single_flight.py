@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.services.metrics import Metrics
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Agrupa llamadas idénticas concurrentes para que compartan una sola ejecución.
+
+    El primer hilo que pide una clave ejecuta ``func``; los que llegan mientras
+    sigue en curso esperan y reciben el mismo resultado (o la misma excepción).
+    """
+
+    def __init__(self, metrics: Optional[Metrics] = None, name: str = 'singleflight') -> None:
+        self.metrics = metrics or Metrics()
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            self.metrics.incr(f"{self.name}.coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        self.metrics.incr(f"{self.name}.leader")
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,65 @@
+"""Medición de las fases del arranque, desde el import de ``main`` hasta el login.
+
+Con ``STARTUP_PROFILE=/ruta/informe.json`` la aplicación guarda las fases en ese
+archivo en cuanto la pantalla de inicio de sesión queda lista y se cierra sola
+(lo usa ``benchmarks/bench_startup.py``). Sin la variable, ``mark`` sólo anota.
+
+Este módulo sólo usa la biblioteca estándar: se importa antes que todo lo demás
+para que el origen de la medición sea lo más temprano posible.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import tkinter as tk
+from typing import Any, Dict, List, Optional, Tuple
+
+_ORIGIN = time.perf_counter()
+PROFILE_PATH: Optional[str] = os.getenv("STARTUP_PROFILE") or None
+
+
+class StartupTimer:
+    """Tiempos (ms) de cada fase, medidos desde la marca anterior."""
+
+    def __init__(self, origin: Optional[float] = None) -> None:
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases: List[Tuple[str, float]] = []
+        self._last = self.origin
+
+    def mark(self, phase: str) -> float:
+        now = time.perf_counter()
+        elapsed = (now - self._last) * 1000
+        self.phases.append((phase, elapsed))
+        self._last = now
+        return elapsed
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self.origin) * 1000
+
+    def report(self) -> Dict[str, Any]:
+        return {'phases': dict(self.phases), 'total_ms': self.total_ms}
+
+
+TIMER = StartupTimer(_ORIGIN)
+
+
+def mark(phase: str) -> None:
+    TIMER.mark(phase)
+
+
+def finish(root: tk.Tk) -> None:
+    """Marca la fase ``interactive`` cuando el bucle de Tk ya dibujó la ventana.
+
+    En modo perfil escribe el informe y cierra la aplicación.
+    """
+    def done() -> None:
+        mark('interactive')
+        if PROFILE_PATH:
+            with open(PROFILE_PATH, 'w', encoding='utf-8') as handle:
+                json.dump(TIMER.report(), handle)
+            root.destroy()
+
+    # after_idle deja pasar el primer redibujado; after(0) corre justo después
+    root.after_idle(lambda: root.after(0, done))
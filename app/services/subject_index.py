@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import heapq
+import operator
+from typing import Any, Collection, Dict, FrozenSet, List, Sequence, Tuple
+
+Option = Tuple[Any, str]
+
+
+def _same_rows(old: Sequence[Dict[str, Any]], new: Sequence[Dict[str, Any]]) -> bool:
+    # El ReferenceStore devuelve copias de la lista pero los mismos diccionarios
+    # mientras el catálogo no cambie (copy-on-write)
+    return len(old) == len(new) and all(map(operator.is_, old, new))
+
+
+class SubjectIndex:
+    """Materias agrupadas por carrera, con el texto de la lista ya armado.
+
+    ``update`` rehace el índice sólo si cambiaron las carreras o las materias.
+    ``options(career_ids)`` devuelve las materias de esas carreras (todas si
+    no hay ninguna) en el orden del catálogo, mezclando las listas ya
+    ordenadas de cada carrera: cuesta lo que mide el resultado, no el
+    catálogo. El resultado de la última selección se reutiliza tal cual (la
+    misma lista) hasta que cambie la selección o el índice.
+    """
+
+    def __init__(self) -> None:
+        self._careers: List[Dict[str, Any]] = []
+        self._subjects: List[Dict[str, Any]] = []
+        self.by_id: Dict[Any, Dict[str, Any]] = {}
+        self._all: List[Option] = []
+        # carrera -> [(posición en el catálogo, id, texto)]
+        self._by_career: Dict[Any, List[Tuple[int, Any, str]]] = {}
+        self._last: Tuple[FrozenSet[Any], List[Option]] = (frozenset(), [])
+
+    def update(self, careers: Sequence[Dict[str, Any]], subjects: Sequence[Dict[str, Any]]) -> bool:
+        """Sincroniza el índice; devuelve ``True`` si hubo que rehacerlo."""
+        if _same_rows(self._careers, careers) and _same_rows(self._subjects, subjects):
+            return False
+        self._careers, self._subjects = list(careers), list(subjects)
+        career_names = {career['id']: career['name'] for career in reversed(self._careers)}
+        self.by_id = {}
+        self._all = []
+        self._by_career = {}
+        for position, subject in enumerate(self._subjects):
+            career_id = subject.get('careerId')
+            label = f"{subject['id']} - {subject['name']} ({career_names.get(career_id, '')})"
+            self.by_id[subject['id']] = subject
+            self._all.append((subject['id'], label))
+            self._by_career.setdefault(career_id, []).append((position, subject['id'], label))
+        self._last = (frozenset(), self._all)
+        return True
+
+    def options(self, career_ids: Collection[Any]) -> List[Option]:
+        key = frozenset(career_ids)
+        if key == self._last[0]:
+            return self._last[1]
+        if not key:
+            result = self._all
+        else:
+            lists = [self._by_career[career_id] for career_id in key if career_id in self._by_career]
+            result = [(subject_id, label) for _position, subject_id, label in heapq.merge(*lists)]
+        self._last = (key, result)
+        return result
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.background import EXECUTOR
+from app.services.parallel import FetchResult, fetch_all
+from app.services.reference_store import REFERENCE_PATHS
+
+if TYPE_CHECKING:  # pragma: no cover - sólo para anotaciones
+    import tkinter as tk
+
+    from app.services.api_client import ApiClient
+    from app.services.session import UserSession
+
+logger = logging.getLogger(__name__)
+
+# Qué se precarga según el rol: catálogos del ReferenceStore y, para maestros y
+# alumnos, su propia ficha ('profile' = GET {ruta}/me seguido de {ruta}/{id}).
+WARMUP_PLAN: Dict[str, Tuple[Tuple[str, ...], Optional[str]]] = {
+    'ADMIN': (tuple(REFERENCE_PATHS), None),
+    'TEACHER': (('subjects', 'careers'), '/teachers'),
+    'STUDENT': (('careers',), '/students'),
+}
+
+
+@dataclass
+class WarmupReport:
+    role: Optional[str]
+    prefetched: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+    def summary(self) -> str:
+        status = 'cancelado' if self.cancelled else 'listo'
+        text = f"warm-up {self.role} {status} en {self.elapsed * 1000:.0f} ms: {', '.join(self.prefetched) or 'nada'}"
+        if self.errors:
+            text += f" (errores: {', '.join(self.errors)})"
+        return text
+
+
+class Warmup:
+    """Precarga en segundo plano lo que el rol va a abrir primero tras el login.
+
+    Los catálogos quedan en ``session.references`` y la ficha propia en
+    ``session.profile``, de modo que el primer clic en un módulo pinta desde
+    memoria. ``cancel`` (al cerrar sesión) detiene el proceso y descarta lo que
+    aún no se haya guardado, para no mezclar datos con la siguiente sesión.
+    """
+
+    def __init__(self, api: ApiClient, session: UserSession) -> None:
+        self.api = api
+        self.session = session
+        self.report: Optional[WarmupReport] = None
+        self._cancelled = threading.Event()
+        self._started = 0.0
+        self._versions: Dict[str, int] = {}
+
+    def start(self, widget: tk.Misc, on_done: Optional[Callable[[WarmupReport], None]] = None) -> None:
+        self._started = time.perf_counter()
+        EXECUTOR.submit(widget, self._run, on_done=lambda result: self._finish(result, on_done), on_error=self._on_error)
+
+    def cancel(self) -> None:
+        if self._cancelled.is_set():
+            return
+        self._cancelled.set()
+        if self.report is None:
+            self.report = WarmupReport(self.session.role, cancelled=True, elapsed=time.perf_counter() - self._started)
+            logger.info(self.report.summary())
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _run(self) -> Optional[FetchResult]:
+        """Descarga en el hilo de trabajo; guardar en la sesión se hace en ``_finish``."""
+        if self.cancelled:
+            return None
+        kinds, profile_path = WARMUP_PLAN.get(self.session.role, ((), None))
+        # Si un módulo guarda algo mientras tanto, su versión del catálogo gana
+        self._versions = {kind: self.session.references.version(kind) for kind in kinds}
+        calls: Dict[str, Callable[[], Any]] = {
+            kind: (lambda path=REFERENCE_PATHS[kind]: self.api.get(path) or []) for kind in kinds
+        }
+        if profile_path:
+            calls['profile'] = lambda: self._fetch_profile(profile_path)
+        return fetch_all(calls)
+
+    def _fetch_profile(self, path: str) -> Dict[str, Any]:
+        me = self.api.get(f"{path}/me")
+        return self.api.get(f"{path}/{me['id']}")
+
+    def _finish(self, result: Optional[FetchResult], on_done: Optional[Callable[[WarmupReport], None]]) -> None:
+        # Se ejecuta en el hilo de Tk; tras un logout el EXECUTOR ya no lo llama
+        if result is None or self.cancelled:
+            return
+        report = WarmupReport(self.session.role)
+        for name, data in result.results.items():
+            if name == 'profile':
+                self.session.profile = data
+            else:
+                self.session.references.prime(name, data, self._versions.get(name))
+            report.prefetched.append(name)
+        report.errors = {name: str(error) for name, error in result.errors.items()}
+        report.elapsed = time.perf_counter() - self._started
+        self.report = report
+        logger.info(report.summary())
+        if on_done is not None:
+            on_done(report)
+
+    def _on_error(self, error: BaseException) -> None:
+        # El warm-up es una optimización: si falla, los módulos cargan como siempre
+        logger.warning("warm-up fallido: %s", error)
@@ -2,12 +2,19 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import messagebox
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
 from app.services.api_client import ApiClient, ApiError
 from app.services.session import UserSession
 
 
+def show_error(title: str, error: BaseException, prefix: str = "") -> None:
+    """Muestra un error de una tarea en segundo plano con el formato de las ventanas."""
+    message = error.message if isinstance(error, ApiError) else str(error)
+    messagebox.showerror(title, f"{prefix}{message}")
+
+
+@runtime_checkable
 class SupportsRefresh(Protocol):
     def refresh(self) -> None:  # pragma: no cover - protocolo para refrescos opcionales
         ...
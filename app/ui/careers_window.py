@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-from app.services.api_client import ApiClient, ApiError
+from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.mutations import schedule_revalidation
 from app.services.session import UserSession
+from app.ui.base_window import show_error
+from app.ui.table_loader import TableLoader
+from app.ui.theme import ensure_theme
 # Ya no es una ventana emergente
 # from app.ui.base_window import ModuleWindow 
 
@@ -18,42 +23,25 @@ class CareersWindow(ttk.Frame):
         self.session = session
         self.current_id: Optional[int] = None
 
-        # --- Paleta de Colores ---
-        self.COLOR_BG = "#ecf0f1"
-        self.COLOR_PRIMARY = "#3498db"
-        self.COLOR_DANGER = "#e74c3c"
-        self.COLOR_TEXT_DARK = "#2c3e50"
-        self.COLOR_WHITE = "#ffffff"
-        self.COLOR_GRAY_BORDER = "#bdc3c7"
-
-        # --- Estilos ---
-        self.style = ttk.Style(self)
-        
-        self.style.configure('Content.TFrame', background=self.COLOR_BG)
+        # --- Estilos: compartidos, se registran una sola vez por raíz (app.ui.theme) ---
+        ensure_theme(self)
         self.configure(style='Content.TFrame')
 
-        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
-        
-        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
-        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
-
-        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
-        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
-        
-        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
-        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
-
         # Layout del Frame
         self.pack(fill=tk.BOTH, expand=True)
         self.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1) # Fila 1 (la tabla) se expandirá
 
-        ttk.Label(self, text="Gestión de Carreras", font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
+        ttk.Label(self, text="Gestión de Carreras", style='Title.TLabel').grid(row=0, column=0, sticky="w", pady=(0, 15))
 
         self._build_tree(self)
         self._build_form(self)
         self._load_careers()
 
+    def refresh(self) -> None:
+        """Vuelve a pedir los datos del módulo (MainMenu lo llama al re-mostrarlo)."""
+        self._load_careers()
+
     def _build_tree(self, container: ttk.Frame) -> None:
         # --- RE-AGREGADO "semesters" ---
         columns = ('id', 'name', 'semesters')
@@ -79,6 +67,7 @@ class CareersWindow(ttk.Frame):
         self.tree.column('semesters', width=100, anchor=tk.CENTER)
         
         self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.table_loader = TableLoader(self.tree, sortable=True)
 
     def _build_form(self, container: ttk.Frame) -> None:
         form = ttk.LabelFrame(container, text="Datos de la Carrera", style='Form.TLabelframe', padding=15)
@@ -158,24 +147,23 @@ class CareersWindow(ttk.Frame):
                     messagebox.showwarning("Registro Duplicado", f"Ya existe una carrera con el nombre '{payload['name']}'.")
                     return
         
-        try:
-            if self.current_id is None:
-                career = self.api.post('/careers', payload)
-            else:
-                career = self.api.put(f"/careers/{self.current_id}", payload)
-                
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:  # noqa: BLE001
-            messagebox.showerror("Error", str(error))
-            return
-        
+        if self.current_id is None:
+            EXECUTOR.submit(self, self.api.post, '/careers', payload, on_done=self._on_saved, on_error=self._on_api_error)
+        else:
+            EXECUTOR.submit(self, self.api.put, f"/careers/{self.current_id}", payload, on_done=self._on_saved, on_error=self._on_api_error)
+
+    def _on_saved(self, career: Dict[str, object]) -> None:
         messagebox.showinfo("Éxito", "Carrera guardada correctamente")
         
         self.current_id = career['id']
         self.id_var.set(str(career['id']))
+        # Aplicar la respuesta localmente en lugar de volver a descargar el catálogo
+        self.session.references.apply_saved('careers', career)
         self._load_careers()
+        schedule_revalidation(self, self._revalidate)
+
+    def _on_api_error(self, error: BaseException) -> None:
+        show_error("Error de API", error)
 
     def _delete(self) -> None:
         if self.current_id is None:
@@ -185,25 +173,33 @@ class CareersWindow(ttk.Frame):
         if not messagebox.askyesno("Confirmar Eliminación", f"¿Estás seguro de que deseas eliminar la carrera '{self.name_var.get()}'?"):
             return
         
-        try:
-            self.api.delete(f"/careers/{self.current_id}")
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:  # noqa: BLE001
-            messagebox.showerror("Error", str(error))
-            return
-        
+        EXECUTOR.submit(
+            self, self.api.delete, f"/careers/{self.current_id}",
+            on_done=lambda _response, career_id=self.current_id: self._on_deleted(career_id), on_error=self._on_api_error
+        )
+
+    def _on_deleted(self, career_id: int) -> None:
         messagebox.showinfo("Éxito", "Carrera eliminada")
         self._reset()
+        self.session.references.apply_deleted('careers', career_id)
+        self._load_careers()
+        schedule_revalidation(self, self._revalidate)
+
+    def _revalidate(self) -> None:
+        self.session.references.invalidate('careers')
         self._load_careers()
 
     def _load_careers(self) -> None:
-        try:
-            careers = self.api.get('/careers')
-            self.tree.delete(*self.tree.get_children())
-            for career in careers:
-                # --- RE-AGREGADO "semesters" ---
-                self.tree.insert('', tk.END, values=(career['id'], career['name'], career['semesters']))
-        except Exception as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar las carreras: {e}")
\ No newline at end of file
+        # Pintar al instante lo ya cargado (memoria o disco) y refrescar en segundo plano
+        cached = self.session.references.peek(self.api, 'careers')
+        if cached is not None:
+            self._populate_careers(cached)
+        EXECUTOR.submit(
+            self, self.session.references.get, self.api, 'careers', key='careers',
+            on_done=self._populate_careers,
+            on_error=lambda e: show_error("Error de Carga", e, "No se pudieron cargar las carreras: ")
+        )
+
+    def _populate_careers(self, careers: List[Dict[str, object]]) -> None:
+        # Sólo se tocan las filas que cambiaron (conserva selección y desplazamiento)
+        self.table_loader.reconcile(careers, lambda career: (career['id'], career['name'], career['semesters']))
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from app.services.api_client import ApiClient, ApiError
+from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.mutations import schedule_revalidation
 from app.services.session import UserSession
+from app.ui.base_window import show_error
+from app.ui.table_loader import TableLoader
+from app.ui.theme import ensure_theme
 
 class ClassroomsWindow(ttk.Frame):
     def __init__(self, master: tk.Misc, api: ApiClient, session: UserSession) -> None:
@@ -14,36 +19,24 @@ class ClassroomsWindow(ttk.Frame):
         self.session = session
         self.current_id: Optional[int] = None
 
-        # --- Paleta de Colores ---
-        self.COLOR_BG = "#ecf0f1"
-        self.COLOR_PRIMARY = "#3498db"
-        self.COLOR_DANGER = "#e74c3c"
-        self.COLOR_TEXT_DARK = "#2c3e50"
-        self.COLOR_WHITE = "#ffffff"
-        self.COLOR_GRAY_BORDER = "#bdc3c7"
-
-        # --- Estilos ---
-        self.style = ttk.Style(self)
-        self.style.configure('Content.TFrame', background=self.COLOR_BG)
+        # --- Estilos: compartidos, se registran una sola vez por raíz (app.ui.theme) ---
+        ensure_theme(self)
         self.configure(style='Content.TFrame')
-        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
-        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
-        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
-        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
-        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
-        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
-        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
 
         self.pack(fill=tk.BOTH, expand=True)
         self.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1)
 
-        ttk.Label(self, text="Gestión de Salones", font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
+        ttk.Label(self, text="Gestión de Salones", style='Title.TLabel').grid(row=0, column=0, sticky="w", pady=(0, 15))
 
         self._build_tree(self)
         self._build_form(self)
         self._load_classrooms()
 
+    def refresh(self) -> None:
+        """Vuelve a pedir los datos del módulo (MainMenu lo llama al re-mostrarlo)."""
+        self._load_classrooms()
+
     def _build_tree(self, container: ttk.Frame) -> None:
         columns = ('id', 'name', 'building')
         tree_container = ttk.Frame(container, style='Content.TFrame')
@@ -61,6 +54,7 @@ class ClassroomsWindow(ttk.Frame):
         self.tree.heading('name', text='Nombre Salón'); self.tree.column('name', width=200)
         self.tree.heading('building', text='Edificio'); self.tree.column('building', width=200)
         self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.table_loader = TableLoader(self.tree, sortable=True)
 
     def _build_form(self, container: ttk.Frame) -> None:
         form = ttk.LabelFrame(container, text="Datos del Salón", style='Form.TLabelframe', padding=15)
@@ -136,27 +130,25 @@ class ClassroomsWindow(ttk.Frame):
                     return
         # --- FIN DE LA VALIDACIÓN ---
         
-        try:
-            if self.current_id is None:
-                classroom = self.api.post('/classrooms', payload)
-            else:
-                classroom = self.api.put(f"/classrooms/{self.current_id}", payload)
-                
-        except ApiError as error:
-            # Ahora, si la API se queja (como en tu foto), mostramos su error real.
-            # No agregamos ningún texto extra.
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:  # noqa: BLE001
-            messagebox.showerror("Error", str(error))
-            return
-        
+        if self.current_id is None:
+            EXECUTOR.submit(self, self.api.post, '/classrooms', payload, on_done=self._on_saved, on_error=self._on_api_error)
+        else:
+            EXECUTOR.submit(self, self.api.put, f"/classrooms/{self.current_id}", payload, on_done=self._on_saved, on_error=self._on_api_error)
+
+    def _on_saved(self, classroom: Dict[str, Any]) -> None:
         messagebox.showinfo("Éxito", "Salón guardado correctamente")
         
         # Actualizamos el ID por si acaso era uno nuevo
         self.current_id = classroom['id']
         self.id_var.set(str(classroom['id']))
+        # Aplicar la respuesta localmente en lugar de volver a descargar el catálogo
+        self.session.references.apply_saved('classrooms', classroom)
         self._load_classrooms() # Recargamos la tabla
+        schedule_revalidation(self, self._revalidate)
+
+    def _on_api_error(self, error: BaseException) -> None:
+        # Si la API se queja, mostramos su error real sin agregar texto extra.
+        show_error("Error de API", error)
 
     def _delete(self) -> None:
         if self.current_id is None:
@@ -166,24 +158,33 @@ class ClassroomsWindow(ttk.Frame):
         if not messagebox.askyesno("Confirmar Eliminación", f"¿Estás seguro de que deseas eliminar el salón '{self.name_var.get()}' del edificio '{self.building_var.get()}'?"):
             return
         
-        try:
-            self.api.delete(f"/classrooms/{self.current_id}")
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:  # noqa: BLE001
-            messagebox.showerror("Error", str(error))
-            return
-        
+        EXECUTOR.submit(
+            self, self.api.delete, f"/classrooms/{self.current_id}",
+            on_done=lambda _response, classroom_id=self.current_id: self._on_deleted(classroom_id), on_error=self._on_api_error
+        )
+
+    def _on_deleted(self, classroom_id: int) -> None:
         messagebox.showinfo("Éxito", "Salón eliminado")
         self._reset()
+        self.session.references.apply_deleted('classrooms', classroom_id)
+        self._load_classrooms()
+        schedule_revalidation(self, self._revalidate)
+
+    def _revalidate(self) -> None:
+        self.session.references.invalidate('classrooms')
         self._load_classrooms()
 
     def _load_classrooms(self) -> None:
-        try:
-            classrooms = self.api.get('/classrooms')
-            self.tree.delete(*self.tree.get_children())
-            for classroom in classrooms:
-                self.tree.insert('', tk.END, values=(classroom['id'], classroom['name'], classroom['building']))
-        except Exception as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los salones: {e}")
\ No newline at end of file
+        # Pintar al instante lo ya cargado (memoria o disco) y refrescar en segundo plano
+        cached = self.session.references.peek(self.api, 'classrooms')
+        if cached is not None:
+            self._populate_classrooms(cached)
+        EXECUTOR.submit(
+            self, self.session.references.get, self.api, 'classrooms', key='classrooms',
+            on_done=self._populate_classrooms,
+            on_error=lambda e: show_error("Error de Carga", e, "No se pudieron cargar los salones: ")
+        )
+
+    def _populate_classrooms(self, classrooms: List[Dict[str, Any]]) -> None:
+        # Sólo se tocan las filas que cambiaron (conserva selección y desplazamiento)
+        self.table_loader.reconcile(classrooms, lambda classroom: (classroom['id'], classroom['name'], classroom['building']))
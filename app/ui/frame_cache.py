@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from app.ui.base_window import SupportsRefresh
+
+
+@dataclass
+class _Entry:
+    frame: tk.Widget
+    loaded_at: float
+
+
+class FrameCache:
+    """Frames de módulos que se ocultan en vez de destruirse.
+
+    Guarda como máximo ``max_size`` frames; al pasarse destruye el usado hace
+    más tiempo. ``get`` devuelve el frame guardado y, si sus datos tienen más
+    de ``stale_after`` segundos (0 = nunca) y el frame implementa
+    ``SupportsRefresh``, le pide que los recargue.
+    """
+
+    def __init__(self, max_size: int, stale_after: float = 0.0) -> None:
+        self.max_size = max_size
+        self.stale_after = stale_after
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, frame: object) -> bool:
+        return any(entry.frame is frame for entry in self._entries.values())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def peek(self, name: str) -> Optional[tk.Widget]:
+        """El frame guardado, sin marcarlo como usado ni refrescarlo."""
+        entry = self._entries.get(name)
+        return entry.frame if entry is not None else None
+
+    def get(self, name: str) -> Optional[tk.Widget]:
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        if not entry.frame.winfo_exists():
+            del self._entries[name]
+            return None
+        self._entries.move_to_end(name)
+        if self.stale_after > 0 and time.monotonic() - entry.loaded_at >= self.stale_after:
+            self.refresh(name)
+        return entry.frame
+
+    def put(self, name: str, frame: tk.Widget) -> None:
+        """Guarda ``frame``; si no hay lugar (``max_size`` 0) no se guarda."""
+        if self.max_size <= 0:
+            return
+        old = self._entries.pop(name, None)
+        if old is not None and old.frame is not frame:
+            old.frame.destroy()
+        self._entries[name] = _Entry(frame, time.monotonic())
+        while len(self._entries) > self.max_size:
+            _name, evicted = self._entries.popitem(last=False)
+            evicted.frame.destroy()
+
+    def refresh(self, name: str) -> bool:
+        """Pide al frame ``name`` que recargue sus datos; ``False`` si no sabe hacerlo."""
+        entry = self._entries.get(name)
+        if entry is None or not isinstance(entry.frame, SupportsRefresh):
+            return False
+        entry.frame.refresh()
+        entry.loaded_at = time.monotonic()
+        return True
+
+    def clear(self) -> None:
+        """Destruye todos los frames guardados (p. ej. al cerrar sesión)."""
+        entries, self._entries = self._entries, OrderedDict()
+        for entry in entries.values():
+            try:
+                entry.frame.destroy()
+            except tk.TclError:
+                pass
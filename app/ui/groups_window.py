@@ -4,8 +4,16 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Any, Dict, List, Optional
 
-from app.services.api_client import ApiClient, ApiError
+from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.mutations import append_page, apply_deleted, apply_saved, schedule_revalidation
+from app.services.parallel import FetchResult, fetch_all
 from app.services.session import UserSession
+from app.ui.base_window import show_error
+from app.ui.option_models import ComboModel
+from app.ui.page_loader import PageLoader
+from app.ui.table_loader import TableLoader, progress_text
+from app.ui.theme import ensure_theme
 # from app.ui.base_window import ModuleWindow # Ya no se usa
 
 # CAMBIO 1: Heredar de ttk.Frame
@@ -21,62 +29,28 @@ class GroupsWindow(ttk.Frame):
         self.teachers: List[Dict[str, Any]] = []
         self.classrooms: List[Dict[str, Any]] = []
         self.schedules: List[Dict[str, Any]] = []
-        # MEJORA: Caché para materias, en lugar de cargar todo
-        self.subjects_cache: Dict[int, List[Dict[str, Any]]] = {}
-
-        # --- MEJORA ESTÉTICA: Paleta de Colores ---
-        self.COLOR_BG = "#ecf0f1"
-        self.COLOR_PRIMARY = "#3498db"
-        self.COLOR_DANGER = "#e74c3c"
-        self.COLOR_TEXT_DARK = "#2c3e50"
-        self.COLOR_WHITE = "#ffffff"
-        self.COLOR_GRAY_BORDER = "#bdc3c7"
-
-        # --- MEJORA ESTÉTICA: Aplicar Estilos ---
-        self.style = ttk.Style(self)
-        self.style.configure('Content.TFrame', background=self.COLOR_BG)
+        self.groups: List[Dict[str, Any]] = [] # Último listado mostrado en la tabla
+
+        # --- Estilos: compartidos, se registran una sola vez por raíz (app.ui.theme) ---
+        ensure_theme(self)
         self.configure(style='Content.TFrame')
-        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
-        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
-        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
-        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
-        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
-        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
-        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
-        self.style.configure('TListbox', background=self.COLOR_WHITE, foreground=self.COLOR_TEXT_DARK, borderwidth=1, relief='solid', fieldbackground=self.COLOR_WHITE)
 
         # CAMBIO 3: Layout directo en el frame
         self.pack(fill=tk.BOTH, expand=True)
         self.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1) # Fila 1 (tabla) se expandirá
 
-        ttk.Label(self, text="Gestión de Grupos", font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
+        ttk.Label(self, text="Gestión de Grupos", style='Title.TLabel').grid(row=0, column=0, sticky="w", pady=(0, 15))
 
         self._build_tree(self)
         self._build_form(self)
         self._fetch_support_data()
         self._load_groups()
 
-    def _compose_combo_value(self, data_list: List[Dict[str, Any]], kind: str, item_id: int, fallback_label: str) -> str:
-        for item in data_list:
-            if item.get('id') == item_id:
-                if kind == 'classrooms':
-                    return f"{item['id']} - {item['name']} ({item['building']})"
-                if kind == 'schedules':
-                    return f"{item['id']} - {item['time']} ({item['shift']})"
-                label = item.get('name') or fallback_label
-                return f"{item['id']} - {label}"
-        return f"{item_id} - {fallback_label}"
-
-    def _set_combo_value(self, combo: ttk.Combobox, variable: tk.StringVar, value: str) -> None:
-        if not value:
-            variable.set('')
-            return
-        values = list(combo.cget('values'))
-        if value not in values:
-            values.append(value)
-            combo.configure(values=values)
-        variable.set(value)
+    def refresh(self) -> None:
+        """Vuelve a pedir los datos del módulo (MainMenu lo llama al re-mostrarlo)."""
+        self._fetch_support_data()
+        self._load_groups()
 
     def _build_tree(self, container: ttk.Frame) -> None:
         tree_container = ttk.Frame(container, style='Content.TFrame')
@@ -102,6 +76,21 @@ class GroupsWindow(ttk.Frame):
             
         self.tree.bind('<<TreeviewSelect>>', self._on_select)
 
+        # Estado de la carga por lotes (filas insertadas / total)
+        self.table_status = tk.StringVar()
+        ttk.Label(tree_container, textvariable=self.table_status, style='Content.TLabel').grid(row=1, column=0, sticky="w", pady=(4, 0))
+        self.table_loader = TableLoader(
+            self.tree, sortable=True,
+            on_progress=lambda done, total: self.table_status.set(progress_text(done, total)),
+        )
+
+        # Los grupos llegan por páginas; la siguiente se pide al acercarse al final
+        self.pager = PageLoader(
+            self.tree, self._on_groups_page,
+            lambda e: show_error("Error de Carga", e, "No se pudieron cargar los grupos: ")
+        )
+        self.tree.configure(yscrollcommand=lambda first, last: (scrollbar.set(first, last), self.pager.on_scroll(first, last)))
+
     def _build_form(self, container: ttk.Frame) -> None:
         form = ttk.LabelFrame(container, text="Datos del grupo", style='Form.TLabelframe', padding=15)
         form.grid(row=2, column=0, sticky="nsew")
@@ -123,27 +112,32 @@ class GroupsWindow(ttk.Frame):
         self.career_combo = ttk.Combobox(form, textvariable=self.career_var, state='readonly')
         self.career_combo.grid(row=2, column=1, sticky="ew", pady=5, padx=5)
         self.career_combo.bind('<<ComboboxSelected>>', self._refresh_subject_combo)
+        self.career_model = ComboModel(self.career_combo, self.career_var)
 
         self.subject_var = tk.StringVar()
         ttk.Label(form, text="Materia", style='Content.TLabel').grid(row=3, column=0, sticky="w", pady=5, padx=5)
         self.subject_combo = ttk.Combobox(form, textvariable=self.subject_var, state='readonly')
         self.subject_combo.grid(row=3, column=1, sticky="ew", pady=5, padx=5)
+        self.subject_model = ComboModel(self.subject_combo, self.subject_var)
 
         # --- Columna 2 (Derecha) ---
         self.teacher_var = tk.StringVar()
         ttk.Label(form, text="Maestro", style='Content.TLabel').grid(row=0, column=2, sticky="w", pady=5, padx=5)
         self.teacher_combo = ttk.Combobox(form, textvariable=self.teacher_var, state='readonly')
         self.teacher_combo.grid(row=0, column=3, sticky="ew", pady=5, padx=5)
+        self.teacher_model = ComboModel(self.teacher_combo, self.teacher_var)
 
         self.classroom_var = tk.StringVar()
         ttk.Label(form, text="Salón", style='Content.TLabel').grid(row=1, column=2, sticky="w", pady=5, padx=5)
         self.classroom_combo = ttk.Combobox(form, textvariable=self.classroom_var, state='readonly')
         self.classroom_combo.grid(row=1, column=3, sticky="ew", pady=5, padx=5)
+        self.classroom_model = ComboModel(self.classroom_combo, self.classroom_var)
 
         self.schedule_var = tk.StringVar()
         ttk.Label(form, text="Horario", style='Content.TLabel').grid(row=2, column=2, sticky="w", pady=5, padx=5)
         self.schedule_combo = ttk.Combobox(form, textvariable=self.schedule_var, state='readonly')
         self.schedule_combo.grid(row=2, column=3, sticky="ew", pady=5, padx=5)
+        self.schedule_model = ComboModel(self.schedule_combo, self.schedule_var)
 
         self.semester_var = tk.StringVar()
         ttk.Label(form, text="Semestre", style='Content.TLabel').grid(row=3, column=2, sticky="w", pady=5, padx=5)
@@ -180,114 +174,125 @@ class GroupsWindow(ttk.Frame):
         for col in students_columns:
             self.students_tree.heading(col, text=headers_students[col])
             self.students_tree.column(col, width=100, stretch=True)
+        self.students_loader = TableLoader(self.students_tree, sortable=True)
 
     def _fetch_support_data(self) -> None:
-        try:
-            self.careers = self.api.get('/careers')
-            self.career_combo.configure(values=[f"{item['id']} - {item['name']}" for item in self.careers])
-
-            self.teachers = self.api.get('/teachers')
-            self.teacher_combo.configure(values=[f"{item['id']} - {item['name']}" for item in self.teachers])
-
-            self.classrooms = self.api.get('/classrooms')
-            self.classroom_combo.configure(values=[f"{item['id']} - {item['name']} ({item['building']})" for item in self.classrooms])
-
-            self.schedules = self.api.get('/schedules')
-            self.schedule_combo.configure(values=[f"{item['id']} - {item['time']} ({item['shift']})" for item in self.schedules])
-        except ApiError as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los datos de soporte (carreras, maestros, etc.): {e.message}")
+        def fetch() -> FetchResult:
+            # Los cuatro catálogos son independientes: se piden a la vez
+            references = self.session.references
+            return fetch_all({
+                kind: (lambda kind=kind: references.get(self.api, kind))
+                for kind in ('careers', 'teachers', 'classrooms', 'schedules')
+            })
+
+        EXECUTOR.submit(
+            self, fetch, key='support',
+            on_done=self._apply_support_data,
+            on_error=lambda e: show_error("Error de Carga", e, "No se pudieron cargar los datos de soporte (carreras, maestros, etc.): ")
+        )
+
+    def _apply_support_data(self, data: FetchResult) -> None:
+        if 'careers' in data.results:
+            self.careers = data.results['careers']
+            self.career_model.set_options((item['id'], f"{item['id']} - {item['name']}") for item in self.careers)
+
+        if 'teachers' in data.results:
+            self.teachers = data.results['teachers']
+            self.teacher_model.set_options((item['id'], f"{item['id']} - {item['name']}") for item in self.teachers)
+
+        if 'classrooms' in data.results:
+            self.classrooms = data.results['classrooms']
+            self.classroom_model.set_options((item['id'], f"{item['id']} - {item['name']} ({item['building']})") for item in self.classrooms)
+
+        if 'schedules' in data.results:
+            self.schedules = data.results['schedules']
+            self.schedule_model.set_options((item['id'], f"{item['id']} - {item['time']} ({item['shift']})") for item in self.schedules)
+
+        if not data.ok:
+            show_error("Error de Carga", data.error, "No se pudieron cargar los datos de soporte (carreras, maestros, etc.): ")
 
     def _refresh_subject_combo(self, _event: Optional[tk.Event] = None) -> None:
         """Carga dinámicamente las materias de la carrera seleccionada."""
-        career_id_str = self.career_var.get().split(' - ')[0]
-        if not career_id_str.isdigit():
-            self.subject_combo.configure(values=[])
-            self.subject_var.set('')
+        career_id = self.career_model.selected_id()
+        if career_id is None:
+            self.subject_model.set_options((), keep_missing=False)
             return
-            
-        career_id = int(career_id_str)
-        subjects = []
-        try:
-            if career_id in self.subjects_cache:
-                subjects = self.subjects_cache[career_id]
-            else:
-                subjects = self.api.get('/subjects', params={'careerId': career_id})
-                self.subjects_cache[career_id] = subjects
-        except ApiError as e:
-            messagebox.showerror("Error de API", f"No se pudieron cargar las materias para esa carrera: {e.message}")
-            
-        values = [f"{item['id']} - {item['name']}" for item in subjects]
-        current = self.subject_var.get()
-        self.subject_combo.configure(values=values)
-        
-        if current not in values:
-            self.subject_var.set('') # Limpiar si la materia ya no es válida
+
+        # Las materias salen del catálogo compartido de la sesión (una sola descarga)
+        EXECUTOR.submit(
+            self, self.session.references.subjects_for_career, self.api, career_id, key='subjects',
+            on_done=self._show_subjects,
+            on_error=lambda e: show_error("Error de API", e, "No se pudieron cargar las materias para esa carrera: ")
+        )
+
+    def _show_subjects(self, subjects: List[Dict[str, Any]]) -> None:
+        # Se limpia la materia elegida si ya no pertenece a la carrera
+        self.subject_model.set_options(((item['id'], f"{item['id']} - {item['name']}") for item in subjects), keep_missing=False)
 
     def _load_groups(self) -> None:
-        try:
-            groups = self.api.get('/groups')
-            self.tree.delete(*self.tree.get_children())
-            for group in groups:
-                self.tree.insert('', tk.END, values=(
-                    group['id'],
-                    group['name'],
-                    group.get('careerName', 'N/A'),
-                    group.get('subjectName', 'N/A'),
-                    group.get('teacherName', 'N/A'),
-                    f"{group.get('scheduleTime', 'N/A')}"
-                ))
-        except ApiError as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los grupos: {e.message}")
+        pages = self.api.paginate('/groups')
+        # Pintar al instante la primera página guardada en disco y refrescar en segundo plano
+        cached = pages.peek_first()
+        if cached is not None:
+            self._populate_groups(cached)
+        self.pager.start(pages)
+
+    def _on_groups_page(self, page: List[Dict[str, Any]], first: bool, _has_more: bool) -> None:
+        self._populate_groups(page if first else append_page(self.groups, page))
+
+    def _populate_groups(self, groups: List[Dict[str, Any]]) -> None:
+        self.groups = groups
+        self.table_loader.reconcile(groups, lambda group: (
+            group['id'],
+            group['name'],
+            group.get('careerName', 'N/A'),
+            group.get('subjectName', 'N/A'),
+            group.get('teacherName', 'N/A'),
+            f"{group.get('scheduleTime', 'N/A')}"
+        ))
 
     def _on_select(self, _event: tk.Event) -> None:
         selection = self.tree.selection()
         if not selection: return
         item = self.tree.item(selection[0])
-        try:
-            self._load_group(int(item['values'][0]))
-        except ApiError as e:
-            messagebox.showerror("Error", f"No se pudo cargar el grupo: {e.message}")
+        self._load_group(int(item['values'][0]))
 
     def _load_group(self, group_id: int) -> None:
-        # Esta función asume que _load_group(id) levanta ApiError si falla
-        data = self.api.get(f'/groups/{group_id}')
-        
+        EXECUTOR.submit(
+            self, self.api.get, f'/groups/{group_id}', key='detail',
+            on_done=self._fill_group,
+            on_error=lambda e: show_error("Error", e, "No se pudo cargar el grupo: ")
+        )
+
+    def _fill_group(self, data: Dict[str, Any]) -> None:
         self.current_id = data['id']
         self.id_var.set(str(data['id']))
         self.name_var.set(data['name'])
         self.semester_var.set(str(data['semester']))
         self.max_students_var.set(str(data['maxStudents']))
 
-        # Helper para encontrar el string correcto en la lista de combobox
+        # Si el catálogo aún no llega (o ya no trae la opción) se muestra con el nombre del grupo
         if data.get('careerId'):
-            career_value = self._compose_combo_value(self.careers, 'careers', data['careerId'], data.get('careerName', 'N/A'))
-            self._set_combo_value(self.career_combo, self.career_var, career_value)
-        
-        # Cargar materias ANTES de setear la materia
-        self._refresh_subject_combo()
+            self.career_model.select(data['careerId'], f"{data['careerId']} - {data.get('careerName', 'N/A')}")
+
+        # Setear la materia ANTES de cargar las materias, para que no se limpie si sigue siendo válida
         if data.get('subjectId'):
-            # No podemos usar find_in_list para materias, ya que se cargan dinámicamente
-            subject_value = f"{data['subjectId']} - {data.get('subjectName', 'N/A')}"
-            self._set_combo_value(self.subject_combo, self.subject_var, subject_value)
-            
+            self.subject_model.select(data['subjectId'], f"{data['subjectId']} - {data.get('subjectName', 'N/A')}")
+        self._refresh_subject_combo()
+
         if data.get('teacherId'):
-            teacher_value = self._compose_combo_value(self.teachers, 'teachers', data['teacherId'], data.get('teacherName', 'N/A'))
-            self._set_combo_value(self.teacher_combo, self.teacher_var, teacher_value)
+            self.teacher_model.select(data['teacherId'], f"{data['teacherId']} - {data.get('teacherName', 'N/A')}")
         if data.get('classroomId'):
-            classroom_value = self._compose_combo_value(self.classrooms, 'classrooms', data['classroomId'], data.get('classroomName', 'N/A'))
-            self._set_combo_value(self.classroom_combo, self.classroom_var, classroom_value)
+            self.classroom_model.select(data['classroomId'], f"{data['classroomId']} - {data.get('classroomName', 'N/A')}")
         if data.get('scheduleId'):
-            schedule_value = self._compose_combo_value(self.schedules, 'schedules', data['scheduleId'], data.get('scheduleTime', 'N/A'))
-            self._set_combo_value(self.schedule_combo, self.schedule_var, schedule_value)
+            self.schedule_model.select(data['scheduleId'], f"{data['scheduleId']} - {data.get('scheduleTime', 'N/A')}")
 
         self._load_students(data.get('students', []))
 
     def _load_students(self, students: List[Dict[str, Any]]) -> None:
-        self.students_tree.delete(*self.students_tree.get_children())
-        for student in students:
-            self.students_tree.insert('', tk.END, values=(
-                student['studentId'], student['name'], student.get('email', 'N/A'), student['status']
-            ))
+        self.students_loader.load(students, lambda student: (
+            student['studentId'], student['name'], student.get('email', 'N/A'), student['status']
+        ), row_id=lambda student: student['studentId'])
 
     def _collect_payload(self) -> Dict[str, Any]:
         payload: Dict[str, Any] = {}
@@ -301,16 +306,17 @@ class GroupsWindow(ttk.Frame):
         payload['name'] = name
 
         required_combos = [
-            (self.career_var.get(), 'careerId', 'Carrera'),
-            (self.subject_var.get(), 'subjectId', 'Materia'),
-            (self.teacher_var.get(), 'teacherId', 'Maestro'),
-            (self.classroom_var.get(), 'classroomId', 'Salón'),
-            (self.schedule_var.get(), 'scheduleId', 'Horario'),
+            (self.career_model, 'careerId', 'Carrera'),
+            (self.subject_model, 'subjectId', 'Materia'),
+            (self.teacher_model, 'teacherId', 'Maestro'),
+            (self.classroom_model, 'classroomId', 'Salón'),
+            (self.schedule_model, 'scheduleId', 'Horario'),
         ]
-        for value, key, label in required_combos:
-            if not value or not value.split(' - ')[0].isdigit():
+        for model, key, label in required_combos:
+            item_id = model.selected_id()
+            if item_id is None:
                 raise ValueError(f'Debes seleccionar una opción válida para {label}.')
-            payload[key] = int(value.split(' - ')[0])
+            payload[key] = item_id
 
         try:
             semester = int(self.semester_var.get().strip())
@@ -336,21 +342,24 @@ class GroupsWindow(ttk.Frame):
             messagebox.showwarning("Validación", str(error))
             return
             
-        try:
-            if self.current_id is None:
-                group = self.api.post('/groups', payload)
-            else:
-                group = self.api.put(f"/groups/{self.current_id}", payload)
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:
-            messagebox.showerror("Error", str(error))
-            return
-            
+        if self.current_id is None:
+            EXECUTOR.submit(self, self.api.post, '/groups', payload, on_done=self._on_saved, on_error=self._on_api_error)
+        else:
+            EXECUTOR.submit(self, self.api.put, f"/groups/{self.current_id}", payload, on_done=self._on_saved, on_error=self._on_api_error)
+
+    def _on_saved(self, group: Dict[str, Any]) -> None:
         messagebox.showinfo("Éxito", "Grupo guardado")
         self._load_group(group['id']) # Recargar el formulario
-        self._load_groups() # Recargar la tabla
+        # Aplicar la respuesta localmente en lugar de volver a descargar la tabla
+        groups = apply_saved(self.groups, group)
+        if groups is None:
+            self._load_groups()
+        else:
+            self._populate_groups(groups)
+            schedule_revalidation(self, self._load_groups)
+
+    def _on_api_error(self, error: BaseException) -> None:
+        show_error("Error de API", error)
 
     def _delete(self) -> None:
         if self.current_id is None:
@@ -359,18 +368,16 @@ class GroupsWindow(ttk.Frame):
         if not messagebox.askyesno("Eliminar", f"¿Deseas eliminar el grupo '{self.name_var.get()}'?"):
             return
             
-        try:
-            self.api.delete(f"/groups/{self.current_id}")
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:
-            messagebox.showerror("Error", str(error))
-            return
-            
+        EXECUTOR.submit(
+            self, self.api.delete, f"/groups/{self.current_id}",
+            on_done=lambda _response, group_id=self.current_id: self._on_deleted(group_id), on_error=self._on_api_error
+        )
+
+    def _on_deleted(self, group_id: int) -> None:
         messagebox.showinfo("Éxito", "Grupo eliminado")
         self._reset()
-        self._load_groups()
+        self._populate_groups(apply_deleted(self.groups, group_id))
+        schedule_revalidation(self, self._load_groups)
 
     def _reset(self) -> None:
         self.current_id = None
@@ -383,5 +390,5 @@ class GroupsWindow(ttk.Frame):
         self.teacher_var.set('')
         self.classroom_var.set('')
         self.schedule_var.set('')
-        self.students_tree.delete(*self.students_tree.get_children())
+        self.students_loader.clear()
         self.tree.selection_remove(self.tree.selection()) # Deseleccionar tabla
\ No newline at end of file
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def resolve(path: str) -> Any:
+    """Importa ``'paquete.modulo:Nombre'`` y devuelve ``Nombre``."""
+    module_name, _, attribute = path.partition(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute) if attribute else module
+
+
+def preimport(paths: Iterable[str]) -> threading.Thread:
+    """Importa los módulos de ``paths`` en un hilo aparte para que el primer clic no espere.
+
+    Un error aquí sólo se registra: el import se repite (y falla a la vista) al usarlo.
+    """
+    modules = [path.partition(':')[0] for path in paths]
+
+    def run() -> None:
+        for module_name in modules:
+            try:
+                importlib.import_module(module_name)
+            except Exception:  # noqa: BLE001 - se reintenta al abrir el módulo
+                logger.warning("No se pudo preimportar %s", module_name, exc_info=True)
+
+    thread = threading.Thread(target=run, name='sigue-preimport', daemon=True)
+    thread.start()
+    return thread
@@ -1,25 +1,43 @@
 from __future__ import annotations
 
 import tkinter as tk
-from tkinter import ttk, TclError
+from tkinter import ttk
 from typing import Dict, Type
 
+from app.config import CONFIG
 from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.circuit_breaker import HALF_OPEN, OPEN
 from app.services.session import UserSession
-
-# Importamos las clases de las ventanas
-from app.ui.users_window import UsersWindow
-from app.ui.students_window import StudentsWindow
-from app.ui.careers_window import CareersWindow
-from app.ui.subjects_window import SubjectsWindow
-from app.ui.teachers_window import TeachersWindow
-from app.ui.schedules_window import SchedulesWindow
-from app.ui.classrooms_window import ClassroomsWindow
-from app.ui.groups_window import GroupsWindow
+from app.ui.frame_cache import FrameCache
+from app.ui.lazy_import import preimport, resolve
+from app.ui.theme import PALETTE, ensure_theme
 
 # CAMBIO IMPORTANTE: Ahora esperamos que las "ventanas" sean Frames
 WindowType = Type[ttk.Frame] 
 
+# Cada cuánto (ms) se refleja el estado de la conexión en el menú lateral
+CONNECTION_POLL_MS = 1000
+# Cuánto (ms) queda a la vista un aviso de ``show_notice``
+NOTICE_MS = 8000
+
+# Las ventanas se referencian por ruta ('modulo:Clase') y se importan al primer
+# clic (o en segundo plano tras mostrar el menú), no al arrancar
+ROLE_SECTIONS: Dict[str, Dict[str, str]] = {
+    'ADMIN': {
+        'Usuarios': 'app.ui.users_window:UsersWindow',
+        'Alumnos': 'app.ui.students_window:StudentsWindow',
+        'Carreras': 'app.ui.careers_window:CareersWindow',
+        'Materias': 'app.ui.subjects_window:SubjectsWindow',
+        'Maestros': 'app.ui.teachers_window:TeachersWindow',
+        'Horarios': 'app.ui.schedules_window:SchedulesWindow',
+        'Salones': 'app.ui.classrooms_window:ClassroomsWindow',
+        'Grupos': 'app.ui.groups_window:GroupsWindow',
+    },
+    'TEACHER': {'Maestros': 'app.ui.teachers_window:TeachersWindow'},
+    'STUDENT': {'Alumnos': 'app.ui.students_window:StudentsWindow'},
+}
+
 
 class MainMenu(ttk.Frame):
     def __init__(self, master: tk.Misc, api: ApiClient, session: UserSession) -> None:
@@ -28,32 +46,15 @@ class MainMenu(ttk.Frame):
         self.session = session
         self.master = master
         
-        # --- PALETA DE COLORES ---
-        self.COLOR_SIDENAV = "#2c3e50"
-        self.COLOR_CONTENT_BG = "#ecf0f1"
-        self.COLOR_BTN_HOVER = "#34495e"
-        self.COLOR_TEXT_LIGHT = "#ffffff"
-        self.COLOR_TEXT_DARK = "#2c3e50"
+        # --- PALETA DE COLORES (app.ui.theme) ---
+        self.COLOR_SIDENAV = PALETTE.sidenav
+        self.COLOR_CONTENT_BG = PALETTE.bg
+        self.COLOR_BTN_HOVER = PALETTE.sidenav_hover
+        self.COLOR_TEXT_LIGHT = PALETTE.text_light
+        self.COLOR_TEXT_DARK = PALETTE.text_dark
         
-        # --- Estilos ---
-        self.style = ttk.Style(self)
-        try:
-            self.style.theme_use('clam')
-        except TclError:
-            pass 
-
-        self.style.configure(
-            'Sidenav.TButton',
-            font=('Segoe UI', 11, 'bold'), padding=(20, 12), borderwidth=0, relief='flat',
-            background=self.COLOR_SIDENAV, foreground=self.COLOR_TEXT_LIGHT
-        )
-        self.style.map(
-            'Sidenav.TButton',
-            background=[('active', self.COLOR_BTN_HOVER), ('pressed', self.COLOR_BTN_HOVER)],
-            foreground=[('!disabled', self.COLOR_TEXT_LIGHT)]
-        )
-        # Nuevo estilo para los frames de contenido
-        self.style.configure('Content.TFrame', background=self.COLOR_CONTENT_BG)
+        # --- Estilos: el tema y los estilos con nombre se registran una sola vez por raíz ---
+        self.style = ensure_theme(self)
 
         # --- Layout Principal ---
         self.pack(fill=tk.BOTH, expand=True)
@@ -67,8 +68,14 @@ class MainMenu(ttk.Frame):
 
         # --- Variable para guardar el frame actual ---
         self.current_content_frame: tk.Widget | None = None
+        self.welcome_frame: tk.Frame | None = None
+        # Módulos ya construidos: se ocultan al cambiar de sección y se re-muestran al instante
+        self.frames = FrameCache(CONFIG.module_cache_size, CONFIG.module_stale_after_s)
 
         self._build_sidenav()
+        self._build_connection_indicator()
+        self._build_busy_indicator()
+        self._build_notice()
         self._show_welcome_screen() # Mostrar la bienvenida al inicio
 
     # --- Funciones de Hover (sin cambios) ---
@@ -89,19 +96,10 @@ class MainMenu(ttk.Frame):
             'Maestros': '👨‍🏫', 'Horarios': '🕒', 'Salones': '🚪', 'Grupos': '👥'
         }
 
-        role = self.session.role
-        sections: Dict[str, WindowType] = {}
-
-        if role == 'ADMIN':
-            sections = {
-                'Usuarios': UsersWindow, 'Alumnos': StudentsWindow, 'Carreras': CareersWindow,
-                'Materias': SubjectsWindow, 'Maestros': TeachersWindow, 'Horarios': SchedulesWindow,
-                'Salones': ClassroomsWindow, 'Grupos': GroupsWindow
-            }
-        elif role == 'TEACHER':
-            sections = {'Maestros': TeachersWindow}
-        elif role == 'STUDENT':
-            sections = {'Alumnos': StudentsWindow}
+        sections = ROLE_SECTIONS.get(self.session.role or '', {})
+        if sections and CONFIG.module_preimport:
+            # Con el menú ya en pantalla, adelantar los imports de las ventanas del rol
+            self.after_idle(lambda: preimport(sections.values()))
 
         # --- BOTÓN DE INICIO (NUEVO) ---
         home_button = tk.Button(
@@ -116,7 +114,7 @@ class MainMenu(ttk.Frame):
         home_button.bind("<Leave>", lambda e, b=home_button: self.on_leave(b))
         # ---
 
-        for label, window_class in sections.items():
+        for label, window_path in sections.items():
             icon = icon_map.get(label, '🔹')
             button_text = f"  {icon}   {label}"
             
@@ -125,26 +123,101 @@ class MainMenu(ttk.Frame):
                 bg=self.COLOR_SIDENAV, fg=self.COLOR_TEXT_LIGHT,
                 activebackground=self.COLOR_BTN_HOVER, activeforeground=self.COLOR_TEXT_LIGHT,
                 relief='flat', bd=0, justify=tk.LEFT, anchor='w', cursor="hand2",
-                command=lambda wc=window_class, key=label: self._load_module(key, wc)
+                command=lambda path=window_path, key=label: self._load_module(key, path)
             )
             button.pack(fill=tk.X, pady=4, padx=15)
             
             button.bind("<Enter>", lambda e, b=button: self.on_enter(b))
             button.bind("<Leave>", lambda e, b=button: self.on_leave(b))
 
-    def _clear_content_area(self) -> None:
-        """Destruye el frame de contenido actual."""
-        if self.current_content_frame:
-            self.current_content_frame.destroy()
-            self.current_content_frame = None
+    def _build_connection_indicator(self) -> None:
+        """Estado del circuito del ``ApiClient``: conectado, sin conexión o reconectando."""
+        self.connection_label = tk.Label(
+            self.sidenav_frame, font=('Segoe UI', 10), bg=self.COLOR_SIDENAV, anchor='w'
+        )
+        self.connection_label.pack(side=tk.BOTTOM, fill='x', padx=25, pady=(0, 15))
+        self._connection_job: str | None = None
+        self._poll_connection()
+
+    def _poll_connection(self) -> None:
+        # El circuito cambia desde hilos de trabajo: se consulta desde el hilo de Tk
+        breaker = self.api.breaker
+        if breaker.state == OPEN:
+            text, color = f"●  Sin conexión · reintento en {round(breaker.retry_in())} s", PALETTE.danger
+        elif breaker.state == HALF_OPEN:
+            text, color = "●  Reconectando...", PALETTE.warning
+        else:
+            text, color = "●  Conectado", PALETTE.success
+        if self.connection_label.cget('text') != text:
+            self.connection_label.config(text=text, fg=color)
+        self._connection_job = self.after(CONNECTION_POLL_MS, self._poll_connection)
+
+    def _build_busy_indicator(self) -> None:
+        """Indicador de carga mientras haya llamadas a la API en segundo plano."""
+        self.busy_label = tk.Label(
+            self.sidenav_frame, text="⏳  Cargando...", font=('Segoe UI', 10),
+            bg=self.COLOR_SIDENAV, fg=self.COLOR_TEXT_LIGHT, anchor='w'
+        )
+        remove_listener = EXECUTOR.add_busy_listener(self._on_busy_changed)
+        self.bind('<Destroy>', lambda e: remove_listener() if e.widget is self else None, add='+')
+        self._on_busy_changed(EXECUTOR.busy)
+
+    def _build_notice(self) -> None:
+        self.notice_label = tk.Label(
+            self.sidenav_frame, font=('Segoe UI', 9), bg=self.COLOR_SIDENAV, fg=self.COLOR_TEXT_LIGHT,
+            anchor='w', justify=tk.LEFT, wraplength=210,
+        )
+        self._notice_job: str | None = None
+
+    def show_notice(self, text: str) -> None:
+        """Muestra ``text`` al pie del menú lateral durante ``NOTICE_MS``."""
+        if self._notice_job is not None:
+            self.after_cancel(self._notice_job)
+        self.notice_label.config(text=text)
+        self.notice_label.pack(side=tk.BOTTOM, fill='x', padx=25, pady=(0, 10))
+        self._notice_job = self.after(NOTICE_MS, self._hide_notice)
+
+    def _hide_notice(self) -> None:
+        self._notice_job = None
+        self.notice_label.pack_forget()
+
+    def _on_busy_changed(self, busy: bool) -> None:
+        if busy:
+            self.busy_label.pack(side=tk.BOTTOM, fill='x', padx=25, pady=15)
+            self.content_frame.config(cursor='watch')
+        else:
+            self.busy_label.pack_forget()
+            self.content_frame.config(cursor='')
+
+    def destroy(self) -> None:
+        # Al cerrar sesión se destruyen también los módulos ocultos
+        if self._connection_job is not None:
+            self.after_cancel(self._connection_job)
+            self._connection_job = None
+        if self._notice_job is not None:
+            self.after_cancel(self._notice_job)
+            self._notice_job = None
+        self.frames.clear()
+        super().destroy()
+
+    def _show_content(self, frame: tk.Widget, **pack_options: object) -> None:
+        """Muestra ``frame`` en el área de contenido y oculta (o destruye) el anterior."""
+        previous = self.current_content_frame
+        if previous is not None and previous is not frame and previous.winfo_exists():
+            previous.pack_forget()
+            if previous is not self.welcome_frame and previous not in self.frames:
+                previous.destroy()
+        frame.pack(**pack_options)
+        self.current_content_frame = frame
 
     def _show_welcome_screen(self) -> None:
         """Muestra la pantalla de bienvenida en el área de contenido."""
-        self._clear_content_area()
-        
-        # El frame de bienvenida se convierte en el frame actual
-        self.current_content_frame = tk.Frame(self.content_frame, bg=self.COLOR_CONTENT_BG)
-        self.current_content_frame.pack(expand=True)
+        if self.welcome_frame is None:
+            self.welcome_frame = self._build_welcome_screen()
+        self._show_content(self.welcome_frame, expand=True)
+
+    def _build_welcome_screen(self) -> tk.Frame:
+        frame = tk.Frame(self.content_frame, bg=self.COLOR_CONTENT_BG)
 
         try:
             user_name = self.session.user.get('nombre', 'Usuario')
@@ -153,23 +226,31 @@ class MainMenu(ttk.Frame):
             first_name = "Usuario"
 
         tk.Label(
-            self.current_content_frame, text=f"¡Bienvenido, {first_name}!",
+            frame, text=f"¡Bienvenido, {first_name}!",
             bg=self.COLOR_CONTENT_BG, fg=self.COLOR_TEXT_DARK, font=('Segoe UI', 28, 'bold')
         ).pack(pady=10)
         
         tk.Label(
-            self.current_content_frame, text="Selecciona una opción del menú lateral para comenzar.",
+            frame, text="Selecciona una opción del menú lateral para comenzar.",
             bg=self.COLOR_CONTENT_BG, fg="#555555", font=('Segoe UI', 14)
         ).pack()
+        return frame
 
-    def _load_module(self, name: str, module_class: WindowType) -> None:
-        """Carga un módulo (Frame) en el área de contenido."""
-        self._clear_content_area()
-        
-        # Crea una instancia del frame del módulo (ej. ClassroomsWindow)
-        # y lo coloca dentro de self.content_frame
-        frame = module_class(self.content_frame, self.api, self.session)
-        frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Guarda una referencia al nuevo frame para poder destruirlo después
-        self.current_content_frame = frame
\ No newline at end of file
+    def _load_module(self, name: str, module_path: str) -> None:
+        """Muestra un módulo (Frame) en el área de contenido, reutilizándolo si ya existe."""
+        if self.current_content_frame is not None and self.frames.peek(name) is self.current_content_frame:
+            # Clic sobre el módulo abierto: recargar sus datos
+            self.frames.refresh(name)
+            return
+        frame = self.frames.get(name)
+        if frame is None:
+            # Crea una instancia del frame del módulo (ej. ClassroomsWindow)
+            # y lo coloca dentro de self.content_frame
+            module_class: WindowType = resolve(module_path)
+            frame = module_class(self.content_frame, self.api, self.session)
+            # Primero ocultar el actual: guardar el nuevo puede sacar de la caché (y
+            # destruir) justo al que está en pantalla
+            self._show_content(frame, fill=tk.BOTH, expand=True)
+            self.frames.put(name, frame)
+            return
+        self._show_content(frame, fill=tk.BOTH, expand=True)
\ No newline at end of file
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+Option = Tuple[Hashable, str]
+
+
+class ComboModel:
+    """Opciones de un Combobox de solo lectura identificadas por su id.
+
+    El texto mostrado es sólo para el usuario: ``selected_id`` y ``select``
+    resuelven id ↔ texto con diccionarios, sin volver a interpretar cadenas
+    del estilo "id - nombre". Los textos deben ser únicos.
+    """
+
+    def __init__(self, combo: ttk.Combobox, variable: tk.StringVar) -> None:
+        self.combo = combo
+        self.variable = variable
+        self._labels: Dict[Hashable, str] = {}
+        self._ids: Dict[str, Hashable] = {}
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._labels
+
+    def set_options(self, options: Iterable[Option], keep_missing: bool = True) -> None:
+        """Reemplaza las opciones conservando la elegida.
+
+        Si la opción elegida ya no viene en ``options`` se agrega al final
+        (``keep_missing``) o se limpia la selección.
+        """
+        selected = self.selected_id()
+        current = self.variable.get()
+        self._labels = dict(options)
+        self._ids = {label: item_id for item_id, label in self._labels.items()}
+        if selected is not None and selected not in self._labels:
+            if keep_missing:
+                self._labels[selected] = current
+                self._ids[current] = selected
+            else:
+                selected = None
+        self.combo.configure(values=list(self._labels.values()))
+        self.variable.set(self._labels[selected] if selected is not None else '')
+
+    def selected_id(self) -> Optional[Hashable]:
+        return self._ids.get(self.variable.get())
+
+    def label(self, item_id: Hashable) -> Optional[str]:
+        return self._labels.get(item_id)
+
+    def select(self, item_id: Optional[Hashable], fallback_label: Optional[str] = None) -> bool:
+        """Muestra la opción ``item_id``; si no existe y hay ``fallback_label`` la agrega."""
+        if item_id is None:
+            self.variable.set('')
+            return False
+        if item_id not in self._labels:
+            if fallback_label is None:
+                return False
+            self._labels[item_id] = fallback_label
+            self._ids[fallback_label] = item_id
+            self.combo.configure(values=list(self._labels.values()))
+        self.variable.set(self._labels[item_id])
+        return True
+
+    def clear(self) -> None:
+        self.variable.set('')
+
+
+class ListModel:
+    """Listbox cuyas filas guardan el id en un arreglo paralelo.
+
+    ``index_of`` es O(1); restaurar una selección de k ids cuesta O(k) en vez
+    de recorrer todas las filas.
+    """
+
+    def __init__(self, listbox: tk.Listbox) -> None:
+        self.listbox = listbox
+        self.ids: List[Hashable] = []
+        self._index: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._index
+
+    def set_options(self, options: Iterable[Option]) -> None:
+        ids: List[Hashable] = []
+        labels: List[str] = []
+        for item_id, label in options:
+            ids.append(item_id)
+            labels.append(label)
+        self.ids = ids
+        self._index = {item_id: index for index, item_id in enumerate(ids)}
+        self.listbox.delete(0, tk.END)
+        if labels:
+            self.listbox.insert(tk.END, *labels)
+
+    def index_of(self, item_id: Hashable) -> Optional[int]:
+        return self._index.get(item_id)
+
+    def selected_ids(self) -> List[Any]:
+        ids = self.ids
+        return [ids[index] for index in self.listbox.curselection()]
+
+    def select_ids(self, item_ids: Iterable[Hashable]) -> None:
+        """Deja seleccionados sólo los ``item_ids`` presentes en la lista."""
+        self.listbox.selection_clear(0, tk.END)
+        index = self._index
+        for item_id in item_ids:
+            position = index.get(item_id)
+            if position is not None:
+                self.listbox.selection_set(position)
+
+    def clear(self) -> None:
+        self.ids = []
+        self._index = {}
+        self.listbox.delete(0, tk.END)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from app.services.background import EXECUTOR
+from app.services.pagination import PageIterator, StreamPages
+
+Pages = Union[PageIterator, StreamPages]
+
+Rows = List[Dict[str, Any]]
+
+
+class PageLoader:
+    """Carga una tabla página por página a medida que el usuario se acerca al final.
+
+    ``start`` pide la primera página; después, cada vez que la tabla reporta su
+    desplazamiento (``on_scroll(first, last)``, p. ej. desde ``yscrollcommand``)
+    y el borde inferior visible pasa de ``threshold``, se pide la siguiente.
+    ``on_page(página, es_la_primera, hay_más)`` recibe cada página nueva; la
+    ventana la agrega (o reemplaza su lista si es la primera). Con
+    ``StreamPages`` (``eager``) las páginas se piden una tras otra hasta leer
+    toda la respuesta. ``load_rest`` hace lo mismo con cualquier paginación
+    (p. ej. para que una búsqueda vea la colección completa).
+    """
+
+    def __init__(
+        self,
+        widget: tk.Misc,
+        on_page: Callable[[Rows, bool, bool], None],
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        *,
+        threshold: float = 0.9,
+    ) -> None:
+        self.widget = widget
+        self.on_page = on_page
+        self.on_error = on_error
+        self.threshold = threshold
+        self.pages: Optional[Pages] = None
+        self._loading = False
+        self._load_rest = False
+        widget.bind('<Destroy>', lambda e: self.close() if e.widget is widget else None, add='+')
+
+    @property
+    def has_more(self) -> bool:
+        return self.pages is not None and self.pages.has_more
+
+    def start(self, pages: Pages) -> None:
+        self.close()
+        self.pages = pages
+        self._loading = False
+        self._load_rest = False
+        self._request()
+
+    def load_rest(self) -> None:
+        """Pide las páginas que faltan una tras otra, sin esperar al desplazamiento."""
+        self._load_rest = True
+        self._request()
+
+    def on_scroll(self, _first: Any, last: Any) -> None:
+        if float(last) >= self.threshold:
+            self._request()
+
+    def close(self) -> None:
+        if self.pages is not None:
+            self.pages.close()
+            self.pages = None
+
+    def _request(self) -> None:
+        if self._loading or not self.has_more:
+            return
+        self._loading = True
+        pages = self.pages
+        # La clave hace que sólo cuente la respuesta de la carga más reciente
+        EXECUTOR.submit(
+            self.widget, next, pages, None, key='page',
+            on_done=lambda page: self._on_page(pages, page), on_error=self._on_error,
+        )
+
+    def _on_page(self, pages: Pages, page: Optional[Rows]) -> None:
+        if pages is not self.pages:
+            return
+        self._loading = False
+        if page is not None:
+            self.on_page(page, pages.pages_loaded == 1, self.has_more)
+        if (pages.eager or self._load_rest) and pages is self.pages:
+            # La respuesta sigue abierta (o se pidió todo): seguir sin esperar al desplazamiento
+            self._request()
+
+    def _on_error(self, error: BaseException) -> None:
+        self._loading = False
+        if self.on_error is not None:
+            self.on_error(error)
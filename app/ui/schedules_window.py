@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime  # <--- IMPORTADO PARA VALIDAR HORA
 
-from app.services.api_client import ApiClient, ApiError
+from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.mutations import schedule_revalidation
 from app.services.session import UserSession
+from app.ui.base_window import show_error
+from app.ui.table_loader import TableLoader
+from app.ui.theme import ensure_theme
 # from app.ui.base_window import ModuleWindow # Ya no se usa
 
 # CAMBIO 1: Heredar de ttk.Frame
@@ -17,37 +22,25 @@ class SchedulesWindow(ttk.Frame):
         self.session = session
         self.current_id: Optional[int] = None
 
-        # --- MEJORA ESTÉTICA: Paleta de Colores ---
-        self.COLOR_BG = "#ecf0f1"
-        self.COLOR_PRIMARY = "#3498db"
-        self.COLOR_DANGER = "#e74c3c"
-        self.COLOR_TEXT_DARK = "#2c3e50"
-        self.COLOR_WHITE = "#ffffff"
-        self.COLOR_GRAY_BORDER = "#bdc3c7"
-
-        # --- MEJORA ESTÉTICA: Aplicar Estilos ---
-        self.style = ttk.Style(self)
-        self.style.configure('Content.TFrame', background=self.COLOR_BG)
+        # --- Estilos: compartidos, se registran una sola vez por raíz (app.ui.theme) ---
+        ensure_theme(self)
         self.configure(style='Content.TFrame')
-        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
-        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
-        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
-        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
-        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
-        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
-        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
 
         # CAMBIO 3: Layout directo en el frame
         self.pack(fill=tk.BOTH, expand=True)
         self.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1) # Fila 1 (la tabla) se expandirá
 
-        ttk.Label(self, text="Gestión de Horarios", font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
+        ttk.Label(self, text="Gestión de Horarios", style='Title.TLabel').grid(row=0, column=0, sticky="w", pady=(0, 15))
 
         self._build_tree(self)
         self._build_form(self)
         self._load_schedules()
 
+    def refresh(self) -> None:
+        """Vuelve a pedir los datos del módulo (MainMenu lo llama al re-mostrarlo)."""
+        self._load_schedules()
+
     def _build_tree(self, container: ttk.Frame) -> None:
         columns = ('id', 'shift', 'time')
         
@@ -73,6 +66,7 @@ class SchedulesWindow(ttk.Frame):
         self.tree.column('time', width=150, anchor=tk.CENTER)
         
         self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.table_loader = TableLoader(self.tree, sortable=True)
 
     def _build_form(self, container: ttk.Frame) -> None:
         form = ttk.LabelFrame(container, text="Datos del horario", style='Form.TLabelframe', padding=15)
@@ -143,26 +137,23 @@ class SchedulesWindow(ttk.Frame):
             messagebox.showwarning("Validación", str(error))
             return
             
-        try:
-            if self.current_id is None:
-                schedule = self.api.post('/schedules', payload)
-            else:
-                schedule = self.api.put(f"/schedules/{self.current_id}", payload)
-                
-        # --- MEJORA: Manejo de Errores ---
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
-            return
-        # ---
-        
+        if self.current_id is None:
+            EXECUTOR.submit(self, self.api.post, '/schedules', payload, on_done=self._on_saved, on_error=self._on_api_error)
+        else:
+            EXECUTOR.submit(self, self.api.put, f"/schedules/{self.current_id}", payload, on_done=self._on_saved, on_error=self._on_api_error)
+
+    def _on_saved(self, schedule: Dict[str, Any]) -> None:
         messagebox.showinfo("Éxito", "Horario guardado")
         
         self.current_id = schedule['id']
         self.id_var.set(str(schedule['id']))
+        # Aplicar la respuesta localmente en lugar de volver a descargar el catálogo
+        self.session.references.apply_saved('schedules', schedule)
         self._load_schedules()
+        schedule_revalidation(self, self._revalidate)
+
+    def _on_api_error(self, error: BaseException) -> None:
+        show_error("Error de API", error)
 
     def _delete(self) -> None:
         if self.current_id is None:
@@ -171,31 +162,33 @@ class SchedulesWindow(ttk.Frame):
         if not messagebox.askyesno("Eliminar", f"¿Deseas eliminar el horario de las {self.time_var.get()}?"):
             return
             
-        try:
-            self.api.delete(f"/schedules/{self.current_id}")
-            
-        # --- MEJORA: Manejo de Errores ---
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
-            return
-        # ---
-        
+        EXECUTOR.submit(
+            self, self.api.delete, f"/schedules/{self.current_id}",
+            on_done=lambda _response, schedule_id=self.current_id: self._on_deleted(schedule_id), on_error=self._on_api_error
+        )
+
+    def _on_deleted(self, schedule_id: int) -> None:
         messagebox.showinfo("Éxito", "Horario eliminado")
         self._reset()
+        self.session.references.apply_deleted('schedules', schedule_id)
+        self._load_schedules()
+        schedule_revalidation(self, self._revalidate)
+
+    def _revalidate(self) -> None:
+        self.session.references.invalidate('schedules')
         self._load_schedules()
 
     def _load_schedules(self) -> None:
-        try:
-            schedules = self.api.get('/schedules')
-            self.tree.delete(*self.tree.get_children())
-            for schedule in schedules:
-                self.tree.insert('', tk.END, values=(schedule['id'], schedule['shift'], schedule['time']))
-                
-        # --- MEJORA: Manejo de Errores ---
-        except ApiError as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los horarios: {e.message}")
-        except Exception as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los horarios: {e}")
\ No newline at end of file
+        # Pintar al instante lo ya cargado (memoria o disco) y refrescar en segundo plano
+        cached = self.session.references.peek(self.api, 'schedules')
+        if cached is not None:
+            self._populate_schedules(cached)
+        EXECUTOR.submit(
+            self, self.session.references.get, self.api, 'schedules', key='schedules',
+            on_done=self._populate_schedules,
+            on_error=lambda e: show_error("Error de Carga", e, "No se pudieron cargar los horarios: ")
+        )
+
+    def _populate_schedules(self, schedules: List[Dict[str, Any]]) -> None:
+        # Sólo se tocan las filas que cambiaron (conserva selección y desplazamiento)
+        self.table_loader.reconcile(schedules, lambda schedule: (schedule['id'], schedule['shift'], schedule['time']))
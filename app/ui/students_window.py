@@ -2,11 +2,22 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime  # <--- IMPORTADO PARA VALIDAR FECHA
 
-from app.services.api_client import ApiClient, ApiError
+from app.config import CONFIG
+from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.mutations import apply_deleted, apply_saved, schedule_revalidation
+from app.services.parallel import FetchResult, fetch_all
+from app.services.search_index import SearchIndex
 from app.services.session import UserSession
+from app.ui.base_window import show_error
+from app.ui.option_models import ComboModel, ListModel
+from app.ui.page_loader import PageLoader
+from app.ui.table_loader import progress_text
+from app.ui.virtual_table import VirtualTable
+from app.ui.theme import PALETTE, ensure_theme
 # from app.ui.base_window import ModuleWindow # Ya no se usa
 
 # CAMBIO 1: Heredar de ttk.Frame
@@ -18,31 +29,15 @@ class StudentsWindow(ttk.Frame):
         self.is_admin = session.role == 'ADMIN'
         self.is_student = session.role == 'STUDENT'
         self.current_id: Optional[int] = None
-        self.user_options: Dict[str, int] = {}
         self.careers: List[Dict[str, Any]] = []
-        self.subjects_cache: Dict[int, List[Dict[str, Any]]] = {}
+        self.students: List[Dict[str, Any]] = [] # Último listado mostrado en la tabla
+        self._career_names: Dict[Any, str] = {}
         self.current_subjects: List[int] = []
+        self.current_career_id: Optional[int] = None
 
-        # --- MEJORA ESTÉTICA: Paleta de Colores ---
-        self.COLOR_BG = "#ecf0f1"
-        self.COLOR_PRIMARY = "#3498db"
-        self.COLOR_DANGER = "#e74c3c"
-        self.COLOR_TEXT_DARK = "#2c3e50"
-        self.COLOR_WHITE = "#ffffff"
-        self.COLOR_GRAY_BORDER = "#bdc3c7"
-
-        # --- MEJORA ESTÉTICA: Aplicar Estilos ---
-        self.style = ttk.Style(self)
-        self.style.configure('Content.TFrame', background=self.COLOR_BG)
+        # --- Estilos: compartidos, se registran una sola vez por raíz (app.ui.theme) ---
+        ensure_theme(self)
         self.configure(style='Content.TFrame')
-        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
-        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
-        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
-        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
-        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
-        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
-        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
-        self.style.configure('TListbox', background=self.COLOR_WHITE, foreground=self.COLOR_TEXT_DARK, borderwidth=1, relief='solid', fieldbackground=self.COLOR_WHITE)
 
         # CAMBIO 3: Layout directo en el frame
         self.pack(fill=tk.BOTH, expand=True)
@@ -50,7 +45,7 @@ class StudentsWindow(ttk.Frame):
         
         # Título del Módulo
         title_text = "Gestión de Alumnos" if self.is_admin else "Mi Perfil de Alumno"
-        ttk.Label(self, text=title_text, font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
+        ttk.Label(self, text=title_text, style='Title.TLabel').grid(row=0, column=0, sticky="w", pady=(0, 15))
 
         # CAMBIO 4: Lógica de UI por Rol
         if self.is_admin:
@@ -69,13 +64,28 @@ class StudentsWindow(ttk.Frame):
         else:
             self._load_self()
 
+    def refresh(self) -> None:
+        """Vuelve a pedir los datos del módulo (MainMenu lo llama al re-mostrarlo)."""
+        self._fetch_initial_data()
+        # El perfil propio no se recarga: pisaría lo que el usuario esté editando
+        if self.is_admin:
+            self._load_students()
+
     def _build_search(self, container: ttk.Frame) -> None:
         search_frame = ttk.Frame(container, style='Content.TFrame')
         search_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
-        ttk.Label(search_frame, text="Buscar por ID:", style='Content.TLabel').pack(side=tk.LEFT)
+        ttk.Label(search_frame, text="Buscar:", style='Content.TLabel').pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
-        ttk.Entry(search_frame, textvariable=self.search_var, width=10).pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Buscar", command=self._search, style='Primary.TButton').pack(side=tk.LEFT)
+        ttk.Entry(search_frame, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Buscar por ID", command=self._search, style='Primary.TButton').pack(side=tk.LEFT)
+
+        # Filtro al escribir sobre nombre y email, sin ir al servidor
+        self.search_index = SearchIndex(('name', 'email'))
+        self._filter_job: Optional[str] = None
+        self.search_var.trace_add('write', lambda *_: self._schedule_filter())
+        # Aviso de resultados parciales mientras faltan páginas por cargar
+        self.search_hint = tk.StringVar()
+        ttk.Label(search_frame, textvariable=self.search_hint, style='Content.TLabel').pack(side=tk.LEFT, padx=10)
 
     def _build_tree(self, container: ttk.Frame) -> None:
         columns = ('id', 'name', 'email', 'status', 'career')
@@ -85,12 +95,13 @@ class StudentsWindow(ttk.Frame):
         tree_container.rowconfigure(0, weight=1)
         tree_container.columnconfigure(0, weight=1)
         
-        self.tree = ttk.Treeview(tree_container, columns=columns, show='headings', height=7)
-        self.tree.grid(row=0, column=0, sticky="nsew")
-        
-        scrollbar = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        # Tabla virtual: con miles de registros sólo se crean las filas visibles
+        self.table_status = tk.StringVar()
+        self.tree = VirtualTable(
+            tree_container, columns, height=7,
+            on_progress=lambda done, total: self.table_status.set(progress_text(done, total))
+        )
+        self.tree.grid(row=0, column=0, columnspan=2, sticky="nsew")
 
         self.tree.heading('id', text='ID'); self.tree.column('id', width=40, stretch=False)
         self.tree.heading('name', text='Nombre'); self.tree.column('name', width=250)
@@ -100,6 +111,15 @@ class StudentsWindow(ttk.Frame):
 
         self.tree.bind('<<TreeviewSelect>>', self._on_select)
 
+        ttk.Label(tree_container, textvariable=self.table_status, style='Content.TLabel').grid(row=1, column=0, sticky="w", pady=(4, 0))
+
+        # Los alumnos llegan por páginas; la siguiente se pide al acercarse al final
+        self.pager = PageLoader(
+            self.tree, self._on_students_page,
+            lambda e: show_error("Error de Carga", e, "No se pudieron cargar los alumnos: ")
+        )
+        self.tree.on_scroll = self.pager.on_scroll
+
     def _build_form(self, container: ttk.Frame, form_row: int) -> None:
         form = ttk.LabelFrame(container, text="Datos del alumno", style='Form.TLabelframe', padding=15)
         form.grid(row=form_row, column=0, sticky="nsew")
@@ -114,6 +134,7 @@ class StudentsWindow(ttk.Frame):
         self.email_var = tk.StringVar()
         self.email_combo = ttk.Combobox(form, textvariable=self.email_var, state='readonly')
         self.email_combo.grid(row=1, column=1, sticky="ew", pady=5, padx=5)
+        self.email_model = ComboModel(self.email_combo, self.email_var)
 
         ttk.Label(form, text="Nombre", style='Content.TLabel').grid(row=2, column=0, sticky="w", pady=5, padx=5)
         self.name_var = tk.StringVar()
@@ -135,12 +156,14 @@ class StudentsWindow(ttk.Frame):
         self.career_combo = ttk.Combobox(form, textvariable=self.career_var, state='readonly')
         self.career_combo.grid(row=5, column=1, sticky="ew", pady=5, padx=5)
         self.career_combo.bind('<<ComboboxSelected>>', lambda _e: self._load_subjects())
+        self.career_model = ComboModel(self.career_combo, self.career_var)
 
         ttk.Label(form, text="Materias (Inscripción)", style='Content.TLabel').grid(row=6, column=0, sticky="nw", pady=(15, 5), padx=5)
         self.subjects_list = tk.Listbox(form, selectmode=tk.MULTIPLE, height=6, exportselection=False,
-                                        bg=self.COLOR_WHITE, fg=self.COLOR_TEXT_DARK, 
+                                        bg=PALETTE.white, fg=PALETTE.text_dark, 
                                         relief='solid', borderwidth=1, highlightthickness=0)
         self.subjects_list.grid(row=6, column=1, sticky="ew", pady=(15, 5), padx=5)
+        self.subjects_model = ListModel(self.subjects_list)
 
         buttons = ttk.Frame(form, style='Content.TFrame')
         buttons.grid(row=7, column=0, columnspan=2, pady=15)
@@ -152,60 +175,85 @@ class StudentsWindow(ttk.Frame):
         ttk.Button(buttons, text="Guardar", command=self._save, style='Primary.TButton').grid(row=0, column=1, padx=5)
 
     def _fetch_initial_data(self) -> None:
-        try:
+        def fetch() -> FetchResult:
+            calls = {'careers': lambda: self.session.references.get(self.api, 'careers')}
             if self.is_admin:
-                users = self.api.get('/users/unassigned', params={'role': 'STUDENT', 'entity': 'students'})
-                self.user_options = {f"{item['email']} ({item['username']})": item['id'] for item in users}
-                self.email_combo.configure(values=list(self.user_options.keys()))
-            else:
-                self.email_combo.configure(state='disabled')
+                calls['users'] = lambda: self.api.get('/users/unassigned', params={'role': 'STUDENT', 'entity': 'students'})
+            return fetch_all(calls)
 
-            self.careers = self.api.get('/careers')
-            career_values = [f"{career['id']} - {career['name']}" for career in self.careers]
-            self.career_combo.configure(values=career_values)
-            
-            if not self.is_admin:
-                self.career_combo.configure(state='disabled')
-                self.name_entry.configure(state='disabled')
-                self.status_combo.configure(state='disabled')
-                self.birth_entry.configure(state='disabled')
-        except ApiError as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los datos iniciales: {e.message}")
+        if not self.is_admin:
+            self.email_combo.configure(state='disabled')
+            self.career_combo.configure(state='disabled')
+            self.name_entry.configure(state='disabled')
+            self.status_combo.configure(state='disabled')
+            self.birth_entry.configure(state='disabled')
+
+        EXECUTOR.submit(
+            self, fetch, key='initial',
+            on_done=self._apply_initial_data,
+            on_error=lambda e: show_error("Error de Carga", e, "No se pudieron cargar los datos iniciales: ")
+        )
+
+    def _apply_initial_data(self, data: FetchResult) -> None:
+        if 'users' in data.results:
+            self.email_model.set_options((item['id'], f"{item['email']} ({item['username']})") for item in data.results['users'])
+
+        if 'careers' in data.results:
+            self.careers = data.results['careers']
+            self.career_model.set_options((career['id'], f"{career['id']} - {career['name']}") for career in self.careers)
+            if self.current_career_id:
+                self._show_current_career()
+            if self.students:
+                self._populate_students(self.careers, self.students)
+
+        if not data.ok:
+            show_error("Error de Carga", data.error, "No se pudieron cargar los datos iniciales: ")
 
     def _load_subjects(self, career_id: Optional[int] = None) -> None:
         if career_id is None:
-            selected = self.career_var.get().split(' - ')[0]
-            if not selected:
+            career_id = self.career_model.selected_id()
+            if career_id is None:
                 return
-            career_id = int(selected)
         
-        try:
-            if career_id in self.subjects_cache:
-                subjects = self.subjects_cache[career_id]
-            else:
-                subjects = self.api.get('/subjects', params={'careerId': career_id})
-                self.subjects_cache[career_id] = subjects
+        # Las materias salen del catálogo compartido de la sesión (una sola descarga)
+        EXECUTOR.submit(
+            self, self.session.references.subjects_for_career, self.api, career_id, key='subjects',
+            on_done=self._show_subjects,
+            on_error=lambda e: show_error("Error de API", e, "No se pudieron cargar las materias: ")
+        )
 
-            self.subjects_list.delete(0, tk.END)
-            for subject in subjects:
-                self.subjects_list.insert(tk.END, f"{subject['id']} - {subject['name']}")
+    def _show_subjects(self, subjects: List[Dict[str, Any]]) -> None:
+        self.subjects_model.set_options((subject['id'], f"{subject['id']} - {subject['name']}") for subject in subjects)
 
-            # Restaurar selección
-            for index, subject in enumerate(subjects):
-                if subject['id'] in self.current_subjects:
-                    self.subjects_list.selection_set(index)
-        except ApiError as e:
-            messagebox.showerror("Error de API", f"No se pudieron cargar las materias: {e.message}")
+        # Restaurar selección
+        self.subjects_model.select_ids(self.current_subjects)
 
     def _search(self) -> None:
         value = self.search_var.get().strip()
         if not value.isdigit():
             messagebox.showinfo("Buscar", "Ingresa un ID numérico válido.")
             return
-        try:
-            self._load_student(int(value))
-        except ApiError as e:
-            messagebox.showerror("Error de Búsqueda", e.message)
+        self._load_student(int(value))
+
+    def _schedule_filter(self) -> None:
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(CONFIG.search_debounce_ms, self._apply_filter)
+
+    def _apply_filter(self) -> None:
+        self._filter_job = None
+        query = self.search_var.get()
+        self.tree.set_filter(self.search_index.search(query))
+        if query.strip() and self.pager.has_more:
+            # El índice sólo tiene lo cargado: traer el resto para que la búsqueda lo vea
+            self.pager.load_rest()
+        self._update_search_hint()
+
+    def _update_search_hint(self) -> None:
+        partial = bool(self.search_var.get().strip()) and self.pager.has_more
+        self.search_hint.set(
+            f"Sólo entre los {len(self.students):,} alumnos cargados; cargando el resto..." if partial else ""
+        )
 
     def _on_select(self, _event: tk.Event) -> None:
         selection = self.tree.selection()
@@ -214,46 +262,62 @@ class StudentsWindow(ttk.Frame):
         self._load_student(int(item['values'][0]))
 
     def _load_students(self) -> None:
-        try:
-            # --- INICIO DE LA MEJORA ---
-            # 1. Asegurarnos de tener el mapa de carreras
-            #    (Normalmente _fetch_initial_data ya lo cargó, pero esto es más seguro)
-            if not self.careers:
-                self.careers = self.api.get('/careers')
-                
-            # 2. Crear un "mapa" para buscar nombres de carrera por ID
-            #    Ej: {1: "Ingeniería en Computación", 2: "Derecho"}
-            career_map = {career['id']: career['name'] for career in self.careers}
-            # --- FIN DE LA MEJORA ---
-
-            students = self.api.get('/students')
-            tree = getattr(self, 'tree', None)
-            if not tree: return
-            
-            tree.delete(*tree.get_children())
-            for student in students:
-                # --- APLICACIÓN DE LA MEJORA ---
-                # 3. Buscar el nombre de la carrera usando el mapa
-                career_id = student.get('careerId') # Asumimos que la API SÍ envía 'careerId'
-                career_name = career_map.get(career_id, 'N/A') # Buscar, si no, 'N/A'
-                
-                tree.insert('', tk.END, values=(
-                    student['id'], student['name'], student['email'], 
-                    student['status'], career_name # 4. Usar el nombre encontrado
-                ))
-        except ApiError as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los alumnos: {e.message}")
-        except Exception as e:
-             messagebox.showerror("Error", f"Ocurrió un error al cargar alumnos: {e}")
+        pages = self.api.paginate('/students')
+        # Pintar al instante la primera página guardada en disco y refrescar en segundo plano
+        cached = pages.peek_first()
+        if cached is not None:
+            self._populate_students(self._known_careers(), cached)
+        self.pager.start(pages)
+
+    def _on_students_page(self, page: List[Dict[str, Any]], first: bool, _has_more: bool) -> None:
+        if first:
+            self._populate_students(self._known_careers(), page)
+        else:
+            # Sólo la página nueva: lo ya cargado no se vuelve a indexar ni a pintar
+            page = [student for student in page if not self.tree.has_row(str(student['id']))]
+            self.students.extend(page)
+            self.search_index.upsert(page)
+            self.tree.set_filter(self.search_index.search(self.search_var.get()), refresh=False)
+            self.tree.append(page, self._student_values)
+        self._update_search_hint()
+
+    def _known_careers(self) -> List[Dict[str, Any]]:
+        # Las carreras las trae _fetch_initial_data; si aún no llegan, se repinta al recibirlas
+        return self.careers or self.session.references.peek(self.api, 'careers') or []
+
+    def _populate_students(self, careers: List[Dict[str, Any]], students: List[Dict[str, Any]], reindex: bool = True) -> None:
+        """Muestra ``students``; con ``reindex=False`` el índice de búsqueda ya está al día."""
+        if not self.careers:
+            self.careers = careers
+        # "Mapa" para buscar nombres de carrera por ID
+        # Ej: {1: "Ingeniería en Computación", 2: "Derecho"}
+        self._career_names = {career['id']: career['name'] for career in careers}
+
+        tree = getattr(self, 'tree', None)
+        if not tree: return
+        self.students = students
+        if reindex:
+            self.search_index.update(students)
+        self.tree.set_filter(self.search_index.search(self.search_var.get()), refresh=False)
+
+        self.tree.load(students, self._student_values)
+
+    def _student_values(self, student: Dict[str, Any]) -> Tuple[Any, ...]:
+        # Buscar el nombre de la carrera usando el mapa ('N/A' si no existe)
+        return (
+            student['id'], student['name'], student['email'],
+            student['status'], self._career_names.get(student.get('careerId'), 'N/A')
+        )
 
     def _load_student(self, student_id: int) -> None:
-        try:
-            data = self.api.get(f'/students/{student_id}')
-        except ApiError as e:
-            messagebox.showerror("Error", f"No se pudo cargar el alumno: {e.message}")
-            return
-
-        self.current_id = student_id
+        EXECUTOR.submit(
+            self, self.api.get, f'/students/{student_id}', key='detail',
+            on_done=self._fill_student,
+            on_error=lambda e: show_error("Error", e, "No se pudo cargar el alumno: ")
+        )
+
+    def _fill_student(self, data: Dict[str, Any]) -> None:
+        self.current_id = data['id']
         self.id_var.set(str(data['id']))
         self.name_var.set(data['name'])
         self.status_var.set(data['status'])
@@ -261,34 +325,42 @@ class StudentsWindow(ttk.Frame):
         self.current_subjects = [subject['subjectId'] for subject in data.get('subjects', [])]
 
         if self.is_admin:
-            label = next((key for key, value in self.user_options.items() if value == data['userId']), data['email'])
-            if label not in self.user_options and data.get('userId'):
-                self.user_options[label] = data['userId']
-                self.email_combo.configure(values=list(self.user_options.keys()))
-            self.email_var.set(label)
+            # El usuario ya asignado no viene en la lista de disponibles: se agrega
+            if not self.email_model.select(data.get('userId') or None, data['email']):
+                self.email_var.set(data['email'])
         else:
             self.email_var.set(data['email'])
 
-        if data.get('careerId'):
-            career_str = ""
-            for career in self.careers:
-                if career['id'] == data['careerId']:
-                    career_str = f"{career['id']} - {career['name']}"
-                    break
-            self.career_var.set(career_str)
-            self._load_subjects(data['careerId'])
+        self.current_career_id = data.get('careerId')
+        if self.current_career_id:
+            self._show_current_career()
+            self._load_subjects(self.current_career_id)
         else:
-            self.career_var.set("")
-            self.subjects_list.delete(0, tk.END)
+            self.career_model.clear()
+            self.subjects_model.clear()
+
+    def _show_current_career(self) -> None:
+        # Las carreras pueden llegar después que el alumno; se vuelve a llamar al recibirlas
+        if not self.career_model.select(self.current_career_id):
+            self.career_model.clear()
 
     def _load_self(self) -> None:
-        try:
-            data = self.api.get('/students/me')
-            self._load_student(data['id'])
-        except ApiError as e:
-            messagebox.showerror("Error", f"No se pudo cargar tu perfil: {e.message}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        def fetch() -> Dict[str, Any]:
+            me = self.api.get('/students/me')
+            return self.api.get(f"/students/{me['id']}")
+
+        # La ficha propia suele venir precargada por el warm-up tras el login
+        if self.session.profile:
+            self._fill_student(self.session.profile)
+        EXECUTOR.submit(
+            self, fetch, key='detail',
+            on_done=self._on_self_loaded,
+            on_error=lambda e: show_error("Error", e, "No se pudo cargar tu perfil: ")
+        )
+
+    def _on_self_loaded(self, data: Dict[str, Any]) -> None:
+        self.session.profile = data
+        self._fill_student(data)
 
     def _reset(self) -> None:
         self.current_id = None
@@ -298,8 +370,9 @@ class StudentsWindow(ttk.Frame):
         self.birth_var.set('')
         self.career_var.set('')
         self.email_var.set('')
-        self.subjects_list.delete(0, tk.END)
+        self.subjects_model.clear()
         self.current_subjects = []
+        self.current_career_id = None
         if self.is_admin:
             self.tree.selection_remove(self.tree.selection())
             self._fetch_initial_data() # Recargar usuarios no asignados
@@ -307,13 +380,10 @@ class StudentsWindow(ttk.Frame):
     def _collect_payload(self) -> Dict[str, Any]:
         payload: Dict[str, Any] = {}
 
-        selected_subjects = [self.subjects_list.get(i) for i in self.subjects_list.curselection()]
-        subjects_ids = [int(text.split(' - ')[0]) for text in selected_subjects]
-        payload['subjects'] = subjects_ids
+        payload['subjects'] = self.subjects_model.selected_ids()
 
         if self.is_admin:
-            email_label = self.email_var.get()
-            user_id = self.user_options.get(email_label)
+            user_id = self.email_model.selected_id()
             if self.current_id is None and not user_id: # Solo requerido al crear
                 raise ValueError('Debes seleccionar un correo de usuario disponible para crear un alumno.')
             if user_id:
@@ -322,9 +392,9 @@ class StudentsWindow(ttk.Frame):
             name = self.name_var.get().strip()
             status = self.status_var.get().strip()
             dob = self.birth_var.get().strip()
-            career_value = self.career_var.get().strip()
+            career_id = self.career_model.selected_id()
 
-            if not name or not status or not dob or not career_value:
+            if not name or not status or not dob or career_id is None:
                 raise ValueError('Los campos Nombre, Estado, Fecha de Nacimiento y Carrera son requeridos.')
 
             # --- VALIDACIÓN DE NOMBRE (AÑADIDA) ---
@@ -341,7 +411,7 @@ class StudentsWindow(ttk.Frame):
             payload['name'] = name
             payload['status'] = status
             payload['dateOfBirth'] = dob
-            payload['careerId'] = int(career_value.split(' - ')[0])
+            payload['careerId'] = career_id
         else:
             if self.current_id is None:
                 raise ValueError('No hay ningún alumno cargado para guardar.')
@@ -355,18 +425,12 @@ class StudentsWindow(ttk.Frame):
             messagebox.showwarning("Validación", str(error))
             return
 
-        try:
-            if self.current_id is None:
-                response = self.api.post('/students', payload)
-            else:
-                response = self.api.put(f"/students/{self.current_id}", payload)
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
-            return
+        if self.current_id is None:
+            EXECUTOR.submit(self, self.api.post, '/students', payload, on_done=self._on_saved, on_error=self._on_api_error)
+        else:
+            EXECUTOR.submit(self, self.api.put, f"/students/{self.current_id}", payload, on_done=self._on_saved, on_error=self._on_api_error)
 
+    def _on_saved(self, response: Dict[str, Any]) -> None:
         messagebox.showinfo("Éxito", "Alumno guardado")
         
         # Recargar datos
@@ -376,7 +440,18 @@ class StudentsWindow(ttk.Frame):
         self._load_student(response['id']) # Recargar formulario
         
         if self.is_admin:
-            self._load_students() # Recargar tabla
+            # Aplicar la respuesta localmente en lugar de volver a descargar la tabla
+            students = apply_saved(self.students, response)
+            if students is None:
+                self._load_students()
+            else:
+                # La fila guardada (fusionada con la respuesta); el resto del índice no cambia
+                self.search_index.upsert(row for row in students if row.get('id') == response.get('id'))
+                self._populate_students(self.careers, students, reindex=False)
+                schedule_revalidation(self, self._load_students)
+
+    def _on_api_error(self, error: BaseException) -> None:
+        show_error("Error de API", error)
 
     def _delete(self) -> None:
         if not self.is_admin:
@@ -388,17 +463,16 @@ class StudentsWindow(ttk.Frame):
         if not messagebox.askyesno("Eliminar", f"¿Deseas eliminar al alumno '{self.name_var.get()}'?"):
             return
             
-        try:
-            self.api.delete(f"/students/{self.current_id}")
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
-            return
-            
+        EXECUTOR.submit(
+            self, self.api.delete, f"/students/{self.current_id}",
+            on_done=lambda _response, student_id=self.current_id: self._on_deleted(student_id), on_error=self._on_api_error
+        )
+
+    def _on_deleted(self, student_id: int) -> None:
         messagebox.showinfo("Éxito", "Alumno eliminado")
         self._reset()
         if self.is_admin:
             self._fetch_initial_data()
-            self._load_students()
\ No newline at end of file
+            self.search_index.remove([student_id])
+            self._populate_students(self.careers, apply_deleted(self.students, student_id), reindex=False)
+            schedule_revalidation(self, self._load_students)
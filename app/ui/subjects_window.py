@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
-from app.services.api_client import ApiClient, ApiError
+from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.mutations import schedule_revalidation
 from app.services.session import UserSession
+from app.ui.base_window import show_error
+from app.ui.option_models import ComboModel
+from app.ui.table_loader import TableLoader
+from app.ui.theme import ensure_theme
 # Ya no es una ventana emergente
 # from app.ui.base_window import ModuleWindow
 
@@ -18,33 +24,18 @@ class SubjectsWindow(ttk.Frame):
         self.session = session
         self.current_id: Optional[int] = None
         self.careers: List[Dict[str, object]] = []
+        self.career_ids_by_name: Dict[object, object] = {} # La tabla sólo muestra el nombre de la carrera
 
-        # --- MEJORA ESTÉTICA: Paleta de Colores ---
-        self.COLOR_BG = "#ecf0f1"
-        self.COLOR_PRIMARY = "#3498db"
-        self.COLOR_DANGER = "#e74c3c"
-        self.COLOR_TEXT_DARK = "#2c3e50"
-        self.COLOR_WHITE = "#ffffff"
-        self.COLOR_GRAY_BORDER = "#bdc3c7"
-
-        # --- MEJORA ESTÉTICA: Aplicar Estilos ---
-        self.style = ttk.Style(self)
-        self.style.configure('Content.TFrame', background=self.COLOR_BG)
+        # --- Estilos: compartidos, se registran una sola vez por raíz (app.ui.theme) ---
+        ensure_theme(self)
         self.configure(style='Content.TFrame')
-        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
-        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
-        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
-        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
-        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
-        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
-        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
 
         # CAMBIO 2: Layout del Frame
         self.pack(fill=tk.BOTH, expand=True)
         self.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1) # Fila 1 (la tabla) se expandirá
 
-        ttk.Label(self, text="Gestión de Materias", font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
+        ttk.Label(self, text="Gestión de Materias", style='Title.TLabel').grid(row=0, column=0, sticky="w", pady=(0, 15))
 
         self._build_tree(self)
         self._build_form(self)
@@ -53,6 +44,11 @@ class SubjectsWindow(ttk.Frame):
         self._load_careers()
         # _load_subjects() se llamará automáticamente después de cargar las carreras
 
+    def refresh(self) -> None:
+        """Vuelve a pedir los datos del módulo (MainMenu lo llama al re-mostrarlo)."""
+        self._load_careers()
+        self._load_subjects()
+
     def _build_tree(self, container: ttk.Frame) -> None:
         columns = ('id', 'name', 'credits', 'semester', 'career')
         
@@ -80,6 +76,7 @@ class SubjectsWindow(ttk.Frame):
         self.tree.column('career', width=200)
         
         self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.table_loader = TableLoader(self.tree, sortable=True)
 
     def _build_form(self, container: ttk.Frame) -> None:
         form = ttk.LabelFrame(container, text="Datos de la Materia", style='Form.TLabelframe', padding=15)
@@ -114,6 +111,7 @@ class SubjectsWindow(ttk.Frame):
         ttk.Label(form, text="Carrera", style='Content.TLabel').grid(row=3, column=0, sticky="w", pady=5, padx=5)
         self.career_combo = ttk.Combobox(form, textvariable=self.career_var, state='readonly')
         self.career_combo.grid(row=3, column=1, sticky="ew", pady=5, padx=5)
+        self.career_model = ComboModel(self.career_combo, self.career_var)
         
         # --- CORRECCIÓN DE LÓGICA ---
         # Al seleccionar una carrera, se recargan las materias
@@ -128,43 +126,52 @@ class SubjectsWindow(ttk.Frame):
         ttk.Button(buttons, text="Eliminar", command=self._delete, style='Danger.TButton').grid(row=0, column=2, padx=5)
 
     def _load_careers(self) -> None:
-        try:
-            self.careers = self.api.get('/careers')
-            career_values = [f"{c['id']} - {c['name']}" for c in self.careers]
-            self.career_combo.configure(values=career_values)
-            if career_values:
-                self.career_var.set(career_values[0])
-                # Cargar materias de la primera carrera en la lista
-                self._load_subjects()
-        except Exception as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar las carreras: {e}")
+        cached = self.session.references.peek(self.api, 'careers')
+        if cached is not None:
+            self._populate_careers(cached)
+        EXECUTOR.submit(
+            self, self.session.references.get, self.api, 'careers', key='careers',
+            on_done=self._populate_careers,
+            on_error=lambda e: show_error("Error de Carga", e, "No se pudieron cargar las carreras: ")
+        )
+
+    def _populate_careers(self, careers: List[Dict[str, object]]) -> None:
+        self.careers = careers
+        # Con nombres repetidos gana la primera carrera, como al recorrer la lista
+        self.career_ids_by_name = {str(c['name']): c['id'] for c in reversed(self.careers)}
+        self.career_model.set_options(((c['id'], f"{c['id']} - {c['name']}") for c in self.careers), keep_missing=False)
+        if self.careers and self.career_model.selected_id() is None:
+            self.career_model.select(self.careers[0]['id'])
+            # Cargar materias de la primera carrera en la lista
+            self._load_subjects()
 
     # --- FUNCIÓN LÓGICA CORREGIDA ---
     def _load_subjects(self, _event: Optional[tk.Event] = None) -> None:
         """Carga las materias (en la tabla) filtrando por la carrera seleccionada en el combobox."""
-        self.tree.delete(*self.tree.get_children()) # Limpiar tabla
-        
-        selected_career_str = self.career_var.get()
-        if not selected_career_str:
+        career_id = self.career_model.selected_id()
+        if career_id is None:
+            self.table_loader.clear()
             return # No hay carrera seleccionada
 
-        try:
-            career_id = int(selected_career_str.split(' - ')[0])
-            params = {'careerId': career_id}
-            subjects = self.api.get('/subjects', params=params)
-            
-            # Obtener el nombre de la carrera del string (para no hacer otra llamada API)
-            career_name = " ".join(selected_career_str.split(' - ')[1:])
-
-            for subject in subjects:
-                self.tree.insert('', tk.END, values=(
-                    subject['id'], subject['name'], subject['credits'], 
-                    subject['semester'], career_name # Usar el nombre de la carrera ya conocido
-                ))
-        except ApiError as e:
-            messagebox.showerror("Error de API", f"No se pudieron cargar las materias: {e.message}")
-        except Exception as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar las materias: {e}")
+        # El nombre ya está en el catálogo de carreras (no hace falta otra llamada API)
+        career_name = next((str(c['name']) for c in self.careers if c['id'] == career_id), '')
+        # Pintar al instante lo ya cargado y refrescar en segundo plano; todas las
+        # carreras se filtran del mismo catálogo de materias de la sesión
+        cached = self.session.references.peek(self.api, 'subjects')
+        if cached is not None:
+            self._populate_subjects([s for s in cached if s.get('careerId') == career_id], career_name)
+        EXECUTOR.submit(
+            self, self.session.references.subjects_for_career, self.api, career_id, key='subjects',
+            on_done=lambda subjects: self._populate_subjects(subjects, career_name),
+            on_error=lambda e: show_error("Error de Carga", e, "No se pudieron cargar las materias: ")
+        )
+
+    def _populate_subjects(self, subjects: List[Dict[str, Any]], career_name: str) -> None:
+        # Sólo se tocan las filas que cambiaron (conserva selección y desplazamiento)
+        self.table_loader.reconcile(subjects, lambda subject: (
+            subject['id'], subject['name'], subject['credits'],
+            subject['semester'], career_name # Usar el nombre de la carrera ya conocido
+        ))
 
     def _reset(self) -> None:
         self.current_id = None
@@ -189,20 +196,18 @@ class SubjectsWindow(ttk.Frame):
         self.semester_var.set(str(values[3]))
         
         # --- LÓGICA CORREGIDA ---
-        # Buscar la carrera en nuestra lista `self.careers` para setear el string "ID - Nombre"
-        career_name = values[4]
-        for career in self.careers:
-            if career['name'] == career_name:
-                self.career_var.set(f"{career['id']} - {career['name']}")
-                break
+        # La tabla sólo trae el nombre de la carrera: se busca su id en el mapa
+        career_id = self.career_ids_by_name.get(str(values[4]))
+        if career_id is not None:
+            self.career_model.select(career_id)
 
     def _collect_payload(self) -> Dict[str, object]:
         name = self.name_var.get().strip()
         credits = self.credits_var.get().strip()
         semester = self.semester_var.get().strip()
-        career = self.career_var.get().strip()
-        
-        if not name or not credits or not semester or not career:
+        career_id = self.career_model.selected_id()
+
+        if not name or not credits or not semester or career_id is None:
             raise ValueError('Todos los campos son requeridos')
         
         try:
@@ -218,7 +223,7 @@ class SubjectsWindow(ttk.Frame):
             'name': name,
             'credits': credits_int,
             'semester': semester_int,
-            'careerId': int(career.split(' - ')[0])
+            'careerId': career_id
         }
 
     def _save(self) -> None:
@@ -238,35 +243,30 @@ class SubjectsWindow(ttk.Frame):
             item_name_lower = str(item_values[1]).lower()
             
             # Buscamos el ID de la carrera del item en la tabla
-            item_career_id = None
-            for c in self.careers:
-                if c['name'] == str(item_values[4]):
-                    item_career_id = c['id']
-                    break
+            item_career_id = self.career_ids_by_name.get(str(item_values[4]))
             
             if new_name_lower == item_name_lower and new_career_id == item_career_id:
                 if self.current_id is None or self.current_id != item_db_id:
                     messagebox.showwarning("Registro Duplicado", f"Ya existe una materia con ese nombre en esa carrera.")
                     return
 
-        try:
-            if self.current_id is None:
-                subject = self.api.post('/subjects', payload)
-            else:
-                subject = self.api.put(f"/subjects/{self.current_id}", payload)
-                
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:  # noqa: BLE001
-            messagebox.showerror("Error", str(error))
-            return
-        
+        if self.current_id is None:
+            EXECUTOR.submit(self, self.api.post, '/subjects', payload, on_done=self._on_saved, on_error=self._on_api_error)
+        else:
+            EXECUTOR.submit(self, self.api.put, f"/subjects/{self.current_id}", payload, on_done=self._on_saved, on_error=self._on_api_error)
+
+    def _on_saved(self, subject: Dict[str, Any]) -> None:
         messagebox.showinfo("Éxito", "Materia guardada correctamente")
         
         self.current_id = subject['id']
         self.id_var.set(str(subject['id']))
+        # Aplicar la respuesta localmente en lugar de volver a descargar el catálogo
+        self.session.references.apply_saved('subjects', subject)
         self._load_subjects() # Recargar la tabla
+        schedule_revalidation(self, self._revalidate)
+
+    def _on_api_error(self, error: BaseException) -> None:
+        show_error("Error de API", error)
 
     def _delete(self) -> None:
         if self.current_id is None:
@@ -276,15 +276,18 @@ class SubjectsWindow(ttk.Frame):
         if not messagebox.askyesno("Confirmar Eliminación", f"¿Estás seguro de que deseas eliminar la materia '{self.name_var.get()}'?"):
             return
         
-        try:
-            self.api.delete(f"/subjects/{self.current_id}")
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:  # noqa: BLE001
-            messagebox.showerror("Error", str(error))
-            return
-        
+        EXECUTOR.submit(
+            self, self.api.delete, f"/subjects/{self.current_id}",
+            on_done=lambda _response, subject_id=self.current_id: self._on_deleted(subject_id), on_error=self._on_api_error
+        )
+
+    def _on_deleted(self, subject_id: int) -> None:
         messagebox.showinfo("Éxito", "Materia eliminada")
         self._reset()
-        self._load_subjects()
\ No newline at end of file
+        self.session.references.apply_deleted('subjects', subject_id)
+        self._load_subjects()
+        schedule_revalidation(self, self._revalidate)
+
+    def _revalidate(self) -> None:
+        self.session.references.invalidate('subjects')
+        self._load_subjects()
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from tkinter import ttk
+from dataclasses import dataclass
+from operator import itemgetter, ne
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.ui.table_sort import TableSorter
+
+RowValues = Callable[[Any], Tuple[Any, ...]]
+RowId = Callable[[Any], Any]
+ProgressCallback = Callable[[int, int], None]
+
+
+def default_row_id(row: Any) -> Any:
+    return row['id']
+
+
+@dataclass
+class ReconcileStats:
+    """Filas que tocó una actualización de la tabla."""
+    inserted: int = 0
+    updated: int = 0
+    moved: int = 0
+    removed: int = 0
+
+    @property
+    def touched(self) -> int:
+        return self.inserted + self.updated + self.moved + self.removed
+
+
+class TableLoader:
+    """Llena un ``ttk.Treeview`` por lotes sin congelar la interfaz.
+
+    Cada lote inserta filas hasta agotar ``budget_ms`` y cede el control al
+    bucle de Tk con ``after()``; el primer lote se inserta en la misma llamada a
+    ``load`` para que la primera pantalla aparezca de inmediato. Una carga nueva
+    cancela la anterior, y destruir el Treeview detiene la carga en curso.
+
+    Las filas se insertan con ``iid = str(id)`` para poder localizarlas después.
+    ``reconcile`` aprovecha eso para aplicar sólo las diferencias con una lista
+    nueva, conservando selección y desplazamiento.
+
+    Con ``sortable=True`` los encabezados ordenan la tabla (``TableSorter``);
+    las cargas siguientes respetan el orden elegido.
+    """
+
+    def __init__(
+        self,
+        tree: ttk.Treeview,
+        *,
+        budget_ms: float = 12.0,
+        on_progress: Optional[ProgressCallback] = None,
+        on_done: Optional[Callable[[], None]] = None,
+        sortable: bool = False,
+    ) -> None:
+        self.tree = tree
+        self.budget = budget_ms / 1000
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.inserted = 0
+        self.total = 0
+        self._rows: Sequence[Any] = ()
+        self._values: Optional[RowValues] = None
+        self._row_id: RowId = default_row_id
+        self._after_id: Optional[str] = None
+        # Valores mostrados por fila (iid -> tupla) para detectar qué cambió
+        self._shown: Dict[str, Tuple[Any, ...]] = {}
+        # Ids en el orden en que llegaron los datos (base estable para ordenar)
+        self._data_ids: List[str] = []
+        self.last_stats = ReconcileStats()
+        self.sorter = TableSorter(tree, self.resort) if sortable else None
+        tree.bind('<Destroy>', lambda e: self.cancel() if e.widget is tree else None, add='+')
+
+    @property
+    def loading(self) -> bool:
+        return self._values is not None
+
+    def load(self, rows: Sequence[Any], values: RowValues, row_id: RowId = default_row_id) -> None:
+        """Reemplaza el contenido de la tabla por ``rows`` (``values(row)`` da las columnas)."""
+        self.clear()
+        if self.sorter is not None and self.sorter.active:
+            # Para ordenar hacen falta todos los valores antes de insertar
+            entries = [(str(row_id(row)), tuple(values(row))) for row in rows]
+            self._data_ids = [iid for iid, _values in entries]
+            rows, values, row_id = self.sorter.sort(entries), itemgetter(1), itemgetter(0)
+        else:
+            self._data_ids = [str(row_id(row)) for row in rows]
+        self._rows = rows
+        self._values = values
+        self._row_id = row_id
+        self.inserted = 0
+        self.total = len(rows)
+        self._step()
+
+    def reconcile(self, rows: Sequence[Any], values: RowValues, row_id: RowId = default_row_id) -> ReconcileStats:
+        """Actualiza la tabla a ``rows`` tocando sólo las filas nuevas, cambiadas o eliminadas.
+
+        Si la tabla está vacía o a medio cargar se hace una carga completa por lotes;
+        si ``rows`` sólo agrega filas al final de la carga en curso (otra página
+        o lote de un ``StreamPages``), ésta sigue con las nuevas sin reiniciarse.
+        """
+        if self._extends_load(rows, values, row_id):
+            added = len(rows) - self.total
+            self._data_ids.extend(str(row_id(row)) for row in rows[self.total:])
+            self._rows, self._values, self._row_id = rows, values, row_id
+            self.total = len(rows)
+            self.last_stats = ReconcileStats(inserted=added)
+            return self.last_stats
+        if self.loading or not self._shown:
+            self.load(rows, values, row_id)
+            self.last_stats = ReconcileStats(inserted=len(rows))
+            return self.last_stats
+
+        tree = self.tree
+        stats = ReconcileStats()
+        first_visible = tree.yview()[0]
+        entries = [(str(row_id(row)), tuple(values(row))) for row in rows]
+        self._data_ids = [iid for iid, _values in entries]
+        if self.sorter is not None and self.sorter.active:
+            entries = self.sorter.sort(entries)
+        new_ids = [iid for iid, _values in entries]
+        wanted = set(new_ids)
+
+        removed = [iid for iid in tree.get_children() if iid not in wanted]
+        if removed:
+            tree.delete(*removed)
+            for iid in removed:
+                self._shown.pop(iid, None)
+            stats.removed = len(removed)
+
+        order: List[str] = list(tree.get_children())
+        for position, (iid, row_values) in enumerate(entries):
+            shown = self._shown.get(iid)
+            if shown is None:
+                tree.insert('', position, iid=iid, values=row_values)
+                order.insert(position, iid)
+                stats.inserted += 1
+            else:
+                if shown != row_values:
+                    tree.item(iid, values=row_values)
+                    stats.updated += 1
+                if order[position] != iid:
+                    tree.move(iid, '', position)
+                    order.remove(iid)
+                    order.insert(position, iid)
+                    stats.moved += 1
+            self._shown[iid] = row_values
+
+        tree.yview_moveto(first_visible)
+        self.total = self.inserted = len(new_ids)
+        if self.on_progress is not None:
+            self.on_progress(self.inserted, self.total)
+        self.last_stats = stats
+        return stats
+
+    def _extends_load(self, rows: Sequence[Any], values: RowValues, row_id: RowId) -> bool:
+        # Mismas filas al principio (por id, y las ya insertadas con los mismos
+        # valores): sólo llegaron más al final. No se compara por identidad:
+        # VirtualTable pasa posiciones (un range), enteros nuevos en cada llamada
+        if not self.loading or (self.sorter is not None and self.sorter.active):
+            return False
+        count = len(self._data_ids)
+        if len(rows) < count:
+            return False
+        prefix = rows[:count]
+        if any(map(ne, self._data_ids, map(str, map(row_id, prefix)))):
+            return False
+        shown = self._shown
+        return all(
+            shown.get(iid) == tuple(values(row))
+            for iid, row in zip(self._data_ids[:self.inserted], prefix)
+        )
+
+    def resort(self) -> None:
+        """Reacomoda las filas según el orden actual sin volver a crearlas."""
+        if self.loading:
+            # A medio cargar: reiniciar la carga con las filas ya ordenadas
+            self.load(self._rows, self._values, self._row_id)
+            return
+        entries = [(iid, self._shown[iid]) for iid in self._data_ids if iid in self._shown]
+        if self.sorter is not None:
+            entries = self.sorter.sort(entries)
+        order = [iid for iid, _values in entries]
+        if list(self.tree.get_children()) != order:
+            self.tree.set_children('', *order)
+
+    def clear(self) -> None:
+        """Cancela la carga en curso y vacía la tabla."""
+        self.cancel()
+        self.tree.delete(*self.tree.get_children())
+        self._shown.clear()
+        self._data_ids = []
+        self.inserted = self.total = 0
+
+    def cancel(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.tree.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        self._values = None
+        self._rows = ()
+
+    def _step(self) -> None:
+        self._after_id = None
+        if self._values is None:
+            return
+        try:
+            if not self.tree.winfo_exists():
+                self.cancel()
+                return
+        except tk.TclError:
+            self.cancel()
+            return
+
+        deadline = time.perf_counter() + self.budget
+        tree, rows, values, row_id = self.tree, self._rows, self._values, self._row_id
+        index = self.inserted
+        while index < self.total:
+            row = rows[index]
+            iid, row_values = str(row_id(row)), tuple(values(row))
+            tree.insert('', tk.END, iid=iid, values=row_values)
+            self._shown[iid] = row_values
+            index += 1
+            # Consultar el reloj cada pocas filas para no pagarlo en todas
+            if index % 25 == 0 and time.perf_counter() >= deadline:
+                break
+        self.inserted = index
+
+        if self.on_progress is not None:
+            self.on_progress(self.inserted, self.total)
+        if self.inserted < self.total:
+            self._after_id = tree.after(1, self._step)
+        else:
+            self._values = None
+            self._rows = ()
+            if self.on_done is not None:
+                self.on_done()
+
+
+def progress_text(inserted: int, total: int) -> str:
+    """Texto de estado para mostrar junto a la tabla mientras se llena."""
+    if inserted < total:
+        return f"Cargando... {inserted:,} de {total:,}"
+    return f"{total:,} registros"
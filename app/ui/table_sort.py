@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import locale
+import re
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from app.services.search_index import normalize
+
+Entry = Tuple[str, Tuple[Any, ...]]  # (iid, valores de la fila)
+
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+_TIME = re.compile(r'(\d{1,2}):(\d{2})(?::(\d{2}))?')
+_EMPTY = ('', 'n/a')
+_ARROWS = {False: '▲', True: '▼'}
+_SHIFT = 0x0001
+
+
+def use_system_collation() -> None:
+    """Toma el orden alfabético del sistema para ``sort_key`` (llamar una vez al arrancar).
+
+    Python arranca con el locale "C", en el que ``strxfrm`` no hace nada. Si el
+    locale del sistema no está disponible se queda en "C": el texto ya llega en
+    minúsculas y sin acentos, así que el orden sigue siendo el alfabético.
+    """
+    try:
+        locale.setlocale(locale.LC_COLLATE, '')
+    except locale.Error:
+        locale.setlocale(locale.LC_COLLATE, 'C')
+
+
+def sort_key(value: Any) -> Tuple[Any, ...]:
+    """Clave de orden de una celda: números, luego horas ('07:30'), luego texto.
+
+    El texto se compara sin acentos ni mayúsculas y según el locale activo
+    (ver ``use_system_collation``).
+    Las celdas vacías o 'N/A' van al final.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, '')
+    text = '' if value is None else str(value).strip()
+    if text.lower() in _EMPTY:
+        return (3, 0, '')
+    if _NUMBER.fullmatch(text):
+        return (0, float(text), '')
+    match = _TIME.match(text)
+    if match:
+        hours, minutes, seconds = match.groups()
+        return (1, int(hours) * 3600 + int(minutes) * 60 + int(seconds or 0), text)
+    return (2, 0, locale.strxfrm(normalize(text)))
+
+
+class TableSorter:
+    """Ordena una tabla al hacer clic en los encabezados del ``ttk.Treeview``.
+
+    Clic: ordena por esa columna (otro clic invierte el sentido). Mayús+clic:
+    agrega la columna como criterio secundario. El orden es estable: a igual
+    clave se conserva el orden en que llegaron los datos.
+
+    La clave de cada celda se calcula una sola vez y se guarda por ``iid``;
+    sólo se recalcula si cambia el valor de esa celda. ``on_change`` avisa al
+    dueño de la tabla para que reacomode las filas existentes.
+    """
+
+    def __init__(self, tree: ttk.Treeview, on_change: Callable[[], None]) -> None:
+        self.tree = tree
+        self.on_change = on_change
+        self.columns: Tuple[str, ...] = tuple(tree['columns'])
+        # Criterios activos, del principal al último: (índice de columna, descendente)
+        self.spec: List[Tuple[int, bool]] = []
+        # Títulos originales, tomados antes de agregarles la flecha
+        self._titles: Dict[str, str] = {}
+        self._keys: Dict[int, Dict[str, Tuple[Any, Tuple[Any, ...]]]] = {}
+        tree.bind('<ButtonRelease-1>', self._on_click, add='+')
+
+    @property
+    def active(self) -> bool:
+        return bool(self.spec)
+
+    def sort(self, entries: Sequence[Entry]) -> List[Entry]:
+        """``entries`` ordenadas según los criterios activos (copia)."""
+        result = list(entries)
+        if not self.spec:
+            return result
+        # Ordenar del último criterio al principal: al ser estable, queda multi-clave
+        for column, descending in reversed(self.spec):
+            keys = self._column_keys(column, result)
+            result.sort(key=lambda entry: keys[entry[0]], reverse=descending)
+        self._prune(len(result))
+        return result
+
+    def toggle(self, column: str, add: bool = False) -> None:
+        """Ordena por ``column``; con ``add`` la agrega como criterio adicional."""
+        index = self.columns.index(column)
+        current = dict(self.spec)
+        if add:
+            if index in current:
+                self.spec = [(col, not desc if col == index else desc) for col, desc in self.spec]
+            else:
+                self.spec.append((index, False))
+        elif len(self.spec) == 1 and index in current:
+            self.spec = [(index, not current[index])]
+        else:
+            self.spec = [(index, False)]
+        self._update_headings()
+        self.on_change()
+
+    def reset(self) -> None:
+        self.spec = []
+        self._keys.clear()
+        self._update_headings()
+
+    # --- Internos ---
+    def _column_keys(self, column: int, entries: Sequence[Entry]) -> Dict[str, Tuple[Any, ...]]:
+        cache = self._keys.setdefault(column, {})
+        keys: Dict[str, Tuple[Any, ...]] = {}
+        for iid, values in entries:
+            value = values[column] if column < len(values) else None
+            cached = cache.get(iid)
+            if cached is None or cached[0] != value:
+                cached = cache[iid] = (value, sort_key(value))
+            keys[iid] = cached[1]
+        return keys
+
+    def _prune(self, rows: int) -> None:
+        # Las claves de filas que ya no están se descartan cuando sobran muchas
+        for column, cache in self._keys.items():
+            if len(cache) > 2 * rows + 64:
+                self._keys[column] = {}
+
+    def _update_headings(self) -> None:
+        order = {column: position for position, (column, _desc) in enumerate(self.spec)}
+        for index, column in enumerate(self.columns):
+            title = self._titles.setdefault(column, self.tree.heading(column, 'text'))
+            if index in order:
+                arrow = _ARROWS[self.spec[order[index]][1]]
+                number = str(order[index] + 1) if len(self.spec) > 1 else ''
+                title = f"{title} {arrow}{number}"
+            self.tree.heading(column, text=title)
+
+    def _on_click(self, event: tk.Event) -> None:
+        if self.tree.identify_region(event.x, event.y) != 'heading':
+            return
+        column_id = self.tree.identify_column(event.x)  # '#1', '#2', ...
+        position = int(column_id[1:]) - 1
+        if position < 0:
+            return
+        displayed = self.tree['displaycolumns']
+        if displayed and displayed[0] != '#all':
+            column = displayed[position]
+        else:
+            column = self.columns[position]
+        self.toggle(column, add=bool(event.state & _SHIFT))
@@ -4,8 +4,16 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Any, Dict, List, Optional
 
-from app.services.api_client import ApiClient, ApiError
+from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.mutations import schedule_revalidation
+from app.services.parallel import FetchResult, fetch_all
 from app.services.session import UserSession
+from app.services.subject_index import Option, SubjectIndex
+from app.ui.base_window import show_error
+from app.ui.option_models import ComboModel, ListModel
+from app.ui.table_loader import TableLoader, progress_text
+from app.ui.theme import PALETTE, ensure_theme
 # from app.ui.base_window import ModuleWindow # Ya no se usa
 
 # CAMBIO 1: Heredar de ttk.Frame
@@ -16,33 +24,16 @@ class TeachersWindow(ttk.Frame):
         self.session = session
         self.is_admin = session.role == 'ADMIN'
         self.current_id: Optional[int] = None
-        self.user_options: Dict[str, int] = {}
         self.careers: List[Dict[str, Any]] = []
         self.subjects: List[Dict[str, Any]] = []
         self.current_subjects: List[int] = [] # Para guardar las materias seleccionadas
+        self.current_careers: List[int] = [] # Carreras asignadas al maestro cargado
+        self.subject_index = SubjectIndex() # Se rehace sólo si cambian carreras o materias
+        self._subject_options: List[Option] = [] # Lo que muestra ahora la lista de materias
 
-        # --- MEJORA ESTÉTICA: Paleta de Colores ---
-        self.COLOR_BG = "#ecf0f1"
-        self.COLOR_PRIMARY = "#3498db"
-        self.COLOR_DANGER = "#e74c3c"
-        self.COLOR_TEXT_DARK = "#2c3e50"
-        self.COLOR_WHITE = "#ffffff"
-        self.COLOR_GRAY_BORDER = "#bdc3c7"
-
-        # --- MEJORA ESTÉTICA: Aplicar Estilos ---
-        self.style = ttk.Style(self)
-        self.style.configure('Content.TFrame', background=self.COLOR_BG)
+        # --- Estilos: compartidos, se registran una sola vez por raíz (app.ui.theme) ---
+        ensure_theme(self)
         self.configure(style='Content.TFrame')
-        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
-        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
-        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
-        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
-        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
-        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
-        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
-        
-        # Estilo para los Listbox (fondo blanco, borde)
-        self.style.configure('TListbox', background=self.COLOR_WHITE, foreground=self.COLOR_TEXT_DARK, borderwidth=1, relief='solid', fieldbackground=self.COLOR_WHITE)
 
         # CAMBIO 2: Layout del Frame
         self.pack(fill=tk.BOTH, expand=True)
@@ -50,7 +41,7 @@ class TeachersWindow(ttk.Frame):
         
         # Título del Módulo
         title_text = "Gestión de Maestros" if self.is_admin else "Mi Perfil de Maestro"
-        ttk.Label(self, text=title_text, font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
+        ttk.Label(self, text=title_text, style='Title.TLabel').grid(row=0, column=0, sticky="w", pady=(0, 15))
 
         # La lógica de roles se mantiene
         if self.is_admin:
@@ -65,6 +56,12 @@ class TeachersWindow(ttk.Frame):
             self._fetch_support_data()
             self._load_self() # Carga solo los datos del maestro logueado
 
+    def refresh(self) -> None:
+        """Vuelve a pedir los datos del módulo (MainMenu lo llama al re-mostrarlo)."""
+        self._fetch_support_data()
+        # El perfil propio no se recarga: pisaría lo que el usuario esté editando
+        if self.is_admin:
+            self._load_teachers()
 
     def _build_tree(self, container: ttk.Frame) -> None:
         columns = ('id', 'name', 'email', 'degree')
@@ -88,6 +85,14 @@ class TeachersWindow(ttk.Frame):
         
         self.tree.bind('<<TreeviewSelect>>', self._on_select)
 
+        # Estado de la carga por lotes (filas insertadas / total)
+        self.table_status = tk.StringVar()
+        ttk.Label(tree_container, textvariable=self.table_status, style='Content.TLabel').grid(row=1, column=0, sticky="w", pady=(4, 0))
+        self.table_loader = TableLoader(
+            self.tree, sortable=True,
+            on_progress=lambda done, total: self.table_status.set(progress_text(done, total)),
+        )
+
     def _build_form(self, container: ttk.Frame, form_row: int) -> None:
         form = ttk.LabelFrame(container, text="Datos del Maestro", style='Form.TLabelframe', padding=15)
         form.grid(row=form_row, column=0, sticky="nsew")
@@ -104,6 +109,7 @@ class TeachersWindow(ttk.Frame):
         if self.is_admin:
             self.email_combo = ttk.Combobox(form, textvariable=self.email_var, state='readonly')
             self.email_combo.grid(row=1, column=1, sticky="ew", pady=5, padx=5)
+            self.email_model = ComboModel(self.email_combo, self.email_var)
         else:
             self.email_entry = ttk.Entry(form, textvariable=self.email_var, state='readonly') # Maestro no edita su email
             self.email_entry.grid(row=1, column=1, sticky="ew", pady=5, padx=5)
@@ -124,18 +130,20 @@ class TeachersWindow(ttk.Frame):
         ttk.Label(form, text="Carreras Asignadas", style='Content.TLabel').grid(row=4, column=0, sticky="nw", pady=(15, 5), padx=5)
         # Usamos tk.Listbox porque ttk.Listbox no existe, pero le damos estilo
         self.careers_list = tk.Listbox(form, selectmode=tk.MULTIPLE, height=5, exportselection=False,
-                                       bg=self.COLOR_WHITE, fg=self.COLOR_TEXT_DARK, 
+                                       bg=PALETTE.white, fg=PALETTE.text_dark, 
                                        relief='solid', borderwidth=1, highlightthickness=0)
         self.careers_list.grid(row=4, column=1, sticky="ew", pady=(15, 5), padx=5)
         self.careers_list.bind('<<ListboxSelect>>', lambda _e: self._refresh_subject_list())
+        self.careers_model = ListModel(self.careers_list)
 
         # Fila 5: Materias
         ttk.Label(form, text="Materias que Imparte", style='Content.TLabel').grid(row=5, column=0, sticky="nw", pady=(15, 5), padx=5)
         self.subjects_list = tk.Listbox(form, selectmode=tk.MULTIPLE, height=6, exportselection=False,
-                                        bg=self.COLOR_WHITE, fg=self.COLOR_TEXT_DARK, 
+                                        bg=PALETTE.white, fg=PALETTE.text_dark, 
                                         relief='solid', borderwidth=1, highlightthickness=0)
         self.subjects_list.grid(row=5, column=1, sticky="ew", pady=(15, 5), padx=5)
         self.subjects_list.bind('<<ListboxSelect>>', lambda _e: self._update_selected_subjects())
+        self.subjects_model = ListModel(self.subjects_list)
 
         # Fila 6: Botones
         buttons = ttk.Frame(form, style='Content.TFrame')
@@ -155,58 +163,70 @@ class TeachersWindow(ttk.Frame):
 
 
     def _fetch_support_data(self) -> None:
-        try:
+        def fetch() -> FetchResult:
+            references = self.session.references
+            calls = {
+                'careers': lambda: references.get(self.api, 'careers'),
+                'subjects': lambda: references.get(self.api, 'subjects'),
+            }
             if self.is_admin:
-                users = self.api.get('/users/unassigned', params={'role': 'TEACHER', 'entity': 'teachers'})
-                self.user_options = {f"{item['email']} ({item['username']})": item['id'] for item in users}
-                self.email_combo.configure(values=list(self.user_options.keys()))
+                calls['users'] = lambda: self.api.get('/users/unassigned', params={'role': 'TEACHER', 'entity': 'teachers'})
+            return fetch_all(calls)
+
+        EXECUTOR.submit(
+            self, fetch, key='support',
+            on_done=self._apply_support_data,
+            on_error=lambda e: show_error("Error de Carga", e, "No se pudieron cargar los datos iniciales: ")
+        )
 
-            self.careers = self.api.get('/careers')
+    def _apply_support_data(self, data: FetchResult) -> None:
+        if 'users' in data.results:
+            self.email_model.set_options((item['id'], f"{item['email']} ({item['username']})") for item in data.results['users'])
+
+        if 'careers' in data.results:
+            self.careers = data.results['careers']
             self._refresh_career_list()
 
-            self.subjects = self.api.get('/subjects')
+        if 'subjects' in data.results:
+            self.subjects = data.results['subjects']
             self._refresh_subject_list()
-        except ApiError as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los datos iniciales: {e.message}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error inesperado al cargar datos: {e}")
+
+        if not data.ok:
+            show_error("Error de Carga", data.error, "No se pudieron cargar los datos iniciales: ")
 
 
     def _refresh_career_list(self) -> None:
-        self.careers_list.delete(0, tk.END)
-        for career in self.careers:
-            self.careers_list.insert(tk.END, f"{career['id']} - {career['name']}")
+        self.careers_model.set_options((career['id'], f"{career['id']} - {career['name']}") for career in self.careers)
+        self._select_current_careers()
+
+    def _select_current_careers(self) -> None:
+        self.careers_model.select_ids(self.current_careers)
 
     def _refresh_subject_list(self) -> None:
-        selected_careers = {int(self.careers_list.get(i).split(' - ')[0]) for i in self.careers_list.curselection()}
-        self.subjects_list.delete(0, tk.END)
-        
-        for subject in self.subjects:
-            # Si no hay carreras seleccionadas (modo Admin) O la materia pertenece a las carreras seleccionadas (modo Maestro)
-            if not selected_careers or subject.get('careerId') in selected_careers:
-                career_name = ""
-                for c in self.careers: # Buscar nombre de la carrera
-                    if c['id'] == subject.get('careerId'):
-                        career_name = c['name']
-                        break
-                label = f"{subject['id']} - {subject['name']} ({career_name})"
-                self.subjects_list.insert(tk.END, label)
-        
+        self.subject_index.update(self.careers, self.subjects)
+        # Sin carreras seleccionadas (modo Admin) se muestran todas; si no, las de esas carreras
+        options = self.subject_index.options(self.careers_model.selected_ids())
+        if options is not self._subject_options:
+            self.subjects_model.set_options(options)
+            self._subject_options = options
+
         # Restaurar selección previa
-        for index in range(self.subjects_list.size()):
-            subject_id = int(self.subjects_list.get(index).split(' - ')[0])
-            if hasattr(self, 'current_subjects') and subject_id in getattr(self, 'current_subjects'):
-                self.subjects_list.selection_set(index)
+        self.subjects_model.select_ids(self.current_subjects)
         self._update_selected_subjects()
 
     def _load_teachers(self) -> None:
-        try:
-            teachers = self.api.get('/teachers')
-            self.tree.delete(*self.tree.get_children())
-            for teacher in teachers:
-                self.tree.insert('', tk.END, values=(teacher['id'], teacher['name'], teacher['email'], teacher.get('degree', 'N/A')))
-        except Exception as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los maestros: {e}")
+        # Pintar al instante lo ya cargado (memoria o disco) y refrescar en segundo plano
+        cached = self.session.references.peek(self.api, 'teachers')
+        if cached is not None:
+            self._populate_teachers(cached)
+        EXECUTOR.submit(
+            self, self.session.references.get, self.api, 'teachers', key='teachers',
+            on_done=self._populate_teachers,
+            on_error=lambda e: show_error("Error de Carga", e, "No se pudieron cargar los maestros: ")
+        )
+
+    def _populate_teachers(self, teachers: List[Dict[str, Any]]) -> None:
+        self.table_loader.reconcile(teachers, lambda teacher: (teacher['id'], teacher['name'], teacher['email'], teacher.get('degree', 'N/A')))
 
     def _on_select(self, _event: tk.Event) -> None:
         selection = self.tree.selection()
@@ -215,13 +235,14 @@ class TeachersWindow(ttk.Frame):
         self._load_teacher(int(item['values'][0]))
 
     def _load_teacher(self, teacher_id: int) -> None:
-        try:
-            data = self.api.get(f'/teachers/{teacher_id}')
-        except ApiError as e:
-            messagebox.showerror("Error", f"No se pudo cargar el maestro: {e.message}")
-            return
-            
-        self.current_id = teacher_id
+        EXECUTOR.submit(
+            self, self.api.get, f'/teachers/{teacher_id}', key='detail',
+            on_done=self._fill_teacher,
+            on_error=lambda e: show_error("Error", e, "No se pudo cargar el maestro: ")
+        )
+
+    def _fill_teacher(self, data: Dict[str, Any]) -> None:
+        self.current_id = data['id']
         self.id_var.set(str(data['id']))
         self.name_var.set(data['name'])
         self.degree_var.set(data.get('degree', '')) 
@@ -229,36 +250,37 @@ class TeachersWindow(ttk.Frame):
         self.current_subjects = [subject['subjectId'] for subject in data.get('subjects', [])]
 
         if self.is_admin:
-            label = next((key for key, value in self.user_options.items() if value == data.get('userId')), data.get('email', ''))
-            if label not in self.user_options and data.get('userId'):
-                self.user_options[label] = data.get('userId')
-                self.email_combo.configure(values=list(self.user_options.keys()))
-            self.email_var.set(label)
+            # El usuario ya asignado no viene en la lista de disponibles: se agrega
+            if not self.email_model.select(data.get('userId') or None, data.get('email', '')):
+                self.email_var.set(data.get('email', ''))
         else:
             self.email_var.set(data.get('email', ''))
 
-        career_ids = [career['careerId'] for career in data.get('careers', [])]
-        self.careers_list.selection_clear(0, tk.END)
-        for index in range(self.careers_list.size()):
-            career_id_in_list = int(self.careers_list.get(index).split(' - ')[0])
-            if career_id_in_list in career_ids:
-                self.careers_list.selection_set(index)
+        self.current_careers = [career['careerId'] for career in data.get('careers', [])]
+        self._select_current_careers()
         
         self._refresh_subject_list()
 
     def _update_selected_subjects(self) -> None:
-        self.current_subjects = [
-            int(self.subjects_list.get(i).split(' - ')[0]) for i in self.subjects_list.curselection()
-        ]
+        self.current_subjects = self.subjects_model.selected_ids()
 
     def _load_self(self) -> None:
-        try:
-            data = self.api.get('/teachers/me')
-            self._load_teacher(data['id'])
-        except ApiError as e:
-            messagebox.showerror("Error", f"No se pudo cargar tu perfil: {e.message}")
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
+        def fetch() -> Dict[str, Any]:
+            me = self.api.get('/teachers/me')
+            return self.api.get(f"/teachers/{me['id']}")
+
+        # La ficha propia suele venir precargada por el warm-up tras el login
+        if self.session.profile:
+            self._fill_teacher(self.session.profile)
+        EXECUTOR.submit(
+            self, fetch, key='detail',
+            on_done=self._on_self_loaded,
+            on_error=lambda e: show_error("Error", e, "No se pudo cargar tu perfil: ")
+        )
+
+    def _on_self_loaded(self, data: Dict[str, Any]) -> None:
+        self.session.profile = data
+        self._fill_teacher(data)
 
     def _collect_payload(self) -> Dict[str, Any]:
         # Obtenemos los datos de la UI
@@ -288,20 +310,17 @@ class TeachersWindow(ttk.Frame):
         # --- El resto de la función sigue igual ---
 
         if self.is_admin:
-            email_label = self.email_var.get()
-            user_id = self.user_options.get(email_label)
-            
+            user_id = self.email_model.selected_id()
+
             if self.current_id is None and not user_id:
                 raise ValueError('Al crear un nuevo maestro, debes seleccionar un correo de usuario disponible.')
             if user_id:
                 payload['userId'] = user_id
 
-            career_ids = [int(self.careers_list.get(i).split(' - ')[0]) for i in self.careers_list.curselection()]
-            payload['careerIds'] = career_ids
+            payload['careerIds'] = self.careers_model.selected_ids()
             
         # Para todos (Admin y Maestro), las materias seleccionadas son las que se guardan
-        subject_ids = [int(self.subjects_list.get(i).split(' - ')[0]) for i in self.subjects_list.curselection()]
-        payload['subjectIds'] = subject_ids
+        payload['subjectIds'] = self.subjects_model.selected_ids()
 
         return payload
 
@@ -312,27 +331,27 @@ class TeachersWindow(ttk.Frame):
             messagebox.showwarning("Validación", str(error))
             return
 
-        try:
-            if self.current_id is None:
-                response = self.api.post('/teachers', payload)
-            else:
-                response = self.api.put(f"/teachers/{self.current_id}", payload)
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
-            return
+        if self.current_id is None:
+            EXECUTOR.submit(self, self.api.post, '/teachers', payload, on_done=self._on_saved, on_error=self._on_api_error)
+        else:
+            EXECUTOR.submit(self, self.api.put, f"/teachers/{self.current_id}", payload, on_done=self._on_saved, on_error=self._on_api_error)
 
+    def _on_saved(self, response: Dict[str, Any]) -> None:
         messagebox.showinfo("Éxito", "Maestro guardado")
+        # Aplicar la respuesta localmente en lugar de volver a descargar el catálogo
+        self.session.references.apply_saved('teachers', response)
         
         if self.is_admin:
             self._fetch_support_data() # Recarga usuarios no asignados
             self._load_teacher(response['id']) # Recarga el formulario
             self._load_teachers() # Recarga la tabla
+            schedule_revalidation(self, self._revalidate)
         else:
             self._load_teacher(response['id']) # Recarga su propio perfil
 
+    def _on_api_error(self, error: BaseException) -> None:
+        show_error("Error de API", error)
+
     def _delete(self) -> None:
         if not self.is_admin:
             messagebox.showwarning("Permiso", "Solo el administrador puede eliminar maestros")
@@ -343,20 +362,23 @@ class TeachersWindow(ttk.Frame):
         if not messagebox.askyesno("Eliminar", "¿Deseas eliminar el maestro?"):
             return
         
-        try:
-            self.api.delete(f"/teachers/{self.current_id}")
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
-            return
-        
+        EXECUTOR.submit(
+            self, self.api.delete, f"/teachers/{self.current_id}",
+            on_done=lambda _response, teacher_id=self.current_id: self._on_deleted(teacher_id), on_error=self._on_api_error
+        )
+
+    def _on_deleted(self, teacher_id: int) -> None:
         messagebox.showinfo("Éxito", "Maestro eliminado")
+        self.session.references.apply_deleted('teachers', teacher_id)
         self._reset()
         if self.is_admin:
             self._fetch_support_data()
             self._load_teachers()
+            schedule_revalidation(self, self._revalidate)
+
+    def _revalidate(self) -> None:
+        self.session.references.invalidate('teachers')
+        self._load_teachers()
 
     def _reset(self) -> None:
         self.current_id = None
@@ -367,6 +389,7 @@ class TeachersWindow(ttk.Frame):
         self.careers_list.selection_clear(0, tk.END)
         self.subjects_list.selection_clear(0, tk.END)
         self.current_subjects = []
+        self.current_careers = []
         if self.is_admin:
             self.tree.selection_remove(self.tree.selection())
             self._fetch_support_data() # Recargar usuarios por si se cancela una creación
\ No newline at end of file
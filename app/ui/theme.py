@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import tkinter as tk
+from dataclasses import dataclass
+from tkinter import TclError, ttk
+
+
+@dataclass(frozen=True)
+class Palette:
+    """Colores de la aplicación."""
+    bg: str = "#ecf0f1"
+    primary: str = "#3498db"
+    primary_active: str = "#2980b9"
+    danger: str = "#e74c3c"
+    danger_active: str = "#c0392b"
+    success: str = "#2ecc71"
+    warning: str = "#f39c12"
+    text_dark: str = "#2c3e50"
+    text_light: str = "#ffffff"
+    white: str = "#ffffff"
+    gray_border: str = "#bdc3c7"
+    sidenav: str = "#2c3e50"
+    sidenav_hover: str = "#34495e"
+
+
+PALETTE = Palette()
+FONT = 'Segoe UI'
+
+# Atributo de la raíz de Tk con su ``ttk.Style`` ya configurado. Se guarda en la
+# raíz misma (y no en un diccionario del módulo) para que muera con ella: el
+# estilo apunta a la raíz, así que una WeakKeyDictionary nunca la soltaría
+_STYLE_ATTRIBUTE = '_app_style'
+
+
+def ensure_theme(widget: tk.Misc) -> ttk.Style:
+    """Registra el tema y los estilos con nombre en la raíz de ``widget`` (una sola vez).
+
+    Reconfigurar un estilo hace que Tk vuelva a calcular el diseño de todos los
+    widgets que lo usan; por eso las ventanas sólo consumen los estilos por
+    nombre ('Content.TFrame', 'Primary.TButton', ...) y no los redefinen.
+    """
+    root = widget._root()
+    style = getattr(root, _STYLE_ATTRIBUTE, None)
+    if style is not None:
+        return style
+    style = ttk.Style(root)
+    _configure(style)
+    setattr(root, _STYLE_ATTRIBUTE, style)
+    return style
+
+
+def _configure(style: ttk.Style) -> None:
+    p = PALETTE
+    try:
+        style.theme_use('clam')
+    except TclError:
+        pass
+
+    # Menú lateral
+    style.configure(
+        'Sidenav.TButton',
+        font=(FONT, 11, 'bold'), padding=(20, 12), borderwidth=0, relief='flat',
+        background=p.sidenav, foreground=p.text_light
+    )
+    style.map(
+        'Sidenav.TButton',
+        background=[('active', p.sidenav_hover), ('pressed', p.sidenav_hover)],
+        foreground=[('!disabled', p.text_light)]
+    )
+
+    # Contenido de los módulos
+    style.configure('Content.TFrame', background=p.bg)
+    style.configure('Content.TLabel', background=p.bg, foreground=p.text_dark, font=(FONT, 10))
+    style.configure('Title.TLabel', background=p.bg, font=(FONT, 16, 'bold'))
+    style.configure('Form.TLabelframe', background=p.bg, relief="solid", borderwidth=1, bordercolor=p.gray_border)
+    style.configure('Form.TLabelframe.Label', background=p.bg, foreground=p.text_dark, font=(FONT, 12, 'bold'))
+    style.configure('Primary.TButton', font=(FONT, 10, 'bold'), background=p.primary, foreground=p.white)
+    style.map('Primary.TButton', background=[('active', p.primary_active), ('pressed', p.primary_active)])
+    style.configure('Danger.TButton', font=(FONT, 10, 'bold'), background=p.danger, foreground=p.white)
+    style.map('Danger.TButton', background=[('active', p.danger_active), ('pressed', p.danger_active)])
+    style.configure('TListbox', background=p.white, foreground=p.text_dark, borderwidth=1, relief='solid', fieldbackground=p.white)
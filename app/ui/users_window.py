@@ -2,11 +2,20 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import re  # <--- IMPORTADO PARA VALIDAR EMAIL
 
-from app.services.api_client import ApiClient, ApiError
+from app.config import CONFIG
+from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.mutations import apply_deleted, apply_saved, schedule_revalidation
+from app.services.search_index import SearchIndex
 from app.services.session import UserSession
+from app.ui.base_window import show_error
+from app.ui.page_loader import PageLoader
+from app.ui.table_loader import progress_text
+from app.ui.virtual_table import VirtualTable
+from app.ui.theme import ensure_theme
 # from app.ui.base_window import ModuleWindow # Ya no se usa
 
 # CAMBIO 1: Heredar de ttk.Frame
@@ -17,29 +26,14 @@ class UsersWindow(ttk.Frame):
         self.session = session
         self.is_admin = session.role == 'ADMIN'
         self.current_user_id: Optional[int] = None
+        self.users: List[Dict[str, Any]] = [] # Último listado mostrado en la tabla
         
         # Expresión regular para validar email
         self.EMAIL_REGEX = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
 
-        # --- MEJORA ESTÉTICA: Paleta de Colores ---
-        self.COLOR_BG = "#ecf0f1"
-        self.COLOR_PRIMARY = "#3498db"
-        self.COLOR_DANGER = "#e74c3c"
-        self.COLOR_TEXT_DARK = "#2c3e50"
-        self.COLOR_WHITE = "#ffffff"
-        self.COLOR_GRAY_BORDER = "#bdc3c7"
-
-        # --- MEJORA ESTÉTICA: Aplicar Estilos ---
-        self.style = ttk.Style(self)
-        self.style.configure('Content.TFrame', background=self.COLOR_BG)
+        # --- Estilos: compartidos, se registran una sola vez por raíz (app.ui.theme) ---
+        ensure_theme(self)
         self.configure(style='Content.TFrame')
-        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
-        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
-        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
-        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
-        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
-        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
-        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
 
         # CAMBIO 3: Layout directo en el frame
         self.pack(fill=tk.BOTH, expand=True)
@@ -47,7 +41,7 @@ class UsersWindow(ttk.Frame):
 
         # Título del Módulo
         title_text = "Gestión de Usuarios" if self.is_admin else "Mi Perfil de Usuario"
-        ttk.Label(self, text=title_text, font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
+        ttk.Label(self, text=title_text, style='Title.TLabel').grid(row=0, column=0, sticky="w", pady=(0, 15))
         
         row_offset = 1 # Para saber en qué fila empezar
         
@@ -66,14 +60,28 @@ class UsersWindow(ttk.Frame):
         else:
             self._load_self()
 
+    def refresh(self) -> None:
+        """Vuelve a pedir los datos del módulo (MainMenu lo llama al re-mostrarlo)."""
+        # El perfil propio no se recarga: pisaría lo que el usuario esté editando
+        if self.is_admin:
+            self._load_users()
+
     def _build_search(self, container: ttk.Frame) -> None:
         search_frame = ttk.Frame(container, style='Content.TFrame')
         search_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
-        ttk.Label(search_frame, text="Buscar por ID:", style='Content.TLabel').pack(side=tk.LEFT)
+        ttk.Label(search_frame, text="Buscar:", style='Content.TLabel').pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
-        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=15)
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
         search_entry.pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Buscar", command=self._search_by_id, style='Primary.TButton').pack(side=tk.LEFT)
+        ttk.Button(search_frame, text="Buscar por ID", command=self._search_by_id, style='Primary.TButton').pack(side=tk.LEFT)
+
+        # Filtro al escribir sobre email y usuario, sin ir al servidor
+        self.search_index = SearchIndex(('email', 'username'))
+        self._filter_job: Optional[str] = None
+        self.search_var.trace_add('write', lambda *_: self._schedule_filter())
+        # Aviso de resultados parciales mientras faltan páginas por cargar
+        self.search_hint = tk.StringVar()
+        ttk.Label(search_frame, textvariable=self.search_hint, style='Content.TLabel').pack(side=tk.LEFT, padx=10)
 
     def _build_tree(self, container: ttk.Frame) -> None:
         tree_container = ttk.Frame(container, style='Content.TFrame')
@@ -82,12 +90,13 @@ class UsersWindow(ttk.Frame):
         tree_container.columnconfigure(0, weight=1)
         
         columns = ("id", "email", "username", "role")
-        self.tree = ttk.Treeview(tree_container, columns=columns, show='headings', height=8)
-        self.tree.grid(row=0, column=0, sticky="nsew")
-        
-        scrollbar = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        # Tabla virtual: con miles de registros sólo se crean las filas visibles
+        self.table_status = tk.StringVar()
+        self.tree = VirtualTable(
+            tree_container, columns, height=8,
+            on_progress=lambda done, total: self.table_status.set(progress_text(done, total))
+        )
+        self.tree.grid(row=0, column=0, columnspan=2, sticky="nsew")
 
         self.tree.heading('id', text='ID'); self.tree.column('id', width=50, stretch=False)
         self.tree.heading('email', text='Email'); self.tree.column('email', width=250)
@@ -96,6 +105,12 @@ class UsersWindow(ttk.Frame):
         
         self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
 
+        ttk.Label(tree_container, textvariable=self.table_status, style='Content.TLabel').grid(row=1, column=0, sticky="w", pady=(4, 0))
+
+        # Los usuarios llegan por páginas; la siguiente se pide al acercarse al final
+        self.pager = PageLoader(self.tree, self._on_users_page, lambda e: show_error("Error de Carga", e))
+        self.tree.on_scroll = self.pager.on_scroll
+
     def _build_form(self, container: ttk.Frame, form_row: int) -> None:
         form = ttk.LabelFrame(container, text="Datos del usuario", style='Form.TLabelframe', padding=15)
         form.grid(row=form_row, column=0, pady=10, sticky="nsew")
@@ -165,13 +180,30 @@ class UsersWindow(ttk.Frame):
         if not value.isdigit():
             messagebox.showinfo("Buscar", "Ingresa un ID numérico válido para buscar.")
             return
-        try:
-            user = self.api.get(f"/users/{value}")
-            self._fill_form(user)
-        except ApiError as error:
-            messagebox.showerror("Error de Búsqueda", error.message)
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
+        EXECUTOR.submit(
+            self, self.api.get, f"/users/{value}", key='detail',
+            on_done=self._fill_form, on_error=lambda e: show_error("Error de Búsqueda", e)
+        )
+
+    def _schedule_filter(self) -> None:
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(CONFIG.search_debounce_ms, self._apply_filter)
+
+    def _apply_filter(self) -> None:
+        self._filter_job = None
+        query = self.search_var.get()
+        self.tree.set_filter(self.search_index.search(query))
+        if query.strip() and self.pager.has_more:
+            # El índice sólo tiene lo cargado: traer el resto para que la búsqueda lo vea
+            self.pager.load_rest()
+        self._update_search_hint()
+
+    def _update_search_hint(self) -> None:
+        partial = bool(self.search_var.get().strip()) and self.pager.has_more
+        self.search_hint.set(
+            f"Sólo entre los {len(self.users):,} usuarios cargados; cargando el resto..." if partial else ""
+        )
 
     def _on_tree_select(self, _event: tk.Event) -> None:
         if not self.is_admin: return
@@ -181,13 +213,10 @@ class UsersWindow(ttk.Frame):
         
         item = self.tree.item(selection[0])
         user_id = item['values'][0]
-        try:
-            user = self.api.get(f"/users/{user_id}")
-            self._fill_form(user)
-        except ApiError as error:
-            messagebox.showerror("Error", error.message)
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
+        EXECUTOR.submit(
+            self, self.api.get, f"/users/{user_id}", key='detail',
+            on_done=self._fill_form, on_error=lambda e: show_error("Error", e)
+        )
 
     def _fill_form(self, user: Dict[str, Any]) -> None:
         self.current_user_id = int(user.get('id'))
@@ -251,23 +280,27 @@ class UsersWindow(ttk.Frame):
             messagebox.showwarning("Validación", str(error))
             return
 
-        try:
-            if self.current_user_id is None:
-                user = self.api.post('/users', payload)
-            else:
-                user = self.api.put(f"/users/{self.current_user_id}", payload)
-                
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
-            return
+        if self.current_user_id is None:
+            EXECUTOR.submit(self, self.api.post, '/users', payload, on_done=self._on_saved, on_error=self._on_api_error)
+        else:
+            EXECUTOR.submit(self, self.api.put, f"/users/{self.current_user_id}", payload, on_done=self._on_saved, on_error=self._on_api_error)
 
+    def _on_saved(self, user: Dict[str, Any]) -> None:
         messagebox.showinfo("Éxito", "Usuario guardado correctamente")
         self._fill_form(user)
         if self.is_admin:
-            self._load_users()
+            # Aplicar la respuesta localmente en lugar de volver a descargar la lista
+            users = apply_saved(self.users, user)
+            if users is None:
+                self._load_users()
+            else:
+                # La fila guardada (fusionada con la respuesta); el resto del índice no cambia
+                self.search_index.upsert(row for row in users if row.get('id') == user.get('id'))
+                self._populate_users(users, reindex=False)
+                schedule_revalidation(self, self._load_users)
+
+    def _on_api_error(self, error: BaseException) -> None:
+        show_error("Error de API", error)
 
     def _delete_user(self) -> None:
         if not self.is_admin:
@@ -284,34 +317,51 @@ class UsersWindow(ttk.Frame):
         if not messagebox.askyesno("Eliminar", f"¿Deseas eliminar al usuario '{self.username_var.get()}'?"):
             return
             
-        try:
-            self.api.delete(f"/users/{self.current_user_id}")
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
-            return
-            
+        EXECUTOR.submit(
+            self, self.api.delete, f"/users/{self.current_user_id}",
+            on_done=lambda _response, user_id=self.current_user_id: self._on_deleted(user_id), on_error=self._on_api_error
+        )
+
+    def _on_deleted(self, user_id: int) -> None:
         messagebox.showinfo("Éxito", "Usuario eliminado")
         self._reset()
         if self.is_admin:
-            self._load_users()
+            self.search_index.remove([user_id])
+            self._populate_users(apply_deleted(self.users, user_id), reindex=False)
+            schedule_revalidation(self, self._load_users)
 
     def _load_users(self) -> None:
         if not self.is_admin: return
-        try:
-            users = self.api.get('/users')
-        except ApiError as error:
-            messagebox.showerror("Error de Carga", error.message)
-            return
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
-            return
-
-        self.tree.delete(*self.tree.get_children())
-        for user in users:
-            self.tree.insert('', tk.END, values=(user['id'], user['email'], user['username'], user['role']))
+        pages = self.api.paginate('/users')
+        # Pintar al instante la primera página guardada en disco y refrescar en segundo plano
+        cached = pages.peek_first()
+        if cached is not None:
+            self._populate_users(cached)
+        self.pager.start(pages)
+
+    def _on_users_page(self, page: List[Dict[str, Any]], first: bool, _has_more: bool) -> None:
+        if first:
+            self._populate_users(page)
+        else:
+            # Sólo la página nueva: lo ya cargado no se vuelve a indexar ni a pintar
+            page = [user for user in page if not self.tree.has_row(str(user['id']))]
+            self.users.extend(page)
+            self.search_index.upsert(page)
+            self.tree.set_filter(self.search_index.search(self.search_var.get()), refresh=False)
+            self.tree.append(page, self._user_values)
+        self._update_search_hint()
+
+    def _populate_users(self, users: List[Dict[str, Any]], reindex: bool = True) -> None:
+        """Muestra ``users``; con ``reindex=False`` el índice de búsqueda ya está al día."""
+        self.users = users
+        if reindex:
+            self.search_index.update(users)
+        self.tree.set_filter(self.search_index.search(self.search_var.get()), refresh=False)
+        self.tree.load(users, self._user_values)
+
+    @staticmethod
+    def _user_values(user: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (user['id'], user['email'], user['username'], user['role'])
 
     def _load_self(self) -> None:
         self.current_user_id = self.session.user.get('id')
@@ -319,14 +369,14 @@ class UsersWindow(ttk.Frame):
             messagebox.showerror("Error", "No se pudo obtener tu ID de sesión.")
             return
             
-        try:
-            user = self.api.get(f"/users/{self.current_user_id}")
-            self._fill_form(user)
-            self._reset_non_admin_fields() # Asegurar estado de campos
-        except ApiError as error:
-            messagebox.showerror("Error", error.message)
-        except Exception as error: 
-            messagebox.showerror("Error", str(error))
+        EXECUTOR.submit(
+            self, self.api.get, f"/users/{self.current_user_id}", key='detail',
+            on_done=self._fill_own_form, on_error=lambda e: show_error("Error", e)
+        )
+
+    def _fill_own_form(self, user: Dict[str, Any]) -> None:
+        self._fill_form(user)
+        self._reset_non_admin_fields() # Asegurar estado de campos
 
     def _reset_non_admin_fields(self) -> None:
         # Método helper para asegurar que los no-admin no puedan editar
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import sys
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.config import CONFIG
+from app.ui.table_loader import ProgressCallback, RowId, RowValues, TableLoader, default_row_id
+from app.ui.table_sort import TableSorter
+from app.ui.theme import ensure_theme
+
+# Alto aproximado (px) del encabezado del Treeview, para calcular las filas visibles
+_HEADING_HEIGHT = 25
+
+
+def _flatten(iids: Tuple[Any, ...]) -> List[str]:
+    # Igual que ttk.Treeview: acepta ids sueltos o una sola tupla/lista de ids
+    if len(iids) == 1 and isinstance(iids[0], (tuple, list)):
+        iids = tuple(iids[0])
+    return [str(iid) for iid in iids]
+
+
+class VirtualTable(ttk.Frame):
+    """Tabla para listas muy grandes que sólo crea las filas visibles.
+
+    El conjunto completo vive en un modelo compacto del lado de Python (ids y
+    tuplas de valores). Por debajo de ``threshold`` filas se comporta como un
+    Treeview normal llenado con ``TableLoader``; por encima, el Treeview interno
+    sólo contiene la ventana visible más ``overscan`` filas por lado y la barra
+    de desplazamiento se maneja contra el modelo.
+
+    ``set_filter`` limita las filas mostradas a un conjunto de ids (búsqueda)
+    sin tocar el modelo completo. Los encabezados ordenan la tabla
+    (``TableSorter``): se reordena el modelo, no se recrean las filas.
+
+    Expone lo que usan las ventanas de un ``ttk.Treeview``: ``heading``,
+    ``column``, ``selection``, ``item`` y el evento ``<<TreeviewSelect>>``
+    (generado sobre este frame sólo cuando cambia la selección del usuario).
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        columns: Sequence[str],
+        *,
+        height: int = 10,
+        threshold: Optional[int] = None,
+        overscan: int = 10,
+        on_progress: Optional[ProgressCallback] = None,
+        on_scroll: Optional[Callable[[float, float], None]] = None,
+        style: str = 'Content.TFrame',
+    ) -> None:
+        super().__init__(master, style=style)
+        self.threshold = CONFIG.virtual_table_threshold if threshold is None else threshold
+        self.overscan = overscan
+        # Recibe (primero, último) visibles como fracción, p. ej. para paginar
+        self.on_scroll = on_scroll
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=height)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.loader = TableLoader(self.tree, on_progress=on_progress, on_done=self._sync_selection)
+        self.sorter = TableSorter(self.tree, self._resort)
+
+        # Modelo completo: ids (iid del Treeview) y valores por fila, en el orden de los datos
+        self._all_ids: List[str] = []
+        self._all_values: List[Tuple[Any, ...]] = []
+        self._all_index: Dict[str, int] = {}
+        # Orden de la tabla (igual a _all_ids mientras no se ordene por columna)
+        self._order: List[str] = []
+        self._order_index: Dict[str, int] = {}
+        self._filter: Optional[Set[str]] = None
+        # Lo que se muestra: el modelo completo o sólo los ids que pasan el filtro.
+        # La posición de cada id en la vista se calcula sólo cuando hace falta.
+        self._ids: List[str] = []
+        self._view_index: Optional[Dict[str, int]] = None
+        # Filtro con el que se armó _ids (mientras el modelo no cambie): si el
+        # siguiente es un subconjunto (una letra más), basta con filtrar _ids
+        self._ids_filter: Optional[Set[str]] = None
+        self._selected: List[str] = []
+        self._top = 0
+        self._slice = (0, 0)
+        self._visible_rows = height
+        # Alto de fila del tema: se lee una vez y de nuevo sólo si cambia el tema
+        self._row_height = self._read_row_height()
+        self.virtual = False
+
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<<ThemeChanged>>', self._on_theme_changed, add='+')
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self._on_wheel)
+        for sequence in ('<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>'):
+            self.tree.bind(sequence, self._on_key)
+        self._use_native_scroll()
+
+    # --- API tipo Treeview ---
+    def heading(self, column: str, option: Optional[str] = None, **kwargs: Any) -> Any:
+        return self.tree.heading(column, option, **kwargs)
+
+    def column(self, column: str, **kwargs: Any) -> Any:
+        return self.tree.column(column, **kwargs)
+
+    def selection(self) -> Tuple[str, ...]:
+        return tuple(self._selected)
+
+    def item(self, iid: str) -> Dict[str, Any]:
+        return {'values': list(self._all_values[self._all_index[iid]])}
+
+    def get_children(self) -> Tuple[str, ...]:
+        return tuple(self._ids)
+
+    def selection_set(self, *iids: Any) -> None:
+        self._selected = [iid for iid in _flatten(iids) if iid in self._all_index and self._visible(iid)]
+        self._sync_selection()
+
+    def selection_remove(self, *iids: Any) -> None:
+        removed = set(_flatten(iids))
+        self._selected = [iid for iid in self._selected if iid not in removed]
+        self._sync_selection()
+
+    def see(self, iid: str) -> None:
+        position = self._index.get(iid)
+        if position is None:
+            return
+        if not self.virtual:
+            self.tree.see(iid)
+            return
+        if position < self._top:
+            self._scroll_to(position)
+        elif position >= self._top + self._visible_rows:
+            self._scroll_to(position - self._visible_rows + 1)
+
+    def load(self, rows: Sequence[Any], values: RowValues, row_id: RowId = default_row_id) -> None:
+        """Reemplaza el contenido (respetando el filtro activo)."""
+        # Ids internados, como los de SearchIndex: filtrar compara punteros
+        self._all_ids = [sys.intern(str(row_id(row))) for row in rows]
+        self._all_values = [tuple(values(row)) for row in rows]
+        self._all_index = {iid: position for position, iid in enumerate(self._all_ids)}
+        self._apply_sort()
+        self._show()
+
+    def append(self, rows: Sequence[Any], values: RowValues, row_id: RowId = default_row_id) -> None:
+        """Agrega ``rows`` al final del modelo (otra página) sin recalcular las filas ya cargadas.
+
+        Se omiten las que ya están (p. ej. creadas localmente).
+        """
+        ids, all_values, index = self._all_ids, self._all_values, self._all_index
+        added = False
+        for row in rows:
+            iid = sys.intern(str(row_id(row)))
+            if iid in index:
+                continue
+            index[iid] = len(ids)
+            ids.append(iid)
+            all_values.append(tuple(values(row)))
+            added = True
+        if not added:
+            return
+        self._ids_filter = None
+        # Sin orden por columna _order y _order_index son el mismo modelo: ya crecieron
+        if self.sorter.active:
+            self._apply_sort()
+        self._show()
+
+    def has_row(self, iid: str) -> bool:
+        return iid in self._all_index
+
+    def set_filter(self, ids: Optional[Set[str]], refresh: bool = True) -> None:
+        """Muestra sólo las filas cuyo id está en ``ids``; ``None`` las muestra todas.
+
+        Con ``refresh=False`` sólo se guarda el filtro para el próximo ``load``.
+        """
+        self._filter = ids
+        if refresh:
+            self._top = 0
+            self._show()
+
+    def _show(self) -> None:
+        """Aplica el filtro al modelo y decide si virtualizar según el número de filas."""
+        if self._filter is None:
+            self._ids, self._view_index = self._order, self._order_index
+            self._ids_filter = None
+        else:
+            keep, previous = self._filter, self._ids_filter
+            source = self._order
+            if previous is not None and len(keep) <= len(previous) and keep <= previous:
+                # La búsqueda se afinó: las filas que quedan están entre las que ya se mostraban
+                source = self._ids
+            if len(keep) * 8 < len(source):
+                # Pocas coincidencias: ordenarlas es más barato que recorrer todo el modelo
+                position = self._order_index.get
+                self._ids = sorted((iid for iid in keep if iid in self._order_index), key=position)
+            else:
+                # filter() con el __contains__ del conjunto recorre el orden sin pasar por bytecode
+                self._ids = list(filter(keep.__contains__, source))
+            self._ids_filter = keep
+            self._view_index = None
+        self._selected = [iid for iid in self._selected if iid in self._all_index and self._visible(iid)]
+        self.virtual = len(self._ids) > self.threshold
+
+        if not self.virtual:
+            self._slice = (0, 0)
+            self._use_native_scroll()
+            positions = range(len(self._ids))
+            self.loader.reconcile(positions, self._values_at, self._ids.__getitem__)
+            self._sync_selection()
+            return
+
+        self.loader.clear()  # El tramo visible lo maneja _render
+        self.tree.configure(yscrollcommand='')
+        self.scrollbar.configure(command=self._on_scrollbar)
+        self._slice = (0, 0)
+        self._scroll_to(min(self._top, max(0, len(self._ids) - self._visible_rows)))
+        if self.loader.on_progress is not None:
+            self.loader.on_progress(len(self._ids), len(self._ids))
+
+    # --- Internos ---
+    def _apply_sort(self) -> None:
+        self._ids_filter = None
+        if not self.sorter.active:
+            self._order, self._order_index = self._all_ids, self._all_index
+            return
+        values = self._all_values
+        entries = self.sorter.sort([(iid, values[position]) for position, iid in enumerate(self._all_ids)])
+        self._order = [iid for iid, _values in entries]
+        self._order_index = {iid: position for position, iid in enumerate(self._order)}
+
+    def _resort(self) -> None:
+        self._apply_sort()
+        self._top = 0
+        self._show()
+        if self._selected:
+            self.see(self._selected[0])
+
+    def _values_at(self, position: int) -> Tuple[Any, ...]:
+        return self._all_values[self._all_index[self._ids[position]]]
+
+    def _visible(self, iid: str) -> bool:
+        return self._filter is None or iid in self._filter
+
+    @property
+    def _index(self) -> Dict[str, int]:
+        """Posición de cada id en la vista (filtrada), construida al primer uso."""
+        if self._view_index is None:
+            self._view_index = {iid: position for position, iid in enumerate(self._ids)}
+        return self._view_index
+
+    def _use_native_scroll(self) -> None:
+        self.scrollbar.configure(command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._set_scrollbar)
+
+    def _set_scrollbar(self, first: Any, last: Any) -> None:
+        self.scrollbar.set(first, last)
+        if self.on_scroll is not None:
+            self.on_scroll(float(first), float(last))
+
+    def _scroll_to(self, top: int) -> None:
+        total = len(self._ids)
+        top = max(0, min(top, total - self._visible_rows))
+        self._top = top
+        start, end = self._slice
+        if not (start <= top and top + self._visible_rows <= end):
+            self._render(top)
+        start, end = self._slice
+        if end > start:
+            # Colocar la fila 'top' arriba dentro del tramo materializado
+            self.tree.yview_moveto((top - start + 0.25) / (end - start))
+        if total:
+            self._set_scrollbar(top / total, min(1.0, (top + self._visible_rows) / total))
+        else:
+            self._set_scrollbar(0.0, 1.0)
+
+    def _render(self, top: int) -> None:
+        start = max(0, top - self.overscan)
+        end = min(len(self._ids), top + self._visible_rows + self.overscan)
+        tree = self.tree
+        tree.delete(*tree.get_children())
+        for position in range(start, end):
+            tree.insert('', tk.END, iid=self._ids[position], values=self._values_at(position))
+        self._slice = (start, end)
+        self._sync_selection()
+
+    def _sync_selection(self) -> None:
+        shown = [iid for iid in self._selected if self.tree.exists(iid)]
+        if list(self.tree.selection()) != shown:
+            self.tree.selection_set(shown)
+
+    def _on_tree_select(self, _event: tk.Event) -> None:
+        current = list(self.tree.selection())
+        shown = [iid for iid in self._selected if self.tree.exists(iid)]
+        if current == shown:
+            return  # Eco de una resincronización al redibujar, no un cambio del usuario
+        self._selected = current
+        self.event_generate('<<TreeviewSelect>>')
+
+    def _read_row_height(self) -> int:
+        return int(ensure_theme(self).lookup('Treeview', 'rowheight') or 20)
+
+    def _on_theme_changed(self, _event: tk.Event) -> None:
+        self._row_height = self._read_row_height()
+
+    def _on_configure(self, event: tk.Event) -> None:
+        self._visible_rows = max(1, (event.height - _HEADING_HEIGHT) // self._row_height)
+        if self.virtual:
+            self._slice = (0, 0)
+            self._scroll_to(self._top)
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        if action == 'moveto':
+            self._scroll_to(int(float(amount) * len(self._ids)))
+        elif action == 'scroll':
+            step = self._visible_rows if unit == 'pages' else 1
+            self._scroll_to(self._top + int(amount) * step)
+
+    def _on_wheel(self, event: tk.Event) -> Optional[str]:
+        if not self.virtual:
+            return None
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self._scroll_to(self._top - 3)
+        else:
+            self._scroll_to(self._top + 3)
+        return 'break'
+
+    def _on_key(self, event: tk.Event) -> Optional[str]:
+        if not self.virtual or not self._ids:
+            return None
+        current = self._index.get(self._selected[0], self._top) if self._selected else self._top - 1
+        moves = {
+            'Up': current - 1, 'Down': current + 1,
+            'Prior': current - self._visible_rows, 'Next': current + self._visible_rows,
+            'Home': 0, 'End': len(self._ids) - 1,
+        }
+        target = max(0, min(moves.get(event.keysym, current), len(self._ids) - 1))
+        iid = self._ids[target]
+        self.see(iid)
+        if self._selected != [iid]:
+            self.selection_set(iid)
+            self.event_generate('<<TreeviewSelect>>')
+        return 'break'
@@ -0,0 +1,38 @@
+"""Servidor HTTP local con keep-alive para los benchmarks del cliente."""
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Tuple
+
+
+def _default_body(_path: str) -> bytes:
+    return json.dumps([{"id": i, "name": f"Carrera {i}", "semesters": 9} for i in range(20)]).encode()
+
+
+def start_server(body_for: Optional[Callable[[str], bytes]] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """Levanta un servidor en un puerto libre y devuelve (servidor, url_base)."""
+    body_for = body_for or _default_body
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Necesario para conexiones keep-alive
+        disable_nagle_algorithm = True  # Evita el retraso de 40 ms por ACK diferido
+
+        def do_GET(self) -> None:  # noqa: N802
+            body = body_for(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args) -> None:  # Silenciar la salida estándar
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
@@ -0,0 +1,75 @@
+"""Compara la latencia por llamada con y sin el pool keep-alive de ApiClient.
+
+Uso:
+    python -m benchmarks.bench_connection_pool [--calls 200] [--url URL --path /careers]
+
+Sin ``--url`` se usa un servidor local; con ``--url`` se mide contra el servidor
+real (requiere que el endpoint no pida autenticación o pasar ``--token``).
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+import requests
+
+from app.services.api_client import ApiClient
+from benchmarks._server import start_server
+
+
+def _measure(call: Callable[[], object], calls: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<22} media={statistics.mean(samples):7.2f} ms  "
+          f"p50={statistics.median(samples):7.2f} ms  p95={p95:7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--url", help="URL base del servidor (por defecto, uno local)")
+    parser.add_argument("--path", default="/careers")
+    parser.add_argument("--token")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server, base_url = start_server()
+
+    headers = {"Accept": "application/json"}
+    if args.token:
+        headers["Authorization"] = f"Bearer {args.token}"
+
+    def unpooled() -> object:
+        # Comportamiento anterior: una conexión nueva en cada llamada
+        response = requests.request("GET", f"{base_url}{args.path}", headers=headers, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    client = ApiClient(base_url)
+    client.set_token(args.token)
+
+    try:
+        unpooled(); client.get(args.path)  # Calentamiento
+        _report("sin pool (requests)", _measure(unpooled, args.calls))
+        _report("con pool (ApiClient)", _measure(lambda: client.get(args.path), args.calls))
+    finally:
+        client.close()
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Compara los decodificadores JSON con una respuesta grande de alumnos.
+
+Uso:
+    python -m benchmarks.bench_json_decode [--mb 50] [--repeat 3] [--chunk-kb 64]
+
+Arma un arreglo JSON de ``--mb`` MB con filas parecidas a las de ``/students`` y
+mide, para cada decodificador instalado (``json`` siempre; ``orjson`` si está),
+el tiempo de decodificar el cuerpo completo (lo que hace ``ApiClient.request``)
+y el de ``iter_array`` leyéndolo en trozos de ``--chunk-kb`` KB (lo que hace
+``ApiClient.stream``). En una segunda pasada con ``tracemalloc`` reporta el pico
+de memoria: el modo completo necesita el cuerpo entero y todos los objetos a la
+vez; el de flujo sólo el trozo pendiente y las filas que aún no se entregaron.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator, List, Tuple
+
+from app.services.json_codec import DECODERS, JsonDecoder, iter_array
+
+_FIRST = ['José', 'María', 'Ana', 'Luis', 'Carmen', 'Jorge', 'Lucía', 'Pedro', 'Sofía', 'Raúl']
+_LAST = ['Gómez', 'Pérez', 'Hernández', 'López', 'Martínez', 'Sánchez', 'Ramírez', 'Torres', 'Flores', 'Núñez']
+_MB = 1024 * 1024
+
+
+def _payload(megabytes: float) -> Tuple[bytes, int]:
+    rnd = random.Random(42)
+    target = int(megabytes * _MB)
+    parts: List[bytes] = []
+    size = 0
+    row_id = 0
+    while size < target:
+        row_id += 1
+        row = {
+            'id': row_id,
+            'name': f"{rnd.choice(_FIRST)} {rnd.choice(_LAST)} {rnd.choice(_LAST)}",
+            'email': f"alumno{row_id}@escuela.edu.mx",
+            'status': rnd.choice(['ACTIVE', 'INACTIVE']),
+            'dateOfBirth': f"{rnd.randint(1990, 2006)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+            'careerId': rnd.randint(1, 40),
+            'subjects': [{'subjectId': rnd.randint(1, 400), 'grade': round(rnd.uniform(5, 10), 1)} for _ in range(3)],
+        }
+        part = json.dumps(row, ensure_ascii=False).encode()
+        parts.append(part)
+        size += len(part) + 1
+    return b'[' + b','.join(parts) + b']', row_id
+
+
+def _chunks(payload: bytes, size: int) -> Iterator[bytes]:
+    view = memoryview(payload)
+    for start in range(0, len(payload), size):
+        yield bytes(view[start:start + size])  # Como iter_content: un bytes nuevo por trozo
+
+
+def _time(call: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _peak_mb(call: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1] / _MB
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    parser.add_argument("--batch", type=int, default=200, help="Filas por lote entregado en modo flujo")
+    args = parser.parse_args()
+
+    payload, rows = _payload(args.mb)
+    chunk_size = args.chunk_kb * 1024
+    print(f"cuerpo: {len(payload) / _MB:.1f} MB, {rows:,} filas, trozos de {args.chunk_kb} KB")
+
+    decoders: List[JsonDecoder] = []
+    for factory in DECODERS.values():
+        try:
+            decoders.append(factory())
+        except ImportError:
+            continue
+
+    def full(decoder: JsonDecoder) -> Callable[[], Any]:
+        # El cuerpo se arma desde los trozos, como response.content
+        return lambda: decoder.loads(b''.join(_chunks(payload, chunk_size)))
+
+    def streamed() -> None:
+        batch: List[Any] = []
+        for row in iter_array(_chunks(payload, chunk_size)):
+            batch.append(row)
+            if len(batch) == args.batch:
+                batch = []  # Entregado a la tabla
+
+    results = [(f"completo/{decoder.name}", full(decoder)) for decoder in decoders]
+    results.append(("flujo/iter_array", streamed))
+    for label, call in results:
+        elapsed = _time(call, args.repeat)
+        peak = _peak_mb(call)
+        print(f"{label:<18} {elapsed:9.1f} ms  {len(payload) / _MB / (elapsed / 1000):7.1f} MB/s  "
+              f"pico de memoria={peak:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
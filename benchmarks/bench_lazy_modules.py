@@ -0,0 +1,67 @@
+"""Mide cuánto arranque ahorra importar las ventanas de los módulos bajo demanda.
+
+Uso:
+    python -m benchmarks.bench_lazy_modules [--runs 15]
+
+Cada medición corre en un intérprete nuevo (imports en frío). Para cada rol
+compara importar el menú junto con las ocho ventanas (el comportamiento
+anterior) contra importar sólo el menú, y reporta lo que cuesta después el
+primer clic en las ventanas del rol si aún no se preimportaron.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List
+
+from app.ui.main_menu import ROLE_SECTIONS
+
+_SNIPPET = """
+import time
+start = time.perf_counter()
+import app.ui.main_menu
+menu = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+end = time.perf_counter()
+print((menu - start) * 1000, (end - menu) * 1000)
+"""
+
+
+def _modules(role: str) -> List[str]:
+    return sorted({path.partition(':')[0] for path in ROLE_SECTIONS[role].values()})
+
+
+def _measure(modules: List[str], runs: int) -> List[float]:
+    menu, extra = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _SNIPPET.format(modules=modules)],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        menu.append(float(output[0]))
+        extra.append(float(output[1]))
+    return [statistics.median(menu), statistics.median(extra)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    all_modules = _modules('ADMIN')
+    menu_ms, eager_extra = _measure(all_modules, args.runs)
+    eager = menu_ms + eager_extra
+    print(f"menú sin ventanas: {menu_ms:7.1f} ms   menú + 8 ventanas (antes): {eager:7.1f} ms")
+    for role in ROLE_SECTIONS:
+        _menu, first_click = _measure(_modules(role), args.runs)
+        # Neto: lo que nunca se importa porque el rol no puede abrir esas ventanas
+        print(f"{role:<8} ahorro al arrancar={eager - menu_ms:6.1f} ms  "
+              f"primer clic sin preimportar={first_click:6.1f} ms  "
+              f"ahorro neto={eager - menu_ms - first_click:6.1f} ms ({len(_modules(role))} ventanas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Mide el filtrado al escribir de las tablas con una lista sintética grande.
+
+Uso:
+    python -m benchmarks.bench_search_index [--rows 100000] [--repeat 20]
+
+Reporta el costo de construir el índice y de actualizarlo tras cambiar una
+fila (``update`` sobre toda la lista, como una recarga, y ``upsert``/``remove``,
+como un guardado o un borrado), incluida la primera búsqueda después, que es
+la que agrega los tokens nuevos al vocabulario.
+
+Luego simula a alguien escribiendo: por cada tecla mide la búsqueda más
+``VirtualTable.set_filter``, es decir, lo que corre en el hilo de Tk: filtrar
+el orden de la tabla y redibujar el tramo visible. Con pantalla se usa un
+``VirtualTable`` real en una ventana oculta; sin ella, el mismo código con un
+Treeview de mentira (sólo se omite el costo de Tk al insertar las filas
+visibles). El objetivo es que cada tecla quede por debajo de un cuadro (16 ms).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services.search_index import SearchIndex
+from app.ui.virtual_table import VirtualTable
+
+_FIRST = ['José', 'María', 'Ana', 'Luis', 'Carmen', 'Jorge', 'Lucía', 'Pedro', 'Sofía', 'Raúl']
+_LAST = ['Gómez', 'Pérez', 'Hernández', 'López', 'Martínez', 'Sánchez', 'Ramírez', 'Torres', 'Flores', 'Núñez']
+# Secuencias de teclas: cada consulta es lo escrito hasta ese momento
+_TYPING = ['mart', 'jo', 'hernandez', 'lopez ana', 'sofia torres', 'alumno12345', 'zzz']
+_COLUMNS = ('id', 'name', 'email')
+_FRAME_MS = 16.0
+
+
+def _rows(count: int) -> List[Dict[str, Any]]:
+    rnd = random.Random(42)
+    rows = []
+    for row_id in range(1, count + 1):
+        first, last = rnd.choice(_FIRST), rnd.choice(_LAST)
+        rows.append({
+            'id': row_id,
+            'name': f"{first} {last} {rnd.choice(_LAST)}",
+            'email': f"alumno{row_id}@escuela.edu.mx",
+        })
+    return rows
+
+
+def _time(call: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> float:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+class _StubTree:
+    """Lo que ``VirtualTable`` le pide al Treeview en modo virtual, sin Tk."""
+
+    def __init__(self) -> None:
+        self.items: List[str] = []
+
+    def get_children(self, _item: str = '') -> Tuple[str, ...]:
+        return tuple(self.items)
+
+    def delete(self, *iids: str) -> None:
+        self.items = []
+
+    def insert(self, _parent: str, _index: Any, iid: str, values: Sequence[Any]) -> None:
+        self.items.append(iid)
+
+    def exists(self, iid: str) -> bool:
+        return False
+
+    def selection(self) -> Tuple[str, ...]:
+        return ()
+
+    def selection_set(self, *_iids: Any) -> None:
+        pass
+
+    def yview(self, *_args: Any) -> None:
+        pass
+
+    def yview_moveto(self, _fraction: float) -> None:
+        pass
+
+    def configure(self, **_options: Any) -> None:
+        pass
+
+
+class _StubScrollbar:
+    def set(self, _first: Any, _last: Any) -> None:
+        pass
+
+    def configure(self, **_options: Any) -> None:
+        pass
+
+
+class _StubLoader:
+    on_progress = None
+
+    def clear(self) -> None:
+        pass
+
+    def reconcile(self, rows: Sequence[Any], values: Callable[[Any], Any], row_id: Callable[[Any], Any]) -> None:
+        # TableLoader arma los valores de cada fila antes de insertarlas por lotes
+        for row in rows:
+            values(row)
+            row_id(row)
+
+
+class _StubSorter:
+    active = False
+
+
+class _HeadlessTable(VirtualTable):
+    """``VirtualTable`` sin ventana: mismo modelo, filtro y tramo visible."""
+
+    def __init__(self, visible_rows: int = 30) -> None:  # noqa: D107 - no llama a ttk.Frame
+        self.threshold = 2000
+        self.overscan = 10
+        self.on_scroll = None
+        self.tree, self.scrollbar = _StubTree(), _StubScrollbar()
+        self.loader, self.sorter = _StubLoader(), _StubSorter()
+        self._all_ids, self._all_values, self._all_index = [], [], {}
+        self._order, self._order_index = [], {}
+        self._filter = None
+        self._ids, self._view_index, self._ids_filter = [], None, None
+        self._selected = []
+        self._top, self._slice, self._visible_rows = 0, (0, 0), visible_rows
+        self.virtual = False
+
+
+def _make_table() -> Tuple[VirtualTable, Callable[[], None], str]:
+    """Tabla real en una ventana oculta si hay pantalla; si no, la versión sin Tk."""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return _HeadlessTable(), lambda: None, "sin pantalla: Treeview simulado"
+    root.withdraw()
+    table = VirtualTable(root, _COLUMNS, height=30)
+    table.pack()
+    return table, root.update_idletasks, "VirtualTable real (ventana oculta)"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    index = SearchIndex(('name', 'email'))
+    build = _time(lambda: (index.update(rows), index.search('a')), 1)
+    print(f"{args.rows:,} filas  construir={build:8.1f} ms")
+
+    middle = len(rows) // 2
+    counter = iter(range(10 ** 9))
+
+    def change_one() -> None:
+        # Un token nuevo en cada vuelta: obliga a sumarlo al vocabulario
+        rows[middle] = dict(rows[middle], name=f"Nombre Cambiado{next(counter)}")
+
+    full = _time(lambda: (index.update(rows), index.search('nombre')), args.repeat, change_one)
+    upsert = _time(lambda: (index.upsert([rows[middle]]), index.search('nombre')), args.repeat, change_one)
+    removed = iter(rows[1:args.repeat + 1])
+    remove = _time(lambda: (index.remove([next(removed)['id']]), index.search('nombre')), args.repeat)
+    print(f"{'1 fila: update (todo)':<26} p50={full:8.2f} ms")
+    print(f"{'1 fila: upsert':<26} p50={upsert:8.2f} ms")
+    print(f"{'1 fila: remove':<26} p50={remove:8.2f} ms")
+    index.update(rows)
+
+    table, flush, kind = _make_table()
+    table.load(rows, lambda row: (row['id'], row['name'], row['email']))
+    print(f"tabla: {kind}")
+
+    worst = 0.0
+    for query in _TYPING:
+        per_key: List[float] = []
+        matches = 0
+        for length in range(1, len(query) + 1):
+            typed = query[:length]
+
+            def keystroke() -> None:
+                table.set_filter(index.search(typed))
+                flush()
+
+            def reset() -> None:
+                # Cada repetición parte de lo que había antes de esta tecla
+                table.set_filter(index.search(query[:length - 1]) if length > 1 else None)
+
+            per_key.append(_time(keystroke, args.repeat, reset))
+            table.set_filter(index.search(typed))
+            matches = len(table.get_children())
+        worst = max(worst, max(per_key))
+        print(f"{query!r:<26} peor tecla p50={max(per_key):8.2f} ms  última={per_key[-1]:8.2f} ms  "
+              f"coincidencias={matches:,}")
+        table.set_filter(None)
+    verdict = "OK" if worst < _FRAME_MS else "SOBRE EL PRESUPUESTO"
+    print(f"peor tecla: {worst:.2f} ms (presupuesto {_FRAME_MS:.0f} ms) {verdict}")
+
+
+if __name__ == "__main__":
+    main()
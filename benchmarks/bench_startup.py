@@ -0,0 +1,138 @@
+"""Perfil del arranque en frío: de ``python main.py`` a la pantalla de login lista.
+
+Uso:
+    python -m benchmarks.bench_startup [--runs 10] [--budget-ms 1000] [--report startup.json]
+
+Cada corrida lanza ``main.py`` en un intérprete nuevo con ``-X importtime`` y
+``STARTUP_PROFILE`` (la app guarda sus fases y se cierra sola al mostrar el
+login). Sin ``DISPLAY`` se levanta un Xvfb temporal. Se reportan las medianas
+por fase, el tiempo total de pared y los imports más caros. El proceso termina
+con código 1 si la mediana total supera ``--budget-ms``
+(``STARTUP_BUDGET_MS``, 1000 por omisión).
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@contextlib.contextmanager
+def headless_display() -> Iterator[Optional[str]]:
+    """Usa el ``DISPLAY`` actual o levanta un Xvfb mientras dure el bloque."""
+    if os.environ.get("DISPLAY"):
+        yield os.environ["DISPLAY"]
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise SystemExit("No hay DISPLAY ni Xvfb: instala xvfb para medir sin pantalla")
+    number = 90 + os.getpid() % 100
+    process = subprocess.Popen(
+        [xvfb, f":{number}", "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    socket = Path(f"/tmp/.X11-unix/X{number}")
+    try:
+        deadline = time.monotonic() + 5
+        while not socket.exists():
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise SystemExit("No se pudo iniciar Xvfb")
+            time.sleep(0.05)
+        yield f":{number}"
+    finally:
+        process.terminate()
+        process.wait(timeout=5)
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Tiempo acumulado (ms) por módulo según la salida de ``-X importtime``."""
+    result: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line[len("import time:"):].split("|")
+        result[name.strip()] = int(cumulative) / 1000
+    return result
+
+
+def run_once(display: Optional[str]) -> Tuple[float, Dict[str, float], Dict[str, float]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "startup.json"
+        env = dict(os.environ, STARTUP_PROFILE=str(report))
+        if display:
+            env["DISPLAY"] = display
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "main.py"],
+            cwd=ROOT, env=env, capture_output=True, text=True, timeout=60,
+        )
+        wall = (time.perf_counter() - start) * 1000
+        if completed.returncode != 0 or not report.exists():
+            raise SystemExit(f"main.py falló (código {completed.returncode}):\n{completed.stderr[-2000:]}")
+        phases = json.loads(report.read_text(encoding="utf-8"))["phases"]
+    return wall, phases, parse_importtime(completed.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "1000")))
+    parser.add_argument("--report", help="Guardar el informe en JSON en esta ruta")
+    parser.add_argument("--top", type=int, default=12, help="Imports más caros a mostrar")
+    args = parser.parse_args()
+
+    walls: List[float] = []
+    phases: Dict[str, List[float]] = defaultdict(list)
+    imports: Dict[str, List[float]] = defaultdict(list)
+    with headless_display() as display:
+        for _ in range(args.runs):
+            wall, run_phases, run_imports = run_once(display)
+            walls.append(wall)
+            for name, elapsed in run_phases.items():
+                phases[name].append(elapsed)
+            for name, elapsed in run_imports.items():
+                imports[name].append(elapsed)
+
+    total = statistics.median(walls)
+    phase_medians = {name: statistics.median(values) for name, values in phases.items()}
+    import_medians = sorted(
+        ((name, statistics.median(values)) for name, values in imports.items()),
+        key=lambda item: item[1], reverse=True,
+    )[:args.top]
+
+    print(f"{args.runs} corridas  total (pared, mediana)={total:7.1f} ms  presupuesto={args.budget_ms:.0f} ms")
+    for name, elapsed in phase_medians.items():
+        print(f"  fase {name:<12} {elapsed:8.1f} ms")
+    print("  imports más caros (acumulado):")
+    for name, elapsed in import_medians:
+        print(f"    {name:<40} {elapsed:8.1f} ms")
+
+    if args.report:
+        Path(args.report).write_text(json.dumps({
+            "runs": args.runs,
+            "budget_ms": args.budget_ms,
+            "total_ms": total,
+            "wall_ms": walls,
+            "phases_ms": phase_medians,
+            "imports_ms": dict(import_medians),
+        }, indent=2), encoding="utf-8")
+
+    if total > args.budget_ms:
+        print(f"SOBRE EL PRESUPUESTO por {total - args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compara construir módulos redefiniendo los estilos en cada uno contra el tema compartido.
+
+Uso:
+    python -m benchmarks.bench_theme [--modules 40]
+
+Construye ``--modules`` frames parecidos a un módulo (título, tabla, formulario
+y botones) dentro de la misma raíz, como cuando se navega por el menú con la
+caché de frames: los anteriores siguen vivos. En el modo "antes" cada frame
+crea su ``ttk.Style`` y reconfigura los mismos estilos, lo que hace que Tk
+recalcule todos los widgets existentes; en el modo "tema" sólo usa los
+estilos por nombre. Sin ``DISPLAY`` se levanta un Xvfb temporal.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List
+
+from app.ui.theme import PALETTE, ensure_theme
+from benchmarks.bench_startup import headless_display
+
+
+def _legacy_styles(frame: ttk.Frame) -> None:
+    # Lo que hacía cada ventana en su __init__ antes del tema compartido
+    p = PALETTE
+    style = ttk.Style(frame)
+    style.configure('Content.TFrame', background=p.bg)
+    style.configure('Content.TLabel', background=p.bg, foreground=p.text_dark, font=('Segoe UI', 10))
+    style.configure('Form.TLabelframe', background=p.bg, relief="solid", borderwidth=1, bordercolor=p.gray_border)
+    style.configure('Form.TLabelframe.Label', background=p.bg, foreground=p.text_dark, font=('Segoe UI', 12, 'bold'))
+    style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=p.primary, foreground=p.white)
+    style.map('Primary.TButton', background=[('active', p.primary_active), ('pressed', p.primary_active)])
+    style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=p.danger, foreground=p.white)
+    style.map('Danger.TButton', background=[('active', p.danger_active), ('pressed', p.danger_active)])
+
+
+def _build_module(master: tk.Misc, apply_styles: Callable[[ttk.Frame], None]) -> ttk.Frame:
+    frame = ttk.Frame(master, padding=20)
+    apply_styles(frame)
+    frame.configure(style='Content.TFrame')
+    ttk.Label(frame, text="Módulo", style='Title.TLabel').pack(anchor='w')
+    tree = ttk.Treeview(frame, columns=('id', 'name', 'email'), show='headings', height=8)
+    for row in range(50):
+        tree.insert('', tk.END, values=(row, f"Nombre {row}", f"correo{row}@escuela.mx"))
+    tree.pack(fill=tk.X)
+    form = ttk.LabelFrame(frame, text="Datos", style='Form.TLabelframe', padding=15)
+    form.pack(fill=tk.X)
+    for row in range(6):
+        ttk.Label(form, text=f"Campo {row}", style='Content.TLabel').grid(row=row, column=0)
+        ttk.Entry(form).grid(row=row, column=1)
+    for column, style in enumerate(('Primary.TButton', 'Primary.TButton', 'Danger.TButton')):
+        ttk.Button(form, text="Acción", style=style).grid(row=6, column=column)
+    return frame
+
+
+def _measure(root: tk.Tk, modules: int, apply_styles: Callable[[ttk.Frame], None]) -> List[float]:
+    container = tk.Frame(root)
+    container.pack(fill=tk.BOTH, expand=True)
+    samples: List[float] = []
+    previous = None
+    for _ in range(modules):
+        start = time.perf_counter()
+        frame = _build_module(container, apply_styles)
+        if previous is not None:
+            previous.pack_forget()  # Oculto, como en la caché de frames del menú
+        frame.pack(fill=tk.BOTH, expand=True)
+        root.update_idletasks()
+        samples.append((time.perf_counter() - start) * 1000)
+        previous = frame
+    container.destroy()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=40)
+    args = parser.parse_args()
+
+    with headless_display() as display:
+        if display:
+            os.environ["DISPLAY"] = display
+        for label, setup in (("antes", _legacy_styles), ("tema", ensure_theme)):
+            root = tk.Tk()
+            ensure_theme(root)  # Mismo tema de partida en ambos modos
+            samples = _measure(root, args.modules, setup)
+            root.destroy()
+            print(f"{label:<6} por módulo: media={statistics.mean(samples):7.2f} ms  "
+                  f"p50={statistics.median(samples):7.2f} ms  último={samples[-1]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,67 @@
 from __future__ import annotations
 
+from app.services import startup  # Primero: origen de la medición del arranque
+
+import logging
 import tkinter as tk
 from tkinter import messagebox
+from typing import TYPE_CHECKING
 
 from app.config import CONFIG
+from app.services import parallel
 from app.services.api_client import ApiClient
+from app.services.background import EXECUTOR
+from app.services.http_cache import DiskCache
+from app.services.retry import RetryPolicy
 from app.services.session import UserSession
+from app.ui.lazy_import import preimport
 from app.ui.login_view import LoginFrame
-from app.ui.main_menu import MainMenu
+from app.ui.table_sort import use_system_collation
+
+if TYPE_CHECKING:  # pragma: no cover - se importan tras el login
+    from app.services.warmup import Warmup, WarmupReport
 
 
 class SchoolControlApp(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
+        startup.mark('tk')
         self.title("Sistema de Gestión Universitaria Estudiantil")
         self.geometry('1024x720')
-        self.api = ApiClient(CONFIG.api_base_url)
+        disk_cache = None
+        if CONFIG.disk_cache_enabled:
+            disk_cache = DiskCache(CONFIG.disk_cache_path, max_bytes=int(CONFIG.disk_cache_max_mb * 1024 * 1024))
+        self.api = ApiClient(
+            CONFIG.api_base_url,
+            pool_connections=CONFIG.http_pool_connections,
+            pool_maxsize=CONFIG.http_pool_maxsize,
+            disk_cache=disk_cache,
+            page_size=CONFIG.page_size,
+            pagination_mode=CONFIG.pagination_mode,
+            json_decoder=CONFIG.json_decoder,
+            compress_min_bytes=CONFIG.request_compress_min_bytes,
+            retry_policy=RetryPolicy(
+                attempts=CONFIG.retry_attempts,
+                backoff=CONFIG.retry_backoff_ms / 1000,
+                max_backoff=CONFIG.retry_max_backoff_ms / 1000,
+                max_retry_after=CONFIG.retry_max_after_s,
+                retry_post=CONFIG.retry_post,
+            ),
+            circuit_failures=CONFIG.circuit_failures,
+            circuit_cooldown=CONFIG.circuit_cooldown_s,
+            circuit_max_cooldown=CONFIG.circuit_max_cooldown_s,
+            probe_path=CONFIG.circuit_probe_path,
+        )
         self.session = UserSession()
         self.current_view: tk.Widget | None = None
+        self.warmup: Warmup | None = None
+        startup.mark('api')
 
         self._show_login()
+        startup.mark('login')
+        if CONFIG.module_preimport:
+            # Lo que sólo hace falta tras el login se importa mientras el usuario escribe
+            self.after_idle(lambda: preimport(['requests', 'app.ui.main_menu', 'app.services.warmup']))
 
     def _clear_view(self) -> None:
         if self.current_view:
@@ -33,6 +75,8 @@ class SchoolControlApp(tk.Tk):
         self.current_view = login_frame
 
     def _show_main_menu(self) -> None:
+        from app.ui.main_menu import MainMenu
+
         self._clear_view()
         menu = MainMenu(self, self.api, self.session)
         menu.pack(fill=tk.BOTH, expand=True)
@@ -51,19 +95,50 @@ class SchoolControlApp(tk.Tk):
             messagebox.showerror("Error", "No se pudo obtener información del usuario")
             return
         self.session.user = user
+        self.api.set_cache_scope(user.get('id'), user.get('role'))
+        # Lo que quedó de una sesión que no terminó bien (cierre forzado, caída)
+        self.api.prune_cache()
+        from app.services.warmup import Warmup
+
+        # Precarga según el rol mientras se muestra el menú
+        self.warmup = Warmup(self.api, self.session)
+        self.warmup.start(self, on_done=self._on_warmup_done)
         self._show_main_menu()
 
+    def _on_warmup_done(self, report: WarmupReport) -> None:
+        # Además del registro en consola, a la vista en el menú lateral
+        from app.ui.main_menu import MainMenu
+
+        if isinstance(self.current_view, MainMenu):
+            self.current_view.show_notice(report.summary())
+
     def _logout(self) -> None:
         if messagebox.askyesno("Cerrar sesión", "¿Deseas cerrar la sesión actual?"):
+            if self.warmup is not None:
+                self.warmup.cancel()
+                self.warmup = None
+            EXECUTOR.cancel_all()
+            self.api.purge_cache()
+            self.api.set_cache_scope(None, None)
             self.session.clear()
             self.api.set_token(None)
+            self.api.close()
             self.config(menu=None)
             self._show_login()
 
 
 def main() -> None:
+    startup.mark('imports')
+    logging.basicConfig(level=CONFIG.log_level, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    use_system_collation()
     app = SchoolControlApp()
+    startup.finish(app)
     app.mainloop()
+    EXECUTOR.shutdown()
+    parallel.shutdown()
+    app.api.prune_cache()
+    if app.api.disk_cache is not None:
+        app.api.disk_cache.close()
 
 
 if __name__ == '__main__':
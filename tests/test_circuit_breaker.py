@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+import requests
+
+from app.services.api_client import ApiClient
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.services.retry import RetryPolicy
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('no se cumplió a tiempo')
+        time.sleep(0.002)
+
+
+class ScriptedProbe:
+    """Sondeo que responde según ``answers`` y anota cuándo se llamó."""
+
+    def __init__(self, *answers: bool) -> None:
+        self.answers = list(answers)
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self) -> bool:
+        self.calls.append(time.monotonic())
+        self.release.wait(5)
+        return self.answers.pop(0) if self.answers else True
+
+
+def test_opens_after_threshold_and_rejects_requests():
+    breaker = CircuitBreaker(ScriptedProbe(), failure_threshold=3, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.check()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.check()
+    assert 0 < raised.value.retry_in <= 60
+    assert breaker.metrics.get('circuit.open') == 1
+    assert breaker.metrics.get('circuit.rejected') == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(ScriptedProbe(), failure_threshold=2, cooldown=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_success_while_open_closes_the_circuit():
+    breaker = CircuitBreaker(ScriptedProbe(), failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.check()
+    assert breaker.metrics.get('circuit.close') == 1
+
+
+def test_threshold_zero_never_opens():
+    breaker = CircuitBreaker(ScriptedProbe(), failure_threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.check()
+
+
+def test_probe_goes_half_open_and_closes_on_answer():
+    probe = ScriptedProbe(True)
+    probe.release.clear()
+    breaker = CircuitBreaker(probe, failure_threshold=1, cooldown=0.01)
+    breaker.record_failure()
+    _wait_for(lambda: probe.calls)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    probe.release.set()
+    _wait_for(lambda: breaker.state == CLOSED)
+    assert len(probe.calls) == 1
+
+
+def test_failed_probes_double_the_wait_up_to_the_maximum():
+    probe = ScriptedProbe(False, False, False, True)
+    breaker = CircuitBreaker(probe, failure_threshold=1, cooldown=0.02, max_cooldown=0.05)
+    opened = time.monotonic()
+    breaker.record_failure()
+    _wait_for(lambda: breaker.state == CLOSED)
+    assert len(probe.calls) == 4
+    gaps = [later - earlier for earlier, later in zip([opened] + probe.calls, probe.calls)]
+    assert gaps[0] >= 0.02
+    assert gaps[1] >= 0.04
+    assert gaps[2] >= 0.05 and gaps[3] >= 0.05
+    assert breaker.metrics.get('circuit.probe') == 4
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes = b'[]', headers=None) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+    def close(self) -> None:
+        pass
+
+
+class FakeSession:
+    """Sesión que devuelve (o lanza) lo que indique ``script``, en orden."""
+
+    def __init__(self, *script) -> None:
+        self.script = list(script)
+        self.requests = 0
+
+    def request(self, **_kwargs):
+        self.requests += 1
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome if isinstance(outcome, FakeResponse) else FakeResponse(outcome)
+
+
+def _client(*script, failures: int = 2) -> ApiClient:
+    client = ApiClient(
+        'http://servidor', retry_policy=RetryPolicy(attempts=3, backoff=0), circuit_failures=failures,
+        circuit_cooldown=60,
+    )
+    client._session = FakeSession(*script)
+    return client
+
+
+def test_retried_request_counts_as_a_single_failure():
+    client = _client(503, requests.ConnectionError(), 503)
+    assert client._perform('GET', '/students').status_code == 503
+    assert client._session.requests == 3
+    assert client.breaker.state == CLOSED
+    assert client.breaker._failures == 1
+
+
+def test_request_that_recovers_on_retry_is_a_success():
+    client = _client(503, 200, 503, 503, 503)
+    client.breaker.record_failure()
+    assert client._perform('GET', '/students').status_code == 200
+    assert client.breaker._failures == 0
+    assert client._perform('GET', '/students').status_code == 503
+    assert client.breaker.state == CLOSED
+
+
+def test_open_circuit_rejects_before_sending():
+    client = _client(requests.Timeout(), requests.Timeout(), requests.Timeout(), 200, failures=1)
+    with pytest.raises(requests.Timeout):
+        client._perform('GET', '/students')
+    assert client.breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        client._perform('GET', '/students')
+    assert client._session.requests == 3
+
+
+def test_open_circuit_serves_the_last_known_get():
+    client = _client(FakeResponse(200, b'[{"id": 1}]', {'ETag': '"v1"'}), failures=1)
+    assert client.get('/careers') == [{'id': 1}]
+    client.breaker.record_failure()
+    assert client.breaker.state == OPEN
+    assert client.get('/careers') == [{'id': 1}]
+    assert client.metrics.get('circuit.stale') == 1
+    with pytest.raises(CircuitOpenError):
+        client.get('/students')
+    with pytest.raises(CircuitOpenError):
+        client.post('/careers', {'name': 'Nueva'})
+    assert client._session.requests == 1
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import tkinter as tk
+
+import pytest
+
+from app.ui.frame_cache import FrameCache
+from app.ui.main_menu import MainMenu
+
+
+class FakeFrame:
+    """Lo que ``FrameCache`` y ``MainMenu`` usan de un frame; falla como Tk si ya se destruyó."""
+
+    def __init__(self, _parent=None, _api=None, _session=None) -> None:
+        self.alive = True
+        self.packed = False
+
+    def _check(self) -> None:
+        if not self.alive:
+            raise tk.TclError('bad window path name')
+
+    def pack(self, **_options) -> None:
+        self._check()
+        self.packed = True
+
+    def pack_forget(self) -> None:
+        self._check()
+        self.packed = False
+
+    def destroy(self) -> None:
+        self.alive = False
+
+    def winfo_exists(self) -> bool:
+        return self.alive
+
+
+class RefreshableFrame(FakeFrame):
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.refreshed = 0
+
+    def refresh(self) -> None:
+        self.refreshed += 1
+
+
+class _Menu:
+    """Sólo la navegación de ``MainMenu``, sin ventana."""
+
+    _load_module = MainMenu._load_module
+    _show_content = MainMenu._show_content
+
+    def __init__(self, cache_size: int) -> None:
+        self.frames = FrameCache(cache_size)
+        self.current_content_frame = None
+        self.welcome_frame = None
+        self.content_frame = self.api = self.session = None
+
+
+def test_put_evicts_least_recently_used():
+    cache = FrameCache(2)
+    a, b, c = FakeFrame(), FakeFrame(), FakeFrame()
+    cache.put('a', a)
+    cache.put('b', b)
+    assert cache.get('a') is a
+    cache.put('c', c)
+    assert list(cache) == ['a', 'c']
+    assert not b.alive and a.alive and c.alive
+
+
+def test_get_drops_destroyed_frames():
+    cache = FrameCache(2)
+    frame = FakeFrame()
+    cache.put('a', frame)
+    frame.destroy()
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_stale_frame_is_refreshed_on_get():
+    cache = FrameCache(2, stale_after=0.001)
+    frame = RefreshableFrame()
+    cache.put('a', frame)
+    cache._entries['a'].loaded_at -= 1
+    assert cache.get('a') is frame
+    assert frame.refreshed == 1
+    assert cache.refresh('a') and frame.refreshed == 2
+    cache.put('b', FakeFrame())
+    assert not cache.refresh('b')
+
+
+@pytest.mark.parametrize('cache_size', [0, 1, 2])
+def test_switching_modules_never_touches_a_destroyed_frame(cache_size):
+    menu = _Menu(cache_size)
+    path = f'{__name__}:FakeFrame'
+    for name in ['a', 'b', 'a', 'c', 'b', 'b']:
+        menu._load_module(name, path)
+        shown = menu.current_content_frame
+        assert shown.alive and shown.packed
+    assert len(menu.frames) == min(cache_size, 2)
+    for name in menu.frames:
+        frame = menu.frames.peek(name)
+        assert frame.alive
+        assert frame.packed == (frame is menu.current_content_frame)
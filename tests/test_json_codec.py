@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.services.json_codec import iter_array
+
+_DOCUMENT = [
+    {'id': 1, 'nombre': 'José Núñez', 'promedio': 9.75, 'activo': True},
+    {'id': 22, 'nombre': 'María "la" López', 'grupos': [1, 2, [3]], 'nota': None},
+    -12345.5e-3,
+    1234567890,
+    'texto con ] y , dentro',
+    [],
+    {},
+]
+
+
+def _split(body: bytes, size: int) -> list:
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 10 ** 6])
+def test_items_survive_any_chunk_size(size):
+    body = json.dumps(_DOCUMENT, ensure_ascii=False, indent=1).encode('utf-8')
+    assert list(iter_array(_split(body, size))) == _DOCUMENT
+
+
+def test_number_split_across_chunks_is_not_cut_short():
+    assert list(iter_array([b'[12', b'34', b'5, 6', b'7.', b'5e', b'2]'])) == [12345, 6750.0]
+    assert list(iter_array([b' [ 10', b'0 ', b' ] '])) == [100]
+
+
+def test_empty_array_and_whitespace():
+    assert list(iter_array([b'  [', b'\n', b' ]'])) == []
+    assert list(iter_array([b'[]'])) == []
+
+
+def test_items_arrive_before_the_end_of_the_body():
+    def chunks():
+        yield b'[{"id": 1}, '
+        yield b'{"id": 2}, '
+        raise AssertionError('se pidió otro trozo antes de tiempo')
+
+    items = iter_array(chunks())
+    assert next(items) == {'id': 1}
+
+
+@pytest.mark.parametrize('chunks', [
+    [b'{"id": 1}'],
+    [b'"texto"'],
+    [b''],
+])
+def test_non_array_raises(chunks):
+    with pytest.raises(ValueError):
+        list(iter_array(chunks))
+
+
+@pytest.mark.parametrize('chunks', [
+    [b'[1, 2'],
+    [b'[1 2]'],
+    [b'[1,', b']'],
+    [b'[{"id": 1', b'}, {"id":'],
+    [b'[tru', b'e, nope]'],
+])
+def test_malformed_array_raises(chunks):
+    with pytest.raises(ValueError):
+        list(iter_array(chunks))
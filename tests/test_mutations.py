@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from app.services.mutations import append_page, apply_deleted, apply_saved
+
+_GROUPS = [
+    {'id': 1, 'name': 'A', 'careerId': 3, 'careerName': 'Sistemas', 'teacherId': 7, 'teacherName': 'Ana'},
+    {'id': 2, 'name': 'B', 'careerId': 4, 'careerName': 'Civil', 'teacherId': 8, 'teacherName': 'Luis'},
+]
+
+
+def test_update_with_every_listing_field_is_merged_in_place():
+    saved = dict(_GROUPS[0], name='A2', careerId=4, careerName='Civil', extra=True)
+    rows = apply_saved(_GROUPS, saved)
+    assert rows == [saved, _GROUPS[1]]
+    assert _GROUPS[0]['name'] == 'A'
+
+
+def test_update_missing_listing_fields_needs_a_reload():
+    # El PUT devolvió sólo ids: careerName/teacherName quedarían con el valor anterior
+    saved = {'id': 1, 'name': 'A', 'careerId': 4, 'teacherId': 8}
+    assert apply_saved(_GROUPS, saved) is None
+
+
+def test_new_entity_is_appended_only_with_listing_fields():
+    complete = {'id': 9, 'name': 'C', 'careerId': 3, 'careerName': 'Sistemas', 'teacherId': 7, 'teacherName': 'Ana'}
+    assert apply_saved(_GROUPS, complete) == _GROUPS + [complete]
+    assert apply_saved(_GROUPS, {'id': 9, 'name': 'C'}) is None
+    assert apply_saved([], {'id': 9}) == [{'id': 9}]
+
+
+def test_delete_and_append_page():
+    assert apply_deleted(_GROUPS, 1) == [_GROUPS[1]]
+    assert append_page(_GROUPS[:1], _GROUPS) == _GROUPS
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app.services.pagination import PageIterator, page_items
+
+
+class _FakeApi:
+    """Sirve ``rows`` con limit/offset o cursor; ``ignore_paging`` simula un servidor que no pagina."""
+
+    def __init__(self, rows: List[Dict[str, Any]], *, ignore_paging: bool = False, envelope: bool = False):
+        self.rows = rows
+        self.ignore_paging = ignore_paging
+        self.envelope = envelope
+        self.requests: List[Dict[str, Any]] = []
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        params = dict(params or {})
+        self.requests.append(params)
+        if len(self.requests) > 50:
+            raise AssertionError("el iterador no termina")
+        limit = params['limit']
+        if self.ignore_paging:
+            start = 0
+        elif 'offset' in params:
+            start = params['offset']
+        else:
+            cursor = params.get('cursor') or '0'
+            start = int(cursor) if cursor.isdigit() else 0
+        page = self.rows[start:start + limit]
+        if not self.envelope:
+            return page
+        following = start + limit
+        return {'items': page, 'nextCursor': str(following) if following < len(self.rows) else None}
+
+    def peek(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return None
+
+
+def _rows(count: int) -> List[Dict[str, Any]]:
+    return [{'id': row_id} for row_id in range(1, count + 1)]
+
+
+@pytest.mark.parametrize('count', [0, 5, 10, 23])
+def test_offset_pages_cover_all_rows(count):
+    api = _FakeApi(_rows(count))
+    pages = list(PageIterator(api, '/students', page_size=5, prefetch=False))
+    assert [row for page in pages for row in page] == _rows(count)
+
+
+def test_cursor_pages_follow_next_cursor():
+    api = _FakeApi(_rows(12), envelope=True)
+    pages = list(PageIterator(api, '/students', page_size=5, mode='cursor', prefetch=False))
+    assert [len(page) for page in pages] == [5, 5, 2]
+
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_server_ignoring_offset_does_not_loop_forever(prefetch):
+    # Devuelve siempre las mismas page_size filas, sin importar offset
+    api = _FakeApi(_rows(5), ignore_paging=True)
+    iterator = PageIterator(api, '/students', page_size=5, prefetch=prefetch)
+    pages = list(iterator)
+    assert pages == [_rows(5)]
+    assert not iterator.has_more
+    assert len(api.requests) <= 3
+
+
+def test_cursor_that_does_not_advance_stops():
+    class _StuckCursor(_FakeApi):
+        def get(self, path, params=None):
+            body = super().get(path, params)
+            body['nextCursor'] = 'mismo'
+            return body
+
+    api = _StuckCursor(_rows(20), envelope=True)
+    pages = list(PageIterator(api, '/students', page_size=5, mode='cursor', prefetch=False))
+    assert len(pages) <= 2
+
+
+def test_unpaginated_full_array_is_a_single_page():
+    api = _FakeApi(_rows(30), ignore_paging=True)
+    api.get = lambda path, params=None: _rows(30)
+    assert list(PageIterator(api, '/students', page_size=5, prefetch=False)) == [_rows(30)]
+
+
+def test_page_items_reads_envelopes():
+    assert page_items(None) == ([], None, True)
+    assert page_items([{'id': 1}]) == ([{'id': 1}], None, None)
+    assert page_items({'content': [{'id': 1}], 'nextCursor': 'c2', 'last': False}) == ([{'id': 1}], 'c2', False)
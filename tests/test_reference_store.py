@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+
+from app.services.reference_store import ReferenceStore
+
+
+class _SlowApi:
+    """``get`` se bloquea hasta ``release`` para simular una descarga en curso."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def get(self, path):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return list(self.rows)
+
+
+def _fetch_while(store: ReferenceStore, api: _SlowApi, action) -> list:
+    result = []
+    worker = threading.Thread(target=lambda: result.append(store.get(api, 'careers')))
+    worker.start()
+    assert api.started.wait(5)
+    action()
+    api.release.set()
+    worker.join(5)
+    return result[0]
+
+
+def test_get_caches_and_counts_hits():
+    api = _SlowApi([{'id': 1}])
+    api.release.set()
+    store = ReferenceStore()
+    assert store.get(api, 'careers') == [{'id': 1}]
+    assert store.get(api, 'careers') == [{'id': 1}]
+    assert api.calls == 1
+    assert store.stats()['hits'] == 1
+
+
+def test_fetch_in_flight_during_clear_is_not_stored():
+    store = ReferenceStore()
+    api = _SlowApi([{'id': 1, 'name': 'de la sesión anterior'}])
+    returned = _fetch_while(store, api, store.clear)
+    assert returned == [{'id': 1, 'name': 'de la sesión anterior'}]
+    assert store.stats()['loaded'] == []
+
+
+def test_fetch_in_flight_does_not_overwrite_local_patch():
+    store = ReferenceStore()
+    store.prime('careers', [{'id': 1, 'name': 'Vieja'}])
+    store.invalidate('careers')
+    api = _SlowApi([{'id': 1, 'name': 'Vieja'}])
+    _fetch_while(store, api, lambda: store.apply_saved('careers', {'id': 2, 'name': 'Nueva'}))
+    assert 'careers' not in store.stats()['loaded']
+
+
+def test_prime_with_stale_version_is_dropped():
+    store = ReferenceStore()
+    version = store.version('subjects')
+    store.invalidate('subjects')
+    store.prime('subjects', [{'id': 1}], version)
+    assert store.stats()['loaded'] == []
+    store.prime('subjects', [{'id': 1}], store.version('subjects'))
+    assert store.stats()['loaded'] == ['subjects']
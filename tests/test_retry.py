@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+from email.utils import formatdate
+
+import pytest
+
+from app.services.retry import (
+    IDEMPOTENCY_HEADER,
+    NO_RETRY,
+    RetryPolicy,
+    parse_retry_after,
+    policy_for,
+)
+
+
+def test_allows_idempotent_methods_and_keyed_posts():
+    policy = RetryPolicy()
+    assert policy.allows('GET', {})
+    assert policy.allows('DELETE', {})
+    assert not policy.allows('POST', {})
+    assert policy.allows('POST', {IDEMPOTENCY_HEADER: 'abc'})
+    assert not policy.allows('PATCH', {})
+    assert not NO_RETRY.allows('GET', {})
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    policy = RetryPolicy(backoff=0.1, max_backoff=1.0)
+    for retry, cap in enumerate([0.1, 0.2, 0.4, 0.8, 1.0, 1.0]):
+        delays = [policy.delay(retry) for _ in range(200)]
+        assert all(0 <= delay <= cap for delay in delays)
+        # Jitter completo: se usa todo el rango, no sólo el tope
+        assert min(delays) < cap / 4 and max(delays) > cap * 3 / 4
+
+
+def test_retry_after_overrides_backoff_unless_too_long():
+    policy = RetryPolicy(backoff=0.1, max_backoff=1.0, max_retry_after=10.0)
+    assert policy.delay(0, retry_after=7.0) == 7.0
+    assert policy.delay(3, retry_after=0.0) == 0.0
+    assert policy.delay(0, retry_after=10.5) is None
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after(' 3 ') == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('pronto') is None
+    later = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+    assert later == pytest.approx(30, abs=2)
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+
+
+def test_policy_for_uses_the_longest_matching_prefix():
+    default, students, grades = RetryPolicy(), RetryPolicy(attempts=5), RetryPolicy(attempts=2)
+    policies = {'/auth': NO_RETRY, '/students': students, '/students/grades': grades}
+    assert policy_for('/auth/login', policies, default) is NO_RETRY
+    assert policy_for('/students', policies, default) is students
+    assert policy_for('/students/7', policies, default) is students
+    assert policy_for('/students/grades/7', policies, default) is grades
+    # Un prefijo sólo cuenta hasta una '/' completa
+    assert policy_for('/studentsx', policies, default) is default
+    assert policy_for('/careers', policies, default) is default
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import random
+
+from app.services.search_index import SearchIndex, tokenize
+
+_WORDS = ['José', 'María', 'Ana', 'Anabel', 'Luis', 'López', 'Lozano', 'Martínez', 'Marta', 'Núñez']
+
+
+def _row(row_id: int, name: str, email: str = '') -> dict:
+    return {'id': row_id, 'name': name, 'email': email}
+
+
+def _brute_force(rows: dict, query: str):
+    """Lo que debería devolver ``search``: cada palabra es prefijo de algún token de la fila."""
+    words = tokenize(query)
+    if not words:
+        return None
+    found = set()
+    for row in rows.values():
+        tokens = tokenize(f"{row['name']} {row['email']} {row['id']}")
+        if all(any(token.startswith(word) for token in tokens) for word in words):
+            found.add(str(row['id']))
+    return None if len(found) == len(rows) else found
+
+
+def _index(rows) -> SearchIndex:
+    index = SearchIndex(('name', 'email'))
+    index.update(rows)
+    return index
+
+
+def test_search_matches_prefixes_without_accents():
+    index = _index([_row(1, 'José López'), _row(2, 'Ana Martínez'), _row(3, 'Anabel Lozano')])
+    assert index.search('lo') == {'1', '3'}
+    assert index.search('ANA') == {'2', '3'}
+    assert index.search('jose lop') == {'1'}
+    assert index.search('martinez ana') == {'2'}
+    assert index.search('zzz') == set()
+
+
+def test_search_returns_none_when_nothing_is_filtered():
+    index = _index([_row(1, 'Ana López'), _row(2, 'Ana Núñez')])
+    assert index.search('') is None
+    assert index.search('  ,. ') is None
+    assert index.search('ana') is None
+
+
+def test_update_reindexes_only_changed_rows_and_drops_missing():
+    rows = [_row(1, 'José López'), _row(2, 'Ana Martínez'), _row(3, 'Luis Núñez')]
+    index = _index(rows)
+    assert index.update(rows) == 0
+    rows[1] = _row(2, 'Marta Lozano')
+    assert index.update(rows) == 1
+    assert index.search('ana') == set()
+    assert index.search('marta') == {'2'}
+    assert index.update(rows[:2]) == 1
+    assert len(index) == 2
+    assert index.search('luis') == set()
+
+
+def test_upsert_and_remove_touch_only_given_rows():
+    index = _index([_row(1, 'José López'), _row(2, 'Ana Martínez')])
+    assert index.upsert([_row(3, 'Anabel Núñez')]) == 1
+    assert index.search('ana') == {'2', '3'}
+    index.upsert([_row(2, 'Luis Lozano')])
+    assert index.search('ana') == {'3'}
+    assert index.search('lo') == {'1', '2'}
+    index.remove(['1', 99])
+    assert len(index) == 2
+    assert index.search('lo') == {'2'}
+    assert index.search('jose') == set()
+
+
+def test_matches_brute_force_after_random_changes():
+    rnd = random.Random(7)
+
+    def name() -> str:
+        return ' '.join(rnd.choice(_WORDS) for _ in range(rnd.randint(1, 3)))
+
+    rows = {row_id: _row(row_id, name(), f"alumno{row_id}@escuela.mx") for row_id in range(1, 301)}
+    index = _index(list(rows.values()))
+    queries = ['a', 'an', 'ana', 'lo', 'mar', 'jose l', 'nu', 'alumno1', 'z', 'maria ana']
+    for step in range(40):
+        action = rnd.random()
+        if action < 0.4:
+            changed = [_row(row_id, name(), rows[row_id]['email'])
+                       for row_id in rnd.sample(sorted(rows), 5)]
+            changed.append(_row(1000 + step, f"Nuevo{step} {name()}"))
+            rows.update((row['id'], row) for row in changed)
+            index.upsert(changed)
+        elif action < 0.7:
+            gone = rnd.sample(sorted(rows), 3)
+            for row_id in gone:
+                del rows[row_id]
+            index.remove(gone)
+        else:
+            for row_id in rnd.sample(sorted(rows), 5):
+                rows[row_id] = _row(row_id, name(), rows[row_id]['email'])
+            index.update(list(rows.values()))
+        for query in queries + [f"nuevo{step}"]:
+            assert index.search(query) == _brute_force(rows, query), (step, query)
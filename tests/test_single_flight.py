@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import List, Tuple
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def _run_concurrently(flight: SingleFlight, key, func, followers: int) -> Tuple[list, List[threading.Thread]]:
+    """Un líder bloqueado en ``func`` y ``followers`` llamadas que llegan mientras tanto."""
+    results = []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            value = flight.do(key, func)
+        except Exception as error:  # noqa: BLE001 - se compara abajo
+            value = error
+        with lock:
+            results.append(value)
+
+    threads = [threading.Thread(target=call) for _ in range(followers + 1)]
+    threads[0].start()
+    return results, threads
+
+
+def _wait_coalesced(flight: SingleFlight, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while flight.metrics.get('singleflight.coalesced') < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def func():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'cuerpo'
+
+    results, threads = _run_concurrently(flight, 'k', func, followers=3)
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    _wait_coalesced(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == [1]
+    assert results == ['cuerpo'] * 4
+    assert flight.in_flight == 0
+
+
+def test_error_is_shared_and_key_is_released():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def func():
+        started.set()
+        release.wait(5)
+        raise ValueError('caído')
+
+    results, threads = _run_concurrently(flight, 'k', func, followers=1)
+    assert started.wait(5)
+    threads[1].start()
+    _wait_coalesced(flight, 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert flight.do('k', lambda: 'de nuevo') == 'de nuevo'
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do('k', lambda: 1) == 1
+    assert flight.do('k', lambda: 2) == 2
+    with pytest.raises(KeyError):
+        flight.do('k', lambda: {}['x'])
+    assert flight.metrics.get('singleflight.coalesced') == 0
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from app.ui.table_loader import TableLoader
+
+
+class FakeTree:
+    """Lo que ``TableLoader`` usa de un ``ttk.Treeview``; ``after`` no corre solo, se avanza con ``run_pending``."""
+
+    def __init__(self) -> None:
+        self.items = {}
+        self.pending = []
+        self.cleared = 0
+
+    def bind(self, *_args, **_kwargs) -> None:
+        pass
+
+    def winfo_exists(self) -> bool:
+        return True
+
+    def after(self, _ms, callback) -> str:
+        self.pending.append(callback)
+        return f"after#{len(self.pending)}"
+
+    def after_cancel(self, _after_id) -> None:
+        self.pending.clear()
+
+    def run_pending(self) -> None:
+        while self.pending:
+            self.pending.pop(0)()
+
+    def insert(self, _parent, _index, iid, values) -> None:
+        assert iid not in self.items
+        self.items[iid] = values
+
+    def get_children(self, _item: str = '') -> tuple:
+        return tuple(self.items)
+
+    def delete(self, *iids) -> None:
+        if iids and len(iids) == len(self.items):
+            self.cleared += 1
+        for iid in iids:
+            del self.items[iid]
+
+
+def _view(ids):
+    """Como ``VirtualTable``: filas por posición (``range``) sobre una lista de ids."""
+    return range(len(ids)), (lambda position: (ids[position], f"fila {ids[position]}")), ids.__getitem__
+
+
+def test_appending_positions_past_256_continues_the_load():
+    tree = FakeTree()
+    loader = TableLoader(tree, budget_ms=0)
+    ids = [str(number) for number in range(1000)]
+    loader.load(*_view(ids))
+    assert loader.loading and 0 < loader.inserted < 1000
+    inserted = loader.inserted
+
+    ids = ids + [str(number) for number in range(1000, 1500)]
+    stats = loader.reconcile(*_view(ids))
+    assert stats.inserted == 500 and stats.touched == 500
+    assert loader.inserted == inserted and tree.cleared == 0
+
+    tree.run_pending()
+    assert list(tree.items) == ids
+    assert not loader.loading
+
+
+def test_changed_prefix_restarts_the_load():
+    tree = FakeTree()
+    loader = TableLoader(tree, budget_ms=0)
+    ids = [str(number) for number in range(1000)]
+    loader.load(*_view(ids))
+
+    reordered = ids[1:] + ids[:1]
+    loader.reconcile(*_view(reordered))
+    tree.run_pending()
+    assert list(tree.items) == reordered
+    assert tree.cleared == 1
+
+
+def _row_values(row):
+    return row['id'], row['name']
+
+
+def test_changed_values_of_inserted_rows_restart_the_load():
+    tree = FakeTree()
+    loader = TableLoader(tree, budget_ms=0)
+    rows = [{'id': number, 'name': f"fila {number}"} for number in range(1000)]
+    loader.load(rows, _row_values)
+    rows = [dict(row) for row in rows]
+    rows[0]['name'] = 'cambiada'
+    loader.reconcile(rows, _row_values)
+    tree.run_pending()
+    assert tree.items['0'] == (0, 'cambiada')
+    assert tree.cleared == 1